@@ -7,7 +7,15 @@ from playwright.sync_api import sync_playwright
 from pyvietstock.config import HOME_PAGE_URL
 
 
-def login(username=None, password=None):
+DEFAULT_LOGIN_CACHE = '.cache/login.json'
+
+
+def login(username=None, password=None, cache_path=DEFAULT_LOGIN_CACHE, refresh=False):
+    """
+    Logs in with a browser and captures the request headers and verification token.
+    :param cache_path: where the captured headers and token are cached.
+    :param refresh: ignore the cached login and log in again.
+    """
     login_headers = None
     login_token = None
 
@@ -17,17 +25,17 @@ def login(username=None, password=None):
             logging.info("Finding token...")
             login_headers = request.headers
             login_token = request.post_data.split("__RequestVerificationToken=")[1]
-            # Save headers and token to .cache/login.json
-            logging.info("Saving login headers and token to .cache/login.json")
-            with open('.cache/login.json', 'w') as f:
+            # Save headers and token to the login cache
+            logging.info(f"Saving login headers and token to {cache_path}")
+            with open(cache_path, 'w') as f:
                 f.write(json.dumps({
                     'headers': login_headers,
                     'token': login_token
                 }))
 
-    if os.path.exists('.cache/login.json'):
-        logging.info("Loading login headers and token from .cache/login.json")
-        with open('.cache/login.json', 'r') as f:
+    if not refresh and os.path.exists(cache_path):
+        logging.info(f"Loading login headers and token from {cache_path}")
+        with open(cache_path, 'r') as f:
             data = json.load(f)
             login_headers = data['headers']
             login_token = data['token']
@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pyvietstock.params import CorporateActionKind
+from pyvietstock.schema import CompanyEvent, CorporateAction
+from pyvietstock.trading_calendar import ICT_OFFSET
+from pyvietstock.utils import convert_to_epoch
+
+DEFAULT_ADJUSTMENTS_PATH = '.cache/adjustments.json'
+PAR_VALUE = 10000  # VND, dividends quoted in % are a share of the par value
+PRICE_SCALE = 1000  # VND per price unit, historical_data prices are in thousand VND
+
+_RATIO = re.compile(r'(\d+(?:[.,]\d+)?)\s*:\s*(\d+(?:[.,]\d+)?)')
+_PERCENT = re.compile(r'(\d+(?:[.,]\d+)?)\s*%')
+_AMOUNT = re.compile(r'(\d[\d.,]*)\s*(?:đồng|đ|vnd)', re.IGNORECASE)
+_PRICE = re.compile(r'giá\s*(?:phát hành)?\s*:?\s*(\d[\d.,]*)', re.IGNORECASE)
+_THOUSANDS = re.compile(r'^\d{1,3}(?:[.,]\d{3})+$')
+
+
+def _number(text: str) -> float:
+    """
+    Parses a Vietnamese formatted number: "1.000" and "1,000" are thousands, "12,5" is a decimal.
+    """
+    if _THOUSANDS.match(text):
+        return float(re.sub(r'[.,]', '', text))
+    return float(text.replace(',', '.'))
+
+
+def _ex_date(value: str) -> Optional[str]:
+    if not value:
+        return None
+    epoch = convert_to_epoch(value)
+    return datetime.fromtimestamp(epoch, timezone(timedelta(seconds=ICT_OFFSET))).date().isoformat()
+
+
+def _day_start(ex_date: str) -> int:
+    return convert_to_epoch(datetime.fromisoformat(ex_date).replace(tzinfo=timezone.utc)) - ICT_OFFSET
+
+
+def parse_action(event: CompanyEvent) -> Optional[CorporateAction]:
+    """
+    Recognizes cash dividends, stock dividends / bonus shares and rights issues from the event texts.
+    The factors are left at 1.0, they depend on the close before the ex-date (see AdjustmentEngine).
+    :return: the corporate action, or None for other events or events without an ex-date.
+    """
+    ex_date = _ex_date(event.gdkhq_date)
+    if ex_date is None:
+        return None
+    text = ' '.join(filter(None, (event.title, event.name, event.note))).lower()
+    ratio = _RATIO.search(text)
+    percent = _PERCENT.search(text)
+    action = CorporateAction(event.symbol, event.event_id, ex_date, None, 0.0, 0.0, 0.0, 1.0, 1.0)
+
+    # share issues paying a stock dividend or bonus ("phát hành thêm cổ phiếu trả cổ tức") are not rights issues
+    if 'cổ phiếu' in text and ('cổ tức' in text or 'thưởng' in text) and 'tiền' not in text and 'quyền mua' not in text:
+        action.kind = CorporateActionKind.STOCK_DIVIDEND
+        if ratio is not None:
+            action.ratio = _number(ratio.group(2)) / _number(ratio.group(1))
+        elif percent is not None:
+            action.ratio = _number(percent.group(1)) / 100
+        else:
+            return None
+    elif 'quyền mua' in text or 'phát hành thêm' in text:
+        price = _PRICE.search(text)
+        if ratio is None or price is None:
+            return None
+        action.kind = CorporateActionKind.RIGHTS
+        action.ratio = _number(ratio.group(2)) / _number(ratio.group(1))
+        action.price = _number(price.group(1))
+    elif 'cổ tức' in text and 'tiền' in text:
+        action.kind = CorporateActionKind.CASH_DIVIDEND
+        amount = _AMOUNT.search(text)
+        if amount is not None:
+            action.cash = _number(amount.group(1))
+        elif percent is not None:
+            action.cash = _number(percent.group(1)) / 100 * PAR_VALUE
+        else:
+            return None
+    else:
+        return None
+    return action
+
+
+def _with_factors(
+        action: CorporateAction, reference_close: Optional[float], price_scale: float
+) -> Optional[CorporateAction]:
+    """
+    Fills the price and volume factors of an action given the close (in price units) before its ex-date.
+    :return: the action, or None if its factors need a reference close that is not available yet.
+    """
+    if action.kind == CorporateActionKind.STOCK_DIVIDEND:
+        action.price_factor = 1.0 / (1.0 + action.ratio)
+        action.volume_factor = 1.0 + action.ratio
+        return action
+    if not reference_close:
+        logging.warning(f"AdjustmentEngine: no close before {action.ex_date} for {action.symbol}, "
+                        f"{action.kind} left out until the bars are available")
+        return None
+    close = reference_close * price_scale
+    if action.kind == CorporateActionKind.CASH_DIVIDEND:
+        if action.cash < close:
+            action.price_factor = (close - action.cash) / close
+        else:
+            logging.warning(f"AdjustmentEngine: {action.symbol} dividend of {action.cash:g} VND on {action.ex_date} is not "
+                            f"below the close of {close:g} VND, skipped (check price_scale)")
+    elif action.kind == CorporateActionKind.RIGHTS:
+        if action.price < close:
+            # theoretical ex-rights price over the last cum-rights close
+            action.price_factor = (close + action.ratio * action.price) / (1.0 + action.ratio) / close
+        else:
+            logging.info(f"AdjustmentEngine: {action.symbol} rights price {action.price:g} VND on {action.ex_date} "
+                         f"is not below the close of {close:g} VND, no adjustment")
+    return action
+
+
+class AdjustmentEngine:
+    """
+    Back-adjusts OHLCV arrays for corporate actions parsed from events_by_type.
+    Per symbol it keeps the ex-dates and the cumulative factors of all later actions, so adjusting a whole array
+    is a searchsorted plus a multiplication. Factors are cached on disk and only rebuilt for symbols whose
+    events changed.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_ADJUSTMENTS_PATH, price_scale: float = PRICE_SCALE):
+        """
+        :param path: JSON cache of the parsed actions, None to keep them in memory only.
+        :param price_scale: VND per price unit of the bars, 1000 for historical_data bars (thousand VND).
+        """
+        self.path = path
+        self.price_scale = price_scale
+        self._actions: Dict[str, List[CorporateAction]] = {}
+        self._factors: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def actions(self, symbol: str) -> List[CorporateAction]:
+        return list(self._actions.get(symbol.upper(), []))
+
+    def _set(self, symbol: str, actions: List[CorporateAction]):
+        actions = sorted(actions, key=lambda a: a.ex_date)
+        ex_times = np.array([_day_start(a.ex_date) for a in actions], dtype=np.int64)
+        # cumulative product of the factors of this and every later action, 1.0 after the last one
+        price = np.append(np.cumprod([a.price_factor for a in actions][::-1])[::-1], 1.0)
+        volume = np.append(np.cumprod([a.volume_factor for a in actions][::-1])[::-1], 1.0)
+        with self._lock:
+            self._actions[symbol] = actions
+            self._factors[symbol] = (ex_times, price, volume)
+
+    def update(self, symbol: str, events: Iterable[CompanyEvent], bars: Optional[np.ndarray] = None) -> bool:
+        """
+        Rebuilds the factors of one symbol if its events contain actions that are not known yet.
+        Cash dividends and rights issues without a close before their ex-date in bars are left out (and not saved),
+        so they are picked up by a later update with more bars.
+        :param events: CompanyEvent records of the symbol, other events are skipped.
+        :param bars: unadjusted daily bars (OHLCV_DTYPE) providing the closes before the ex-dates.
+        :return: True if the factors changed.
+        """
+        symbol = symbol.upper()
+        parsed = {}
+        for event in events or []:
+            action = parse_action(event)
+            if action is not None and (action.symbol or '').upper() == symbol:
+                parsed[(action.event_id, action.ex_date, action.kind)] = action
+        known = {(a.event_id, a.ex_date, a.kind) for a in self._actions.get(symbol, [])}
+        if symbol in self._actions and set(parsed) <= known:
+            return False
+
+        actions = {(a.event_id, a.ex_date, a.kind): a for a in self._actions.get(symbol, [])}
+        closes_times = bars['time'] if bars is not None and len(bars) else np.empty(0, dtype=np.int64)
+        added = 0
+        for key, action in parsed.items():
+            if key in actions:
+                continue
+            i = np.searchsorted(closes_times, _day_start(action.ex_date), side='left')
+            reference_close = float(bars['close'][i - 1]) if i > 0 else None
+            action = _with_factors(action, reference_close, self.price_scale)
+            if action is not None:
+                actions[key] = action
+                added += 1
+        if symbol in self._actions and not added:
+            return False
+        self._set(symbol, list(actions.values()))
+        return True
+
+    def factors(self, symbol: str, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: price and volume multipliers for bars at the given epoch times.
+        """
+        ex_times, price, volume = self._factors.get(symbol.upper(), (np.empty(0, dtype=np.int64), np.ones(1), np.ones(1)))
+        index = np.searchsorted(ex_times, times, side='right')
+        return price[index], volume[index]
+
+    def apply(self, symbol: str, bars: np.ndarray) -> np.ndarray:
+        """
+        :param bars: unadjusted bars with OHLCV_DTYPE, any resolution.
+        :return: a copy of bars with prices and volumes adjusted to the latest share basis.
+        """
+        price, volume = self.factors(symbol, bars['time'])
+        adjusted = np.array(bars, copy=True)
+        for name in ('open', 'high', 'low', 'close'):
+            adjusted[name] *= price
+        adjusted['volume'] *= volume
+        return adjusted
+
+    def refresh(
+            self,
+            vf,
+            symbols: Iterable[str],
+            store=None,
+            from_date: str = '',
+            page_size: int = 50,
+            max_workers: int = 8,
+    ) -> List[str]:
+        """
+        Fetches events for the symbols concurrently and rebuilds the factors of the symbols with new actions only.
+        :param vf: VietStockFinance instance.
+        :param store: optional OHLCVStore with daily bars, used for the closes before the ex-dates.
+        :return: the symbols whose factors changed.
+        """
+        def fetch(symbol):
+            try:
+                return symbol, vf.events_by_type(symbol, from_date=from_date, page_size=page_size) or []
+            except Exception as e:
+                logging.warning(f"AdjustmentEngine: events_by_type failed for {symbol}: {e}")
+                return symbol, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, [s.upper() for s in symbols]))
+        changed = []
+        for symbol, events in results:
+            if events is None:
+                continue
+            bars = store.open(symbol) if store is not None else None
+            if self.update(symbol, events, bars):
+                changed.append(symbol)
+        if changed and self.path:
+            self.save()
+        return changed
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        with self._lock:
+            data = {symbol: [asdict(a) for a in actions] for symbol, actions in self._actions.items()}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None):
+        with open(path or self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for symbol, actions in data.items():
+            self._set(symbol, [CorporateAction(**a) for a in actions])
@@ -0,0 +1,236 @@
+import math
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from pyvietstock.params import AlertKind, HistoricalResolution
+from pyvietstock.schema import Alert, AlertRule, StockDealDetail, TradingInfo
+
+KINDS = (
+    AlertKind.CROSS_ABOVE, AlertKind.CROSS_BELOW, AlertKind.PERCENT_CHANGE,
+    AlertKind.VOLUME_SPIKE, AlertKind.AT_CEILING, AlertKind.AT_FLOOR,
+)
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+# per kind code: condition is value >= target (else value <= target), and whether it needs a previous observation
+_GREATER = np.array([True, False, True, True, True, False])
+_CROSSING = np.array([True, True, False, False, False, False])
+# kinds compared against the ceiling / floor price instead of their threshold
+_LIMIT = np.array([False, False, False, False, True, True])
+
+_UNKNOWN, _FALSE, _TRUE = -1, 0, 1
+_NO_ROWS = np.empty(0, dtype=np.int64)
+MIN_COMPACT_ROWS = 1024
+
+
+def average_volumes(store, symbols: Iterable[str], days: int = 20) -> Dict[str, float]:
+    """
+    Average daily volume of the last days stored bars of every symbol, for VOLUME_SPIKE rules.
+    :param store: OHLCVStore holding daily bars.
+    """
+    averages = {}
+    for symbol in symbols:
+        volumes = store.open(symbol, HistoricalResolution.ONE_DAY)['volume'][-days:]
+        if len(volumes):
+            averages[symbol.upper()] = float(np.mean(volumes))
+    return averages
+
+
+class AlertEngine:
+    """
+    Evaluates many price and volume alert rules on every trading_info or stock_deal_detail update.
+    Rules are stored column-wise (kind code, threshold, state...) and indexed by symbol, so an update only
+    touches the rules of its symbol and checks them with a handful of vectorized comparisons.
+    A rule fires when its condition turns true: crossings need a previous price on the other side,
+    the other kinds fire on the first update where they hold and re-arm once they no longer hold.
+    """
+
+    def __init__(
+            self,
+            rules: Iterable[AlertRule] = (),
+            average_volumes: Optional[Mapping[str, float]] = None,
+            on_alert: Optional[Callable[[Alert], None]] = None,
+    ):
+        """
+        :param average_volumes: symbol -> average daily volume, the base of VOLUME_SPIKE rules.
+        :param on_alert: optional callback called with every alert.
+        """
+        self.on_alert = on_alert
+        self._average_volumes: Dict[str, float] = {}
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._capacity = 0
+        self._resize(1024)
+        self._by_symbol: Dict[str, np.ndarray] = {}  # symbol -> active rows, kept up to date on every change
+        self._inactive = 0
+        self._limits: Dict[str, tuple] = {}  # symbol -> (ceiling, floor) of the last trading_info
+        if average_volumes:
+            self.set_average_volumes(average_volumes)
+        for rule in rules:
+            self.add(rule)
+
+    def _resize(self, capacity: int):
+        def grow(array, fill, dtype):
+            grown = np.full(capacity, fill, dtype=dtype)
+            if array is not None:
+                grown[:len(array)] = array
+            return grown
+
+        old = self._capacity > 0
+        self._kind = grow(self._kind if old else None, 0, np.int8)
+        self._threshold = grow(self._threshold if old else None, np.nan, np.float64)
+        self._once = grow(self._once if old else None, False, bool)
+        self._active = grow(self._active if old else None, False, bool)
+        self._state = grow(self._state if old else None, _UNKNOWN, np.int8)
+        self._capacity = capacity
+
+    def __len__(self):
+        return len(self._rows)
+
+    def set_average_volumes(self, volumes: Mapping[str, float]):
+        self._average_volumes.update({s.upper(): v for s, v in volumes.items()})
+        return self
+
+    def add(self, rule: AlertRule):
+        """
+        Adds a rule, or replaces the rule with the same rule_id.
+        """
+        if rule.kind not in _KIND_CODES:
+            raise ValueError(f"Unknown alert kind {rule.kind}, expected one of {', '.join(KINDS)}")
+        symbol = rule.symbol.upper()
+        if rule.rule_id in self._rows:
+            self.remove(rule.rule_id)
+        row = len(self._ids)
+        if row >= self._capacity:
+            self._resize(2 * self._capacity)
+        self._ids.append(rule.rule_id)
+        self._symbols.append(symbol)
+        self._rows[rule.rule_id] = row
+        self._kind[row] = _KIND_CODES[rule.kind]
+        self._threshold[row] = rule.threshold
+        self._once[row] = rule.once
+        self._active[row] = True
+        self._state[row] = _UNKNOWN
+        self._by_symbol[symbol] = np.append(self._by_symbol.get(symbol, _NO_ROWS), row)
+        return self
+
+    def remove(self, rule_id: str) -> bool:
+        row = self._rows.get(rule_id)
+        if row is None:
+            return False
+        self._deactivate(self._symbols[row], np.array([row], dtype=np.int64))
+        self._compact()
+        return True
+
+    def _deactivate(self, symbol: str, rows: np.ndarray):
+        self._active[rows] = False
+        for row in rows.tolist():
+            del self._rows[self._ids[row]]
+        remaining = self._by_symbol[symbol]
+        remaining = remaining[self._active[remaining]]
+        if len(remaining):
+            self._by_symbol[symbol] = remaining
+        else:
+            del self._by_symbol[symbol]
+        self._inactive += len(rows)
+
+    def _compact(self):
+        """
+        Drops the rows of removed and spent rules once they are the majority, renumbering the active ones.
+        """
+        total = len(self._ids)
+        if total < MIN_COMPACT_ROWS or 2 * self._inactive < total:
+            return
+        keep = np.flatnonzero(self._active[:total])
+        new_row = np.full(total, -1, dtype=np.int64)
+        new_row[keep] = np.arange(len(keep))
+        for array in (self._kind, self._threshold, self._once, self._active, self._state):
+            array[:len(keep)] = array[keep]
+        self._active[len(keep):total] = False
+        self._ids = [self._ids[row] for row in keep.tolist()]
+        self._symbols = [self._symbols[row] for row in keep.tolist()]
+        self._rows = {rule_id: row for row, rule_id in enumerate(self._ids)}
+        self._by_symbol = {symbol: new_row[rows] for symbol, rows in self._by_symbol.items()}
+        self._inactive = 0
+
+    def rule(self, rule_id: str) -> Optional[AlertRule]:
+        row = self._rows.get(rule_id)
+        if row is None or not self._active[row]:
+            return None
+        return AlertRule(rule_id, self._symbols[row], KINDS[self._kind[row]], float(self._threshold[row]),
+                         bool(self._once[row]))
+
+    def evaluate(
+            self,
+            symbol: str,
+            price: float,
+            per_change: float = math.nan,
+            volume: float = math.nan,
+            ceiling: float = math.nan,
+            floor: float = math.nan,
+            time: Union[str, float, int, None] = None,
+    ) -> List[Alert]:
+        """
+        Checks every active rule of symbol against one update. Unknown values are NaN, rules needing them
+        do not fire and keep their state.
+        :param per_change: change against the prior close in %.
+        :param volume: session volume so far.
+        :return: the alerts fired, in rule order.
+        """
+        symbol = symbol.upper()
+        rows = self._by_symbol.get(symbol, _NO_ROWS)
+        if not len(rows):
+            return []
+        average = self._average_volumes.get(symbol, math.nan)
+        ratio = volume / average if average else math.nan
+        kind = self._kind[rows]
+        observed = np.array([price, price, abs(per_change), ratio, price, price], dtype=np.float64)[kind]
+        limits = np.array([math.nan, math.nan, math.nan, math.nan, ceiling or math.nan, floor or math.nan])[kind]
+        # an unknown ceiling / floor leaves those rules unknown, their threshold is not a price
+        target = np.where(_LIMIT[kind], limits, self._threshold[rows])
+
+        with np.errstate(invalid='ignore'):
+            holds = np.where(_GREATER[kind], observed >= target, observed <= target)
+        known = ~(np.isnan(observed) | np.isnan(target))
+        state = self._state[rows]
+        fire = holds & known & np.where(_CROSSING[kind], state == _FALSE, state != _TRUE)
+        self._state[rows] = np.where(known, holds.astype(np.int8), state)
+
+        fired = rows[fire]
+        if not len(fired):
+            return []
+        values = observed[fire]
+        alerts = [
+            Alert(self._ids[row], symbol, KINDS[self._kind[row]], float(self._threshold[row]), float(value), time)
+            for row, value in zip(fired.tolist(), values.tolist())
+        ]
+        done = fired[self._once[fired]]
+        if len(done):
+            self._deactivate(symbol, done)
+            self._compact()
+        if self.on_alert is not None:
+            for alert in alerts:
+                self.on_alert(alert)
+        return alerts
+
+    def on_trading_info(self, info: TradingInfo) -> List[Alert]:
+        self._limits[info.symbol.upper()] = (info.ceiling_price, info.floor_price)
+        return self.evaluate(info.symbol, info.last_price, info.per_change, info.total_vol,
+                             info.ceiling_price, info.floor_price, info.time)
+
+    def on_deal(self, deal: StockDealDetail) -> List[Alert]:
+        """
+        Ceiling and floor prices come from the last trading_info of the symbol, if any.
+        """
+        ceiling, floor = self._limits.get(deal.symbol.upper(), (math.nan, math.nan))
+        return self.evaluate(deal.symbol, deal.price, deal.per_change, deal.total_vol, ceiling, floor, deal.time)
+
+    def on_snapshot(self, infos: Iterable[Optional[TradingInfo]]) -> List[Alert]:
+        """
+        Evaluates a batch of trading_info records, e.g. a Screener refresh.
+        """
+        alerts = []
+        for info in infos:
+            if info is not None:
+                alerts.extend(self.on_trading_info(info))
+        return alerts
@@ -0,0 +1,253 @@
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pyvietstock.params import HistoricalResolution
+from pyvietstock.store import OHLCVStore
+from pyvietstock.trading_calendar import DAY_SECONDS, DEFAULT_CALENDAR, ICT_OFFSET, TradingCalendar
+
+DEFAULT_WINDOW = 60
+DEFAULT_MIN_PERIODS = 20
+
+
+def _day_numbers(times: np.ndarray) -> np.ndarray:
+    """
+    Epoch seconds -> days since 1970-01-01 in Vietnam time.
+    """
+    return (np.asarray(times, dtype=np.int64) + ICT_OFFSET) // DAY_SECONDS
+
+
+def _day_string(day: int) -> str:
+    return datetime.fromtimestamp(int(day) * DAY_SECONDS, timezone.utc).strftime('%Y-%m-%d')
+
+
+def align_closes(
+        store: OHLCVStore,
+        symbols: Sequence[str],
+        from_date: str,
+        to_date: Optional[str] = None,
+        calendar: Optional[TradingCalendar] = None,
+        resolution: str = HistoricalResolution.ONE_DAY,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aligns the stored daily closes of symbols onto the trading days of the calendar.
+    :param from_date: first day, YYYY-MM-DD.
+    :param to_date: last day, YYYY-MM-DD, the last completed trading day by default.
+    :return: (days, closes): day numbers (days since 1970-01-01, ICT) of shape (days,) and a float64 matrix of
+    shape (days, symbols), NaN where a symbol has no bar that day.
+    """
+    calendar = calendar or DEFAULT_CALENDAR
+    to_date = to_date or calendar.last_completed_trading_day()
+    days = np.array(calendar.trading_days(from_date, to_date), dtype='datetime64[D]').astype(np.int64)
+    closes = np.full((len(days), len(symbols)), np.nan)
+    for j, symbol in enumerate(symbols):
+        bars = store.open(symbol, resolution)
+        if not len(bars):
+            continue
+        bar_days = _day_numbers(bars['time'])
+        rows = np.searchsorted(days, bar_days)
+        found = (rows < len(days)) & (days[np.minimum(rows, len(days) - 1)] == bar_days)
+        closes[rows[found], j] = bars['close'][found]
+    return days, closes
+
+
+def log_returns(closes: np.ndarray) -> np.ndarray:
+    """
+    Day-over-day log returns of an aligned close matrix, one row shorter. NaN where either close is missing.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.diff(np.log(closes), axis=0)
+
+
+class RollingCorrelation:
+    """
+    Rolling covariance and correlation matrices of daily log returns over the last window trading days.
+
+    The window is kept as pairwise sums (sum x_i, sum x_i^2, sum x_i*x_j and observation counts over the days
+    both symbols traded), so adding a day and dropping the oldest one are a few outer products: O(n^2) per day
+    instead of recomputing O(window * n^2). The sums are rebuilt from the window every window updates to
+    bound floating point drift. Missing returns are pairwise excluded.
+    """
+
+    def __init__(self, symbols: Sequence[str], window: int = DEFAULT_WINDOW, min_periods: int = DEFAULT_MIN_PERIODS):
+        """
+        :param symbols: column order of the matrices.
+        :param min_periods: pairs with fewer common observations in the window are NaN.
+        """
+        self.symbols: List[str] = [s.upper() for s in symbols]
+        self.window = window
+        self.min_periods = min_periods
+        n = len(self.symbols)
+        self.returns = np.full((window, n), np.nan)  # ring buffer of the window
+        self.days = np.zeros(window, dtype=np.int64)
+        self.size = 0
+        self.head = 0  # next slot to write
+        self.last_day: Optional[int] = None
+        self.last_close = np.full(n, np.nan)
+        self._since_rebuild = 0
+        self._rebuild()
+
+    def _terms(self, rows: np.ndarray):
+        mask = ~np.isnan(rows)
+        x = np.where(mask, rows, 0.0)
+        m = mask.astype(np.float64)
+        return x, m
+
+    def _rebuild(self):
+        rows = self.returns if self.size == self.window else self.returns[:self.size]
+        x, m = self._terms(rows)
+        self._sum_x = x.T @ m          # [i, j]: sum of x_i over the days j is observed too
+        self._sum_xx = (x * x).T @ m   # [i, j]: sum of x_i^2 over the same days
+        self._sum_xy = x.T @ x
+        self._count = m.T @ m
+        self._since_rebuild = 0
+
+    def _add(self, row: np.ndarray, sign: float):
+        x, m = self._terms(row[None, :])
+        x, m = x[0], m[0]
+        self._sum_x += sign * np.outer(x, m)
+        self._sum_xx += sign * np.outer(x * x, m)
+        self._sum_xy += sign * np.outer(x, x)
+        self._count += sign * np.outer(m, m)
+
+    def push(self, day: int, returns: np.ndarray):
+        """
+        Adds the returns of one day (shape (symbols,), NaN for missing), dropping the oldest day of a full window.
+        """
+        if self.size == self.window:
+            self._add(self.returns[self.head], -1.0)
+        else:
+            self.size += 1
+        self.returns[self.head] = returns
+        self.days[self.head] = day
+        self.head = (self.head + 1) % self.window
+        self._add(returns, 1.0)
+        self._since_rebuild += 1
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+
+    def update(self, day: Union[int, str], closes: Union[np.ndarray, dict]):
+        """
+        Adds a new trading day from its closes: an array in symbol order or a mapping symbol -> close.
+        Days that are not after the last one are ignored.
+        :param day: day number (see align_closes) or YYYY-MM-DD.
+        """
+        if isinstance(day, str):
+            day = int(np.datetime64(day, 'D').astype(np.int64))
+        if self.last_day is not None and day <= self.last_day:
+            return
+        if isinstance(closes, dict):
+            closes = np.array([closes.get(s, np.nan) for s in self.symbols], dtype=np.float64)
+        closes = np.asarray(closes, dtype=np.float64)
+        if self.last_day is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.push(day, np.log(closes / self.last_close))
+        self.last_day = day
+        self.last_close = closes
+
+    def fit(self, days: np.ndarray, closes: np.ndarray):
+        """
+        Loads aligned closes (see align_closes) at once: the last window returns are kept and the sums are
+        computed with one matrix product each.
+        """
+        if not len(days):
+            return self
+        returns = log_returns(closes)[-self.window:]
+        self.size = len(returns)
+        self.returns[:] = np.nan
+        self.returns[:self.size] = returns
+        self.days[:self.size] = days[1:][-self.size:] if self.size else []
+        self.head = self.size % self.window
+        self.last_day = int(days[-1])
+        self.last_close = closes[-1].copy()
+        self._rebuild()
+        return self
+
+    @classmethod
+    def from_store(
+            cls,
+            store: OHLCVStore,
+            symbols: Sequence[str],
+            window: int = DEFAULT_WINDOW,
+            min_periods: int = DEFAULT_MIN_PERIODS,
+            to_date: Optional[str] = None,
+            calendar: Optional[TradingCalendar] = None,
+    ) -> 'RollingCorrelation':
+        """
+        Builds the window from the daily bars of an OHLCVStore, ending at to_date.
+        """
+        calendar = calendar or DEFAULT_CALENDAR
+        to_date = to_date or calendar.last_completed_trading_day()
+        # a few extra calendar days per trading day cover weekends and holidays
+        from_date = _day_string(int(np.datetime64(to_date, 'D').astype(np.int64)) - 2 * window - 14)
+        days, closes = align_closes(store, symbols, from_date, to_date, calendar)
+        return cls(symbols, window, min_periods).fit(days[-(window + 1):], closes[-(window + 1):])
+
+    def update_from_store(self, store: OHLCVStore, to_date: Optional[str] = None,
+                          calendar: Optional[TradingCalendar] = None) -> int:
+        """
+        Adds the trading days stored after the last one, e.g. after OHLCVStore.refresh.
+        :return: number of days added.
+        """
+        calendar = calendar or DEFAULT_CALENDAR
+        to_date = to_date or calendar.last_completed_trading_day()
+        from_date = _day_string(self.last_day + 1) if self.last_day is not None else to_date
+        if from_date > to_date:
+            return 0
+        days, closes = align_closes(store, self.symbols, from_date, to_date, calendar)
+        for day, row in zip(days, closes):
+            self.update(int(day), row)
+        return len(days)
+
+    def covariance(self) -> np.ndarray:
+        """
+        :return: (symbols, symbols) sample covariance of daily log returns over the window.
+        """
+        n = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (self._sum_xy - self._sum_x * self._sum_x.T / n) / (n - 1)
+        cov[n < self.min_periods] = np.nan
+        return cov
+
+    def correlation(self) -> np.ndarray:
+        """
+        :return: (symbols, symbols) Pearson correlation over the days each pair traded together.
+        """
+        n = self._count
+        sx, sy = self._sum_x, self._sum_x.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var_x = n * self._sum_xx - sx * sx
+            var_y = n * self._sum_xx.T - sy * sy
+            corr = (n * self._sum_xy - sx * sy) / np.sqrt(var_x * var_y)
+        corr[n < self.min_periods] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def window_days(self) -> List[str]:
+        """
+        :return: the trading days in the window, oldest first.
+        """
+        order = np.arange(self.head - self.size, self.head) % self.window
+        return [_day_string(d) for d in self.days[order]]
+
+    def pairs(self, min_correlation: float = 0.8) -> List[Tuple[str, str, float]]:
+        """
+        :return: (symbol, symbol, correlation) of the distinct pairs at or above min_correlation, highest first.
+        """
+        corr = self.correlation()
+        i, j = np.nonzero(np.triu(corr >= min_correlation, k=1))
+        order = np.argsort(-corr[i, j], kind='stable')
+        return [(self.symbols[a], self.symbols[b], float(corr[a, b])) for a, b in zip(i[order], j[order])]
+
+
+def rolling_correlation(
+        store: OHLCVStore,
+        symbols: Iterable[str],
+        window: int = DEFAULT_WINDOW,
+        min_periods: int = DEFAULT_MIN_PERIODS,
+        to_date: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Correlation matrix of the last window trading days of symbols from an OHLCVStore.
+    """
+    return RollingCorrelation.from_store(store, list(symbols), window, min_periods, to_date).correlation()
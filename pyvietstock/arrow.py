@@ -0,0 +1,136 @@
+import dataclasses
+import typing
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    raise ImportError("Arrow export requires pyarrow: pip install pyvietstock[parquet]")
+
+from pyvietstock.config import HOME_PAGE_URL
+from pyvietstock.records import FIELDS, Field, _REQUIRED, _buy_sell, _epoch_to_time_s, _finance_url
+from pyvietstock.utils import to_time_s
+
+TIMEZONE = 'Asia/Ho_Chi_Minh'
+TIMESTAMP = pa.timestamp('ms', tz=TIMEZONE)
+DEFAULT_BATCH_ROWS = 10000
+
+_PYTHON_TYPES = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+}
+
+
+def _arrow_type(name: str, annotation, field: Field) -> pa.DataType:
+    if field.convert in (to_time_s, _epoch_to_time_s):
+        return TIMESTAMP
+    if field.convert is not None:
+        return pa.string()
+    args = [a for a in typing.get_args(annotation) if a is not type(None)]
+    if len(args) == 1:
+        annotation = args[0]
+    return _PYTHON_TYPES.get(annotation, pa.string())
+
+
+@lru_cache(maxsize=None)
+def schema(record_type: type) -> pa.Schema:
+    """
+    :return: the fixed Arrow schema of a schema.py record type, dates are timestamp[ms, Asia/Ho_Chi_Minh].
+    """
+    fields = FIELDS[record_type]
+    return pa.schema([
+        pa.field(f.name, _arrow_type(f.name, f.type, fields[f.name]))
+        for f in dataclasses.fields(record_type)
+    ])
+
+
+def _timestamps(values: Sequence, convert) -> pa.Array:
+    if convert is _epoch_to_time_s:
+        seconds = pa.array(values, pa.int64())
+        return pc.multiply(seconds, 1000).cast(TIMESTAMP)
+    # "/Date(1717002000000)/" -> milliseconds since the epoch
+    # null, missing or unparseable values stay null: struct_field keeps the validity of the match
+    strings = pa.array([v if isinstance(v, str) else None for v in values], pa.string())
+    milliseconds = pc.struct_field(pc.extract_regex(strings, r'(?P<ms>-?\d+)'), [0])
+    return milliseconds.cast(pa.int64()).cast(TIMESTAMP)
+
+
+def _column(values: Sequence, field: Field, arrow_type: pa.DataType) -> pa.Array:
+    if arrow_type == TIMESTAMP:
+        return _timestamps(values, field.convert)
+    if field.convert is _buy_sell:
+        return pc.if_else(pa.array(values, pa.bool_()), 'B', 'S')
+    if field.convert is _finance_url:
+        return pc.binary_join_element_wise(HOME_PAGE_URL, pa.array(values, pa.string()), '')
+    if field.convert is not None:
+        values = [None if v is None else field.convert(v) for v in values]
+    try:
+        return pa.array(values, arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. integral floats or numbers sent as strings
+        return pa.array(values).cast(arrow_type, safe=False)
+
+
+def record_batch_from_columns(record_type: type, columns: Dict[Union[str, int], Sequence]) -> pa.RecordBatch:
+    """
+    Builds a RecordBatch from raw columns keyed like FIELDS (Vietstock keys or tuple indices),
+    e.g. the t/o/h/l/c/v lists of the historical data response.
+    """
+    arrow_schema = schema(record_type)
+    fields = FIELDS[record_type]
+    length = max((len(c) for c in columns.values()), default=0)
+    arrays = []
+    for arrow_field in arrow_schema:
+        field = fields[arrow_field.name]
+        values = columns.get(field.key)
+        if values is None:
+            if field.default is _REQUIRED:
+                raise KeyError(field.key)
+            values = [field.default] * length
+        arrays.append(_column(values, field, arrow_field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def record_batch(record_type: type, items: Iterable) -> pa.RecordBatch:
+    """
+    Builds a RecordBatch from decoded JSON items (dicts, or sequences for column-indexed types)
+    without creating any record object.
+    """
+    items = items if isinstance(items, list) else list(items)
+    columns = {}
+    for field in FIELDS[record_type].values():
+        key = field.key
+        if isinstance(key, int):
+            columns[key] = [item[key] for item in items]
+        elif field.default is _REQUIRED:
+            columns[key] = [item[key] for item in items]
+        else:
+            columns[key] = [item.get(key, field.default) for item in items]
+    return record_batch_from_columns(record_type, columns)
+
+
+def iter_record_batches(record_type: type, items: Iterable, batch_rows: int = DEFAULT_BATCH_ROWS):
+    """
+    Groups a stream of decoded JSON items into RecordBatches of at most batch_rows rows.
+    """
+    chunk: List = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= batch_rows:
+            yield record_batch(record_type, chunk)
+            chunk = []
+    if chunk:
+        yield record_batch(record_type, chunk)
+
+
+def to_table(batches: Union[pa.RecordBatch, Iterable[pa.RecordBatch]], record_type: type) -> pa.Table:
+    """
+    Concatenates batches of one record type into a Table, e.g. several pages or a streamed response.
+    """
+    if isinstance(batches, pa.RecordBatch):
+        batches = [batches]
+    return pa.Table.from_batches(list(batches), schema=schema(record_type))
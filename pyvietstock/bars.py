@@ -0,0 +1,245 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from pyvietstock.schema import IntradayBar, StockDealDetail
+from pyvietstock.trading_calendar import DAY_SECONDS, DEFAULT_CALENDAR, ICT_OFFSET, TradingCalendar
+from pyvietstock.utils import convert_to_epoch, to_time_s
+
+DEFAULT_INTERVALS = (1, 5, 15)
+
+
+class BarAggregator:
+    """
+    Builds live OHLCV bars from stock_deal_detail ticks for many symbols and several intervals at once.
+    The state of the open bars is kept in small per (interval, symbol) Python lists, so update() applies one tick
+    with a few scalar operations. update_many() aggregates a whole batch per (symbol, bar) with numpy array
+    operations and merges only the resulting bars into the state, flush() checks every bar start at once.
+
+    Emit latency: a bar is emitted when the first tick of a later interval arrives for its symbol, or by flush()
+    once its interval has ended. poll() flushes after every round, so a bar is emitted at most one poll after
+    its interval ends, even if the symbol stops trading.
+    """
+
+    def __init__(
+            self,
+            symbols: Iterable[str] = (),
+            intervals: Sequence[int] = DEFAULT_INTERVALS,
+            on_bar: Union[Callable[[IntradayBar], None], None] = None
+    ):
+        """
+        :param symbols: symbols to track, more can be added later with add_symbol.
+        :param intervals: bar sizes in minutes.
+        :param on_bar: optional callback called with every completed bar.
+        """
+        self.intervals = np.array(intervals, dtype=np.int64)
+        self._seconds = [int(interval) * 60 for interval in intervals]
+        self.on_bar = on_bar
+        self._index = {}
+        self._symbols: List[str] = []
+        self._start: List[List[int]] = [[] for _ in self._seconds]  # [interval][symbol] -> bar start, -1 if none
+        # [interval][symbol] -> [open, high, low, close, volume, value, buy volume, sell volume]
+        self._bars: List[List[List[float]]] = [[] for _ in self._seconds]
+        self._last_total_vol: List[float] = []
+        self._last_day: List[int] = []  # trading day of _last_total_vol, total_vol restarts daily
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    def add_symbol(self, symbol: str) -> int:
+        symbol = symbol.upper()
+        if symbol in self._index:
+            return self._index[symbol]
+        self._index[symbol] = len(self._symbols)
+        self._symbols.append(symbol)
+        for starts in self._start:
+            starts.append(-1)
+        for bars in self._bars:
+            bars.append([0.0] * 8)
+        self._last_total_vol.append(-1.0)
+        self._last_day.append(-1)
+        return self._index[symbol]
+
+    def _bar(self, k: int, i: int) -> IntradayBar:
+        o, h, l, c, volume, value, buy, sell = self._bars[k][i]
+        return IntradayBar(
+            symbol=self._symbols[i],
+            interval=int(self.intervals[k]),
+            time=to_time_s(self._start[k][i], ns=1),
+            open=o, high=h, low=l, close=c,
+            volume=volume,
+            vwap=value / volume if volume else c,
+            buy_volume=buy,
+            sell_volume=sell,
+            imbalance=(buy - sell) / volume if volume else 0.0,
+        )
+
+    def _emit(self, bars: List[IntradayBar]):
+        if self.on_bar is not None:
+            for bar in bars:
+                self.on_bar(bar)
+
+    def _apply(self, k: int, i: int, start: int, o: float, h: float, l: float, c: float,
+               volume: float, value: float, buy: float, sell: float) -> Union[IntradayBar, None]:
+        """
+        Merges the trades of one bar into the state of interval k and symbol i.
+        :return: the previous bar, if the trades start a new one.
+        """
+        bar = self._bars[k][i]
+        previous = self._start[k][i]
+        if previous == start:
+            if h > bar[1]:
+                bar[1] = h
+            if l < bar[2]:
+                bar[2] = l
+            bar[3] = c
+            bar[4] += volume
+            bar[5] += value
+            bar[6] += buy
+            bar[7] += sell
+            return None
+        completed = self._bar(k, i) if previous >= 0 else None
+        self._start[k][i] = start
+        bar[:] = (o, h, l, c, volume, value, buy, sell)
+        return completed
+
+    def update(self, deal: StockDealDetail) -> List[IntradayBar]:
+        """
+        Adds one deal. Deals already seen (total_vol not above the last one of the same day) are ignored,
+        so repeated polls of stock_deal_detail can be fed as they are.
+        :return: bars completed by this deal.
+        """
+        i = self._index.get(deal.symbol.upper())
+        if i is None:
+            i = self.add_symbol(deal.symbol)
+        ts = convert_to_epoch(deal.time)
+        day = (ts + ICT_OFFSET) // DAY_SECONDS
+        last_day = self._last_day[i]
+        if day < last_day or (day == last_day and deal.total_vol <= self._last_total_vol[i]):
+            return []
+        self._last_day[i] = day
+        self._last_total_vol[i] = deal.total_vol
+
+        price, vol = float(deal.price), float(deal.vol)
+        buy, sell = (vol, 0.0) if deal.side == "B" else (0.0, vol)
+        completed = []
+        for k, seconds in enumerate(self._seconds):
+            bar = self._apply(k, i, ts - ts % seconds, price, price, price, price, vol, price * vol, buy, sell)
+            if bar is not None:
+                completed.append(bar)
+        self._emit(completed)
+        return completed
+
+    def update_many(self, deals: Iterable[StockDealDetail]) -> List[IntradayBar]:
+        """
+        Adds a batch of deals, e.g. one stock_deal_detail response (newest first), in trading order.
+        Deals are sorted and de-duplicated as arrays, then reduced to one partial bar per (interval, symbol, bar),
+        so the per-bar work does not grow with the number of ticks.
+        :return: bars completed by the batch, by symbol and time.
+        """
+        deals = list(deals)
+        if not deals:
+            return []
+        rows = []
+        for deal in deals:
+            i = self._index.get(deal.symbol.upper())
+            rows.append(self.add_symbol(deal.symbol) if i is None else i)
+        symbol = np.array(rows, dtype=np.int64)
+        ts = np.array([convert_to_epoch(d.time) for d in deals], dtype=np.int64)
+        total = np.array([d.total_vol for d in deals], dtype=np.float64)
+        price = np.array([d.price for d in deals], dtype=np.float64)
+        vol = np.array([d.vol for d in deals], dtype=np.float64)
+        is_buy = np.array([d.side == "B" for d in deals])
+        day = (ts + ICT_OFFSET) // DAY_SECONDS
+
+        order = np.lexsort((total, day, symbol))
+        symbol, ts, total, price, vol, is_buy, day = (a[order] for a in (symbol, ts, total, price, vol, is_buy, day))
+
+        # a deal is new if (day, total_vol) is above both the previous deal of its symbol and the stored watermark
+        first = np.r_[True, symbol[1:] != symbol[:-1]]
+        prev_day = np.where(first, -1, np.r_[-1, day[:-1]])
+        prev_total = np.where(first, -1.0, np.r_[-1.0, total[:-1]])
+        mark_day, mark_total = np.array(self._last_day)[symbol], np.array(self._last_total_vol)[symbol]
+        new = (((day > prev_day) | ((day == prev_day) & (total > prev_total))) &
+               ((day > mark_day) | ((day == mark_day) & (total > mark_total))))
+        if not new.any():
+            return []
+        symbol, ts, total, price, vol, is_buy, day = (a[new] for a in (symbol, ts, total, price, vol, is_buy, day))
+        last = np.r_[symbol[1:] != symbol[:-1], True]
+        for i, last_day, last_total in zip(symbol[last].tolist(), day[last].tolist(), total[last].tolist()):
+            self._last_day[i] = last_day
+            self._last_total_vol[i] = last_total
+
+        value = price * vol
+        buy_vol = np.where(is_buy, vol, 0.0)
+        sell_vol = vol - buy_vol
+        same_symbol = symbol[1:] == symbol[:-1]
+        completed = []
+        for k, seconds in enumerate(self._seconds):
+            bucket = ts - ts % seconds
+            starts = np.flatnonzero(np.r_[True, ~same_symbol | (bucket[1:] != bucket[:-1])])
+            ends = np.r_[starts[1:], len(ts)] - 1
+            runs = zip(
+                symbol[starts].tolist(), bucket[starts].tolist(), price[starts].tolist(),
+                np.maximum.reduceat(price, starts).tolist(), np.minimum.reduceat(price, starts).tolist(),
+                price[ends].tolist(), np.add.reduceat(vol, starts).tolist(), np.add.reduceat(value, starts).tolist(),
+                np.add.reduceat(buy_vol, starts).tolist(), np.add.reduceat(sell_vol, starts).tolist(),
+            )
+            for i, start, *bar in runs:
+                previous = self._start[k][i]
+                done = self._apply(k, i, start, *bar)
+                if done is not None:
+                    completed.append((i, previous, k, done))
+        completed = [bar for *_, bar in sorted(completed, key=lambda c: c[:3])]
+        self._emit(completed)
+        return completed
+
+    def flush(self, now: Union[int, str, None] = None) -> List[IntradayBar]:
+        """
+        Emits and clears every open bar whose interval has ended at now (default: current time).
+        """
+        now = convert_to_epoch(now) if now is not None else int(time.time())
+        starts = np.array(self._start, dtype=np.int64).reshape(len(self._seconds), len(self._symbols))
+        ended = (starts >= 0) & (starts + self.intervals[:, None] * 60 <= now)
+        completed = []
+        for k, i in zip(*np.nonzero(ended)):
+            completed.append(self._bar(k, i))
+            self._start[k][i] = -1
+        self._emit(completed)
+        return completed
+
+    def current(self, symbol: str, interval: int) -> Union[IntradayBar, None]:
+        """
+        :return: the bar being built for the symbol and interval, or None.
+        """
+        i = self._index.get(symbol.upper())
+        k = np.flatnonzero(self.intervals == interval)
+        if i is None or not len(k) or self._start[k[0]][i] < 0:
+            return None
+        return self._bar(k[0], i)
+
+    def poll(self, vf, max_workers: int = 8, calendar: Union[TradingCalendar, None] = None) -> List[IntradayBar]:
+        """
+        Fetches stock_deal_detail for every tracked symbol concurrently and feeds the deals.
+        Nothing is fetched while the market is closed, open bars are only flushed.
+        :param vf: VietStockFinance instance.
+        :param calendar: trading calendar, DEFAULT_CALENDAR by default.
+        """
+        if not (calendar or DEFAULT_CALENDAR).is_market_open():
+            return self.flush()
+
+        def fetch(symbol):
+            try:
+                return vf.stock_deal_detail(symbol) or []
+            except Exception as e:
+                logging.warning(f"BarAggregator: stock_deal_detail failed for {symbol}: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            batches = list(executor.map(fetch, list(self._symbols)))
+        completed = []
+        for deals in batches:
+            completed.extend(self.update_many(deals))
+        return completed + self.flush()
@@ -0,0 +1,371 @@
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from typing import List
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.gateway import DEFAULT_SOCKET_PATH, Gateway
+from pyvietstock.params import HistoricalResolution, ResultMode
+from pyvietstock.symbols import SymbolMaster, DEFAULT_SYMBOLS_PATH
+from pyvietstock.trading_calendar import end_of_day
+from pyvietstock.transport import FakeTransport, RecordingTransport, ReplayTransport, Transport
+from pyvietstock.warehouse import TABLES, DEFAULT_WAREHOUSE_PATH, Warehouse
+
+DATASETS = ('history', 'events', 'documents', 'bonds')
+
+
+def _fetch_pages(fetch, page_size: int, max_pages: int) -> List:
+    """
+    Calls fetch(page) until a page comes back empty or shorter than page_size.
+    """
+    records = []
+    for page in range(1, max_pages + 1):
+        batch = fetch(page) or []
+        records.extend(batch)
+        if len(batch) < page_size:
+            break
+    return records
+
+
+def fetch_dataset(vf: VietStockFinance, dataset: str, symbol: str, args) -> List:
+    if dataset == 'history':
+        return vf.historical_data(symbol, resolution=args.resolution, from_time=args.from_date, to_time=args.to_date) or []
+    if dataset == 'events':
+        return _fetch_pages(
+            lambda page: vf.events_by_type(symbol, from_date=args.from_date or '', to_date=args.to_date or '',
+                                           page=page, page_size=args.page_size),
+            1,  # events_by_type merges several event types, stop once all of them are exhausted
+            args.max_pages
+        )
+    if dataset == 'documents':
+        return _fetch_pages(lambda page: vf.documents(symbol, page=page), 1, args.max_pages)
+    if dataset == 'bonds':
+        return _fetch_pages(
+            lambda page: vf.bond_related(symbol, page=page, page_size=args.page_size), args.page_size, args.max_pages
+        )
+    raise ValueError(f"Unknown dataset: {dataset}")
+
+
+def output_path(out_dir: str, dataset: str, symbol: str, fmt: str) -> str:
+    return os.path.join(out_dir, dataset, f"symbol={symbol}", f"data.{fmt}")
+
+
+class _CapturingTransport(Transport):
+    """
+    Passes requests through and keeps every raw response body, so the records can be built again elsewhere.
+    """
+
+    def __init__(self, inner: Transport):
+        self.inner = inner
+        self.responses = []
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        response = self.inner.request(method, url, headers=headers, params=params, data=data, stream=stream)
+        self.responses.append((method, url, params, data, response.status_code, response.content))
+        return response
+
+
+def fetch_raw(vf: VietStockFinance, dataset: str, symbol: str, args) -> List[tuple]:
+    """
+    Fetches every page of dataset for symbol and returns the raw responses. Runs in the fetch threads: records
+    are only viewed lazily to follow the pages, the real decoding and building is left to the process pool.
+    """
+    capture = _CapturingTransport(vf._transport)
+    client = VietStockFinance(capture, vf.api_base_url, vf.finance_base_url) \
+        .set_session(vf._headers, vf._token) \
+        .set_result_mode(ResultMode.LAZY)
+    fetch_dataset(client, dataset, symbol, args)
+    return capture.responses
+
+
+def export_partition(responses: List[tuple], base_urls: tuple, dataset: str, symbol: str, args, path: str) -> int:
+    """
+    Decodes the raw responses of fetch_raw, builds the records and writes them to path. Runs inside the process
+    pool: the same requests are replayed from memory, so pagination and parsing match a direct fetch.
+    :param base_urls: (api_base_url, finance_base_url) of the client that fetched them.
+    """
+    transport = FakeTransport()
+    for method, url, params, data, status_code, content in responses:
+        transport.add(url, content, method, status_code, params, data)
+    vf = VietStockFinance(transport, *base_urls)
+    return write_partition(fetch_dataset(vf, dataset, symbol, args), path, args.format)
+
+
+def write_partition(records: List, path: str, fmt: str) -> int:
+    """
+    Converts records to rows and writes them to path.
+    The file is written to a temporary name first so an interrupted export is redone on rerun.
+    """
+    rows = [asdict(record) for record in records]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install pyvietstock[parquet]")
+        pq.write_table(pa.Table.from_pylist(rows), tmp_path)
+    else:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            if rows:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                writer.writeheader()
+                writer.writerows(rows)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def read_symbols(args) -> List[str]:
+    symbols = []
+    if args.symbols:
+        symbols.extend(s.strip().upper() for s in args.symbols.split(',') if s.strip())
+    if args.symbols_file:
+        with open(args.symbols_file, 'r', encoding='utf-8') as f:
+            symbols.extend(line.strip().upper() for line in f if line.strip())
+    if args.universe:
+        master = SymbolMaster(args.symbols_db)
+        if args.universe.upper() == 'ALL':
+            symbols.extend(master.symbols())
+        else:
+            symbols.extend(info.symbol for info in master.by_exchange(args.universe))
+    return list(dict.fromkeys(symbols))
+
+
+def build_client(args) -> VietStockFinance:
+    vf = VietStockFinance()
+    if args.replay:
+        return vf.set_transport(ReplayTransport(args.replay))
+    if args.record:
+        vf.set_transport(RecordingTransport(args.record))
+    if getattr(args, 'dataset', None) != 'history':
+        vf.set_user_name(os.environ.get('VIETSTOCK_LOGIN_EMAIL')) \
+            .set_password(os.environ.get('VIETSTOCK_LOGIN_PASSWORD')) \
+            .login()
+    return vf
+
+
+def export(args) -> int:
+    symbols = read_symbols(args)
+    if not symbols:
+        logging.error("No symbols given, use --symbols, --symbols-file or --universe")
+        return 2
+
+    pending = [
+        s for s in symbols
+        if args.overwrite or not os.path.exists(output_path(args.out, args.dataset, s, args.format))
+    ]
+    skipped = len(symbols) - len(pending)
+    if skipped:
+        logging.info(f"Resuming: {skipped} of {len(symbols)} symbols already exported")
+
+    vf = build_client(args)
+    base_urls = (vf.api_base_url, vf.finance_base_url)
+    if args.dataset == 'history' and args.to_date is None:
+        # pinned so the workers replay exactly the requests the fetch threads sent
+        args.to_date = end_of_day(int(time.time()))
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as fetchers, \
+            ProcessPoolExecutor(max_workers=args.processes) as writers:
+        fetches = {fetchers.submit(fetch_raw, vf, args.dataset, s, args): s for s in pending}
+        writes = {}
+        for future in as_completed(fetches):
+            symbol = fetches[future]
+            try:
+                responses = future.result()
+            except Exception as e:
+                failed += 1
+                logging.error(f"{symbol}: fetch failed: {e}")
+                continue
+            path = output_path(args.out, args.dataset, symbol, args.format)
+            writes[writers.submit(export_partition, responses, base_urls, args.dataset, symbol, args, path)] = symbol
+
+        for future in as_completed(writes):
+            symbol = writes[future]
+            try:
+                rows = future.result()
+                done += 1
+                logging.info(f"[{done + skipped}/{len(symbols)}] {symbol}: {rows} rows")
+            except Exception as e:
+                failed += 1
+                logging.error(f"{symbol}: parse/write failed: {e}")
+
+    logging.info(f"Exported {done} symbols, skipped {skipped}, failed {failed}")
+    return 1 if failed else 0
+
+
+def build_symbols(args) -> int:
+    master = SymbolMaster(args.symbols_db)
+    seeds = read_symbols(args)
+    if not seeds and not len(master):
+        logging.error("The symbol master is empty, give seed symbols with --symbols or --symbols-file")
+        return 2
+    vf = build_client(args)
+    refreshed = master.build(vf, seeds, max_age=args.max_age, max_symbols=args.limit, max_workers=args.workers)
+    for exchange in master.exchanges():
+        logging.info(f"{exchange}: {len(master.by_exchange(exchange))} symbols")
+    logging.info(f"Refreshed {refreshed} symbols, {len(master)} in {args.symbols_db}")
+    return 0
+
+
+def sync_warehouse(args) -> int:
+    symbols = read_symbols(args)
+    if not symbols:
+        logging.error("No symbols given, use --symbols, --symbols-file or --universe")
+        return 2
+    warehouse = Warehouse(args.db)
+    if os.path.exists(args.symbols_db):
+        master = SymbolMaster(args.symbols_db)
+        warehouse.upsert_symbols(master.get(s) for s in master.symbols())
+    vf = build_client(args)
+    for dataset in args.datasets:
+        written = warehouse.sync(vf, dataset, symbols, since=args.from_date, page_size=args.page_size,
+                                 max_pages=args.max_pages, full=args.full, max_workers=args.workers)
+        logging.info(f"{dataset}: {sum(written.values())} rows written, {len(symbols) - len(written)} symbols failed")
+    warehouse.close()
+    return 0
+
+
+def run_gateway(args) -> int:
+    Gateway(build_client(args), path=args.socket, host=args.host, port=args.port).run()
+    return 0
+
+
+def run_proxy(args) -> int:
+    from pyvietstock.proxy import ProxyServer
+    server = ProxyServer(build_client(args), host=args.host, port=args.port, ttl=args.ttl)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+BENCH_ENDPOINTS = ('trading_info', 'stock_deal_detail', 'historical_data', 'statistics_by_period')
+
+
+def bench(args) -> int:
+    from pyvietstock.transport import BACKENDS, make_transport
+    symbols = read_symbols(args)
+    if not symbols:
+        logging.error("No symbols given, use --symbols, --symbols-file or --universe")
+        return 2
+    backends = args.backends.split(',')
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        logging.error(f"Unknown backends {', '.join(unknown)}, expected {', '.join(BACKENDS)}")
+        return 2
+    if args.endpoint == 'historical_data':
+        args.dataset = 'history'  # no login needed
+    vf = build_client(args)
+
+    def timed(symbol):
+        started = time.perf_counter()
+        try:
+            getattr(vf, args.endpoint)(symbol)
+            return time.perf_counter() - started, None
+        except Exception as e:
+            return time.perf_counter() - started, e
+
+    print(f"{'backend':<10}{'calls':>7}{'errors':>8}{'seconds':>9}{'calls/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for backend in backends:
+        vf.set_transport(make_transport(backend))
+        latencies, errors = [], 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for _ in range(args.rounds):
+                for latency, error in executor.map(timed, symbols):
+                    latencies.append(latency)
+                    errors += error is not None
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        print(f"{backend:<10}{len(latencies):>7}{errors:>8}{elapsed:>9.2f}{len(latencies) / elapsed:>9.1f}"
+              f"{p50:>9.0f}{p95:>9.0f}")
+    return 0
+
+
+def add_client_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--symbols', help='comma separated symbols, e.g. FPT,VNM')
+    parser.add_argument('--symbols-file', help='file with one symbol per line')
+    parser.add_argument('--universe', help='all symbols of an exchange in the symbol master, e.g. HOSE, or ALL')
+    parser.add_argument('--symbols-db', default=DEFAULT_SYMBOLS_PATH, help='symbol master file')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent fetches (default: 8)')
+    parser.add_argument('--record', metavar='ARCHIVE', help='record raw responses to an archive')
+    parser.add_argument('--replay', metavar='ARCHIVE', help='serve responses from an archive, no network')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='pyvietstock', description='Vietstock Finance data tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    exporter = commands.add_parser('export', help='bulk export a dataset per symbol to Parquet or CSV')
+    exporter.add_argument('dataset', choices=DATASETS)
+    add_client_arguments(exporter)
+    exporter.add_argument('--resolution', default=HistoricalResolution.DEFAULT, help='history resolution (default: 1D)')
+    exporter.add_argument('--from', dest='from_date', help='start date, YYYY-MM-DD')
+    exporter.add_argument('--to', dest='to_date', help='end date, YYYY-MM-DD')
+    exporter.add_argument('--out', default='data', help='output directory (default: data)')
+    exporter.add_argument('--format', choices=('parquet', 'csv'), default='parquet')
+    exporter.add_argument('--processes', type=int, default=None, help='parse/convert processes (default: CPU count)')
+    exporter.add_argument('--page-size', type=int, default=20)
+    exporter.add_argument('--max-pages', type=int, default=50)
+    exporter.add_argument('--overwrite', action='store_true', help='re-export symbols that already have output')
+    exporter.set_defaults(func=export)
+
+    symbols = commands.add_parser('symbols', help='build or refresh the local symbol master')
+    add_client_arguments(symbols)
+    symbols.add_argument('--max-age', type=int, default=7 * 24 * 3600, help='refresh symbols older than this (seconds)')
+    symbols.add_argument('--limit', type=int, default=None, help='maximum number of symbols to refresh')
+    symbols.set_defaults(func=build_symbols)
+
+    sync = commands.add_parser('sync', help='sync events, news, documents and bonds into the local warehouse')
+    sync.add_argument('datasets', nargs='+', choices=list(TABLES))
+    add_client_arguments(sync)
+    sync.add_argument('--db', default=DEFAULT_WAREHOUSE_PATH, help=f'warehouse file (default: {DEFAULT_WAREHOUSE_PATH})')
+    sync.add_argument('--from', dest='from_date', help='start date for dated datasets, YYYY-MM-DD')
+    sync.add_argument('--page-size', type=int, default=20)
+    sync.add_argument('--max-pages', type=int, default=50)
+    sync.add_argument('--full', action='store_true', help='re-read all pages instead of stopping at stored rows')
+    sync.set_defaults(func=sync_warehouse)
+
+    gateway = commands.add_parser('gateway', help='serve shared live polls to local subscribers')
+    gateway.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help=f'Unix socket path (default: {DEFAULT_SOCKET_PATH})')
+    gateway.add_argument('--host', help='TCP host (default: 127.0.0.1 when --port is given)')
+    gateway.add_argument('--port', type=int, help='listen on TCP instead of the Unix socket')
+    gateway.add_argument('--record', metavar='ARCHIVE', help='record raw responses to an archive')
+    gateway.add_argument('--replay', metavar='ARCHIVE', help='serve responses from an archive, no network')
+    gateway.set_defaults(func=run_gateway)
+
+    proxy = commands.add_parser('proxy', help='serve the client methods over HTTP with a shared cache and session')
+    proxy.add_argument('--host', default='127.0.0.1')
+    proxy.add_argument('--port', type=int, default=8765)
+    proxy.add_argument('--ttl', type=float, default=30, help='cache ttl in seconds (default: 30)')
+    proxy.add_argument('--record', metavar='ARCHIVE', help='record raw responses to an archive')
+    proxy.add_argument('--replay', metavar='ARCHIVE', help='serve responses from an archive, no network')
+    proxy.set_defaults(func=run_proxy)
+
+    bencher = commands.add_parser('bench', help='compare transport backends on a universe-wide poll')
+    add_client_arguments(bencher)
+    bencher.add_argument('--backends', default='requests,session,http2',
+                         help='comma separated transport backends (default: requests,session,http2)')
+    bencher.add_argument('--endpoint', choices=BENCH_ENDPOINTS, default='trading_info')
+    bencher.add_argument('--rounds', type=int, default=3, help='polls of the whole universe per backend')
+    bencher.set_defaults(func=bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.getLogger().setLevel(logging.INFO)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
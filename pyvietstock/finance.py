@@ -1,31 +1,49 @@
 import re
 import time
 from datetime import datetime, timedelta
-from functools import lru_cache
-from typing import AnyStr, Union, List
+from functools import lru_cache, partial
+from typing import AnyStr, Union, List, Iterator
+from urllib.parse import urlparse
 import logging
-import requests
 
 from pyvietstock.account import login
+from pyvietstock.instrumentation import NOOP, Instrumentation, InstrumentedTransport, current_endpoint
 from pyvietstock.config import API_BASE_URL, FINANCE_BASE_URL, DEFAULT_API_HEADERS
 from pyvietstock.params import HistoricalResolution, DocumentType, Period, TransferTypeID, EventType, \
-    IncomeStatementPeriod
+    IncomeStatementPeriod, ResultMode
+from pyvietstock.records import build_record, view_type
 from pyvietstock.schema import (
     EventTransferData, HistoricalData, TradingInfo, MarketPrice, StockDealDetail,
     StatisticsData, CompanyRelation, Document, HeaderNews, BondRelated, NewsArticle, ChannelNewsArticle, CompanyEvent,
     EventSameIndustry, IncomeStatementData
 )
-from pyvietstock.utils import convert_to_epoch, to_time_s
+from pyvietstock.streaming import iter_response_items
+from pyvietstock.trading_calendar import end_of_day
+from pyvietstock.transport import Transport, RequestsTransport
+from pyvietstock.utils import convert_to_epoch
 
 
 class VietStockFinance:
-    def __init__(self):
+    def __init__(
+            self,
+            transport: Union[Transport, None] = None,
+            api_base_url: str = API_BASE_URL,
+            finance_base_url: str = FINANCE_BASE_URL,
+    ):
+        """
+        :param transport: how requests are sent, RequestsTransport by default (see pyvietstock.transport).
+        :param api_base_url: base URL of the chart API, e.g. a local stand-in.
+        :param finance_base_url: base URL of the finance site endpoints.
+        """
         self._user_name = self.password = None
         self._headers = None
         self._token = None
         self._logged_in = False
-        self.api_base_url = API_BASE_URL
-        self.finance_base_url = FINANCE_BASE_URL
+        self._transport = transport or RequestsTransport()
+        self._instrumentation = NOOP
+        self._result_mode = ResultMode.DEFAULT
+        self.api_base_url = api_base_url
+        self.finance_base_url = finance_base_url
         self.home_url = "https://finance.vietstock.vn"
 
     def set_user_name(self, user_name):
@@ -36,11 +54,127 @@ class VietStockFinance:
         self.password = password
         return self
 
+    def set_transport(self, transport: Transport):
+        """
+        Replaces the transport used by every method, e.g. RecordingTransport or ReplayTransport.
+        """
+        self._transport = transport
+        if self._instrumentation.enabled:
+            self._transport = InstrumentedTransport(transport, self._instrumentation)
+        return self
+
+    def set_instrumentation(self, instrumentation: Union[Instrumentation, None]):
+        """
+        Measures every call: network time, response bytes and cache hits per request, JSON decode time,
+        record build time and record counts, see pyvietstock.instrumentation (StatsCollector,
+        OpenTelemetryInstrumentation). None turns it off again, which is the default.
+        """
+        if isinstance(self._transport, InstrumentedTransport):
+            self._transport = self._transport.inner
+        self._instrumentation = instrumentation or NOOP
+        return self.set_transport(self._transport)
+
+    def stats(self) -> dict:
+        """
+        :return: the per-endpoint summary of a StatsCollector instrumentation, empty otherwise.
+        """
+        stats = getattr(self._instrumentation, 'stats', None)
+        return stats() if stats is not None else {}
+
+    def _built(self, record_type: type, started: float, count: int):
+        self._instrumentation.build(current_endpoint(), record_type, time.perf_counter() - started, count)
+
+    def set_base_urls(self, api_base_url: Union[str, None] = None, finance_base_url: Union[str, None] = None):
+        """
+        Points the client at other hosts, e.g. a local stand-in or a mirror. None keeps the current URL.
+        """
+        if api_base_url is not None:
+            self.api_base_url = api_base_url.rstrip('/')
+        if finance_base_url is not None:
+            self.finance_base_url = finance_base_url.rstrip('/')
+        return self
+
+    def _api_headers(self) -> dict:
+        if self.api_base_url == API_BASE_URL:
+            return DEFAULT_API_HEADERS
+        return {**DEFAULT_API_HEADERS, 'Host': urlparse(self.api_base_url).netloc}
+
+    def set_result_mode(self, result_mode: Union[ResultMode, str]):
+        """
+        ResultMode.DATACLASS (default) builds every record eagerly. ResultMode.LAZY returns thin views over the
+        decoded JSON that convert a field only when it is read, dataclasses.asdict still works on them.
+        ResultMode.ARROW makes list methods return one pyarrow RecordBatch (streams yield RecordBatches),
+        methods returning a single record still return a dataclass.
+        """
+        self._result_mode = result_mode
+        return self
+
     def login(self):
         self._headers, self._token = login(self._user_name, self.password)
         self._logged_in = True
         return self
 
+    def set_session(self, headers, token):
+        """
+        Uses already captured login headers and token, e.g. handed out by a SessionPool.
+        """
+        self._headers, self._token = headers, token
+        self._logged_in = token is not None
+        return self
+
+    def _record(self, record_type: type, item):
+        """
+        Builds one record of record_type from a decoded JSON item, as a dataclass or as a lazy view
+        depending on the result mode.
+        """
+        started = time.perf_counter()
+        if self._result_mode == ResultMode.LAZY:
+            record = view_type(record_type)(item)
+        else:
+            record = build_record(record_type, item)
+        if self._instrumentation.enabled:
+            self._built(record_type, started, 1)
+        return record
+
+    def _records(self, record_type: type, items) -> list:
+        """
+        Builds the records of a list response, or a single pyarrow RecordBatch in ResultMode.ARROW.
+        """
+        started = time.perf_counter()
+        if self._result_mode == ResultMode.ARROW:
+            from pyvietstock.arrow import record_batch
+            records = record_batch(record_type, items)
+        else:
+            make = view_type(record_type) if self._result_mode == ResultMode.LAZY else partial(build_record, record_type)
+            records = [make(item) for item in items]
+        if self._instrumentation.enabled:
+            self._built(record_type, started, len(records))
+        return records
+
+    def _stream_records(self, response, record_type: type, depth: int = 1) -> Iterator:
+        # build time of a stream is the time spent producing records (decoding included), not the consumer's
+        build_seconds, count = 0.0, 0
+        started = time.perf_counter()
+        try:
+            if self._result_mode == ResultMode.ARROW:
+                from pyvietstock.arrow import iter_record_batches
+                records = iter_record_batches(record_type, iter_response_items(response, depth=depth))
+            else:
+                make = view_type(record_type) if self._result_mode == ResultMode.LAZY else partial(build_record, record_type)
+                records = map(make, iter_response_items(response, depth=depth))
+            for record in records:
+                build_seconds += time.perf_counter() - started
+                count += record.num_rows if self._result_mode == ResultMode.ARROW else 1
+                yield record
+                started = time.perf_counter()
+        finally:
+            if self._instrumentation.enabled:
+                endpoint = urlparse(getattr(response, 'url', None) or '').path.lower() or current_endpoint()
+                self._instrumentation.build(endpoint, record_type, build_seconds, count)
+            close = getattr(response, 'close', None)
+            if close is not None:
+                close()
+
     def historical_data(
             self,
             symbol: AnyStr, resolution: Union[HistoricalResolution, AnyStr] = HistoricalResolution.DEFAULT,
@@ -56,7 +190,8 @@ class VietStockFinance:
         :return: list of historical data with fields: time, open, high, low, close, volume
         """
         resolution = resolution if "m" not in resolution else resolution.replace("m", "")
-        to_time = convert_to_epoch(to_time) if to_time is not None else int(time.time())
+        # by default the range ends with the current trading day (ICT), so repeated calls share cache entries
+        to_time = convert_to_epoch(to_time) if to_time is not None else end_of_day(int(time.time()))
         from_time = convert_to_epoch(from_time) if from_time is not None else to_time - 31536000
 
         url = f'{self.api_base_url}/tvnew/history'
@@ -67,18 +202,20 @@ class VietStockFinance:
             'to': to_time,
         }
 
-        response = requests.get(url, headers=DEFAULT_API_HEADERS, params=params)
+        response = self._transport.get(url, headers=self._api_headers(), params=params)
         response.raise_for_status()
         data = response.json()
         if response.status_code == 200:
-            return [HistoricalData(
-                time=to_time_s(t, ns=1),
-                open=o,
-                high=h,
-                low=l,
-                close=c,
-                volume=v
-            ) for t, o, h, l, c, v in zip(data['t'], data['o'], data['h'], data['l'], data['c'], data['v'])]
+            if self._result_mode == ResultMode.ARROW:
+                from pyvietstock.arrow import record_batch_from_columns
+                started = time.perf_counter()
+                batch = record_batch_from_columns(HistoricalData, dict(enumerate(
+                    (data['t'], data['o'], data['h'], data['l'], data['c'], data['v'])
+                )))
+                if self._instrumentation.enabled:
+                    self._built(HistoricalData, started, batch.num_rows)
+                return batch
+            return self._records(HistoricalData, zip(data['t'], data['o'], data['h'], data['l'], data['c'], data['v']))
         else:
             response.raise_for_status()  # Raise an exception for non-200 status codes
             return None
@@ -103,58 +240,11 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token
         }
 
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
         response.raise_for_status()
         data = response.json()
         if response.status_code == 200:
-            return TradingInfo(
-                time=to_time_s(data["TradingDate"]),
-                symbol=data["StockCode"],
-                largest_trading_volume=data["KLCPLH"],
-                total_volume_traded=data["KLCPNY"],
-                prior_close_price=data["PriorClosePrice"],
-                ceiling_price=data["CeilingPrice"],
-                floor_price=data["FloorPrice"],
-                total_vol=data["TotalVol"],
-                total_val=data["TotalVal"],
-                market_capital=data["MarketCapital"],
-                highest_price=data["HighestPrice"],
-                lowest_price=data["LowestPrice"],
-                open_price=data["OpenPrice"],
-                last_price=data["LastPrice"],
-                avr_price=data["AvrPrice"],
-                change=data["Change"],
-                per_change=data["PerChange"],
-                min_52w=data["Min52W"],
-                max_52w=data["Max52W"],
-                vol_52w=data["Vol52W"],
-                outstanding_buy=data["OutstandingBuy"],
-                outstanding_sell=data["OutstandingSell"],
-                owned_ratio=data["OwnedRatio"],
-                dividend=data["Dividend"],
-                yield_=data["Yield"],
-                beta=data["Beta"],
-                eps=data["EPS"],
-                pe=data["PE"],
-                feps=data["FEPS"],
-                bvps=data["BVPS"],
-                pb=data["PB"],
-                total_room=data["TotalRoom"],
-                curr_room=data["CurrRoom"],
-                remain_room=data["RemainRoom"],
-                f_buy_vol=data["F_BuyVol"],
-                f_buy_val=data["F_BuyVal"],
-                f_sell_vol=data["F_SellVol"],
-                f_sell_val=data["F_SellVal"],
-                f_buy_put_vol=data["F_BuyPutVol"],
-                f_buy_put_val=data["F_BuyPutVal"],
-                f_sell_put_vol=data["F_SellPutVol"],
-                f_sell_put_val=data["F_SellPutVal"],
-                market_status=data["MarketStatus"],
-                color_id=data["ColorId"],
-                status_name=data["StatusName"],
-                stock_status=data["StockStatus"]
-            )
+            return self._record(TradingInfo, data)
         else:
             response.raise_for_status()  # Raise an exception for non-200 status codes
             return None
@@ -170,19 +260,10 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token
         }
 
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
         if response.status_code == 200:
             data = response.json()
-            return [
-                MarketPrice(
-                    time=to_time_s(record["TradingDate"]),
-                    symbol=record["Code"],
-                    name=record["Name"],
-                    price=record["Price"],
-                    change=record["Change"],
-                    per_change=record["PerChange"]
-                ) for record in data
-            ]
+            return self._records(MarketPrice, data)
         else:
             response.raise_for_status()  # Raise an exception for non-200 status codes
             return None
@@ -213,23 +294,10 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token
         }
 
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
         if response.status_code == 200:
             data = response.json()
-            return [
-                StockDealDetail(
-                    time=to_time_s(record["TradingDate"]),
-                    symbol=record["Stockcode"],
-                    package=record["Package"],
-                    price=record["Price"],
-                    vol=record["Vol"],
-                    total_vol=record["TotalVol"],
-                    total_val=record["TotalVal"],
-                    change=record["Change"],
-                    side="B" if record["IsBuy"] else "S",
-                    per_change=record["PerChange"]
-                ) for record in data
-            ]
+            return self._records(StockDealDetail, data)
         else:
             response.raise_for_status()  # Raise an exception for non-200 status codes
             return None
@@ -280,31 +348,12 @@ class VietStockFinance:
             'toDate': to_date,
             '__RequestVerificationToken': self._token
         }
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
         if response.status_code == 200:
             data = response.json()
             if data:
                 record = data['Data'][0]  # Assuming there is only one record in the response
-                return StatisticsData(
-                    f_date=to_time_s(record["F_Date"]),
-                    t_date=to_time_s(record["T_Date"]),
-                    f_last_price=record["F_LastPrice"],
-                    f_total_vol=record["F_TotalVol"],
-                    t_last_price=record["T_LastPrice"],
-                    t_total_vol=record["T_TotalVol"],
-                    num_trading_days=record["NoTr"],
-                    change=record["Change"],
-                    per_change=record["PerChange"],
-                    max_price=record["MaxPrice"],
-                    min_price=record["MinPrice"],
-                    avg_vol=record["AvgVol"],
-                    max_vol=record["MaxVol"],
-                    min_vol=record["MinVol"],
-                    date_max_price=to_time_s(record["DateMaxPrice"]),
-                    date_min_price=to_time_s(record["DateMinPrice"]),
-                    date_max_vol=to_time_s(record["DateMaxVol"]),
-                    date_min_vol=to_time_s(record["DateMinVol"])
-                )
+                return self._record(StatisticsData, record)
             else:
                 logging.warning("No data found for the given period.")
                 return None
@@ -348,31 +397,12 @@ class VietStockFinance:
             'type': period,
             '__RequestVerificationToken': self._token
         }
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
         if response.status_code == 200:
             data = response.json()
             if data:
                 record = data[0]  # Assuming there is only one record in the response
-                return StatisticsData(
-                    f_date=to_time_s(record["F_Date"]),
-                    t_date=to_time_s(record["T_Date"]),
-                    f_last_price=record["F_LastPrice"],
-                    f_total_vol=record["F_TotalVol"],
-                    t_last_price=record["T_LastPrice"],
-                    t_total_vol=record["T_TotalVol"],
-                    num_trading_days=record["NoTr"],
-                    change=record["Change"],
-                    per_change=record["PerChange"],
-                    max_price=record["MaxPrice"],
-                    min_price=record["MinPrice"],
-                    avg_vol=record["AvgVol"],
-                    max_vol=record["MaxVol"],
-                    min_vol=record["MinVol"],
-                    date_max_price=to_time_s(record["DateMaxPrice"]),
-                    date_min_price=to_time_s(record["DateMinPrice"]),
-                    date_max_vol=to_time_s(record["DateMaxVol"]),
-                    date_min_vol=to_time_s(record["DateMinVol"])
-                )
+                return self._record(StatisticsData, record)
             else:
                 logging.warning("No data found for the given period.")
                 return None
@@ -385,12 +415,14 @@ class VietStockFinance:
         symbol: AnyStr,
         page: int = 1,
         page_size: int = 20,
-    ) -> Union[List[CompanyRelation], None]:
+        stream: bool = False,
+    ) -> Union[List[CompanyRelation], Iterator[CompanyRelation], None]:
         """
         Fetches company relations filter based on provided parameters.
         :param symbol: symbol code.
         :param page: Page number (default: 1).
         :param page_size: Number of items per page (default: 10).
+        :param stream: if True, decode the response incrementally and return an iterator of records.
         :return: A list containing dictionaries with company relation details.
         """
         url = f'{self.finance_base_url}/company/GetCompanyRelationFilter'
@@ -400,29 +432,13 @@ class VietStockFinance:
             'PageSize': page_size,
             '__RequestVerificationToken': self._token
         }
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload, stream=stream)
 
         if response.status_code == 200:
+            if stream:
+                return self._stream_records(response, CompanyRelation)
             data = response.json()
-            return [
-                CompanyRelation(
-                    symbol=item.get("StockCode", ""),
-                    cat_id=item.get("CatID", 0),
-                    last_price=item.get("LastPrice", 0),
-                    change=item.get("Change", 0),
-                    per_change=item.get("PerChange", 0.0),
-                    highest_price=item.get("HighestPrice", 0),
-                    lowest_price=item.get("LowestPrice", 0),
-                    total_vol=item.get("TotalVol", 0),
-                    total_val=item.get("TotalVal", 0),
-                    foreign_buy_vol=item.get("ForeignBuyVol", 0),
-                    foreign_sell_vol=item.get("ForeignSellVol", 0),
-                    market_capital=item.get("MarketCapital", 0),
-                    pe=item.get("PE", 0.0),
-                    pb=item.get("PB", 0.0),
-                    url=item.get("Url", ""),
-                ) for item in data
-            ]
+            return self._records(CompanyRelation, data)
         else:
             response.raise_for_status()
             return None
@@ -448,24 +464,13 @@ class VietStockFinance:
         }
         if document_type is not None:
             payload['type'] = document_type
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
 
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, list):
                 formatted_data = []
-                return [
-                    Document(
-                        file_ext=document.get("FileExt", ""),
-                        update_time=document.get("UpdateTime"),
-                        total_row=document.get("TotalRow", 0),
-                        file_info_id=document.get("FileInfoID", 0),
-                        url=document.get("Url", ""),
-                        title=document.get("Title", ""),
-                        full_name=document.get("FullName", ""),
-                        last_update=to_time_s(document.get("LastUpdate"))
-                    ) for document in data
-                ]
+                return self._records(Document, data)
         else:
             response.raise_for_status()
             return None
@@ -485,17 +490,11 @@ class VietStockFinance:
             'pageSize': page_size,
         }
 
-        response = requests.post(url, params=payload, headers=self._headers)
+        response = self._transport.post(url, params=payload, headers=self._headers)
 
         if response.status_code == 200:
             data = response.json()
-            return [
-                HeaderNews(
-                    title=news_item.get("Title", ""),
-                    url=f"https://finance.vietstock.vn{news_item.get('URL', '')}",
-                    publish_time=to_time_s(news_item.get("PublishTime", ""))
-                ) for news_item in data
-            ]
+            return self._records(HeaderNews, data)
         else:
             response.raise_for_status()
             return None
@@ -505,8 +504,14 @@ class VietStockFinance:
             f_date: AnyStr = None, t_date: AnyStr = None,
             page: int = 1, page_size: int = 20,
             order_by: str = "EventID", order_dir: str = "DESC",
-            transfer_type_id: TransferTypeID = TransferTypeID.ALL
-    ) -> Union[List[EventTransferData], None]:
+            transfer_type_id: TransferTypeID = TransferTypeID.ALL,
+            stream: bool = False
+    ) -> Union[List[EventTransferData], Iterator[EventTransferData], None]:
+        """
+        Fetches insider, related person and large shareholder transfer events for a stock symbol.
+        With stream=True the response is decoded incrementally and an iterator of records is returned,
+        so large page_size values keep memory flat.
+        """
 
         # Set default f_date and t_date if not provided
         if not f_date or not t_date:
@@ -528,60 +533,13 @@ class VietStockFinance:
             "__RequestVerificationToken": self._token
         }
 
-        response = requests.post(url, data=payload, headers=self._headers)
-        data = response.json()
+        response = self._transport.post(url, data=payload, headers=self._headers, stream=stream)
 
         if response.status_code == 200:
-            return [
-                EventTransferData(
-                    event_id=item["EventID"],
-                    symbol=item["StockCode"],
-                    finance_url=item["FinanceURL"],
-                    content=item["Content"],
-                    title=item["Title"],
-                    file_url=item["FileUrl"],
-                    type_name=item["TypeName"],
-                    transfer_type_id=item["TransferTypeID"],
-                    position_cd=item["PositionCD"],
-                    extra_position_nlq=item["ExtraPositionNLQ"],
-                    extra_position_nlq_ex=item["ExtraPositionNLQEx"],
-                    extra_position_nn=item["ExtraPositionNN"],
-                    relationship_type=item["RelationShipType"],
-                    dtthcd=item["DTTHCD"],
-                    dtthlq=item["DTTHLQ"],
-                    dtlqlq=item["DTLQLQ"],
-                    nvth=item["NVTH"],
-                    register_buy_volume=item["RegisterBuyVolume"],
-                    buy_volume=item["BuyVolume"],
-                    register_sell_volume=item["RegisterSellVolume"],
-                    sell_volume=item["SellVolume"],
-                    register_volume_before=item["RegisterVolumeBefore"],
-                    register_volume_after=item["RegisterVolumeAfter"],
-                    volume_before=item["VolumeBefore"],
-                    volume_after=item["VolumeAfter"],
-                    date_buy_expected=item["DateBuyExpected"],
-                    date_sell_expected=item["DateSellExpected"],
-                    date_action_to=item["DateActionTo"],
-                    position_cd_ex=item["PositionCDEx"],
-                    extra_position_id_nn_ex=item["ExtraPositionIDNNEx"],
-                    date_action_from=item["DateActionFrom"],
-                    ndd_title=item["NDDTitle"],
-                    nddth=item["NDDTH"],
-                    ndd_position=item["NDDPosition"],
-                    ndd_extra_position=item["NDDExtraPosition"],
-                    transfer_title_type_id=item["TransferTitleTypeID"],
-                    register_buy_volume_percent=item["RegisterBuyVolumePercent"],
-                    buy_volume_percent=item["BuyVolumePercent"],
-                    register_sell_volume_percent=item["RegisterSellVolumePercent"],
-                    sell_volume_percent=item["SellVolumePercent"],
-                    register_volume_before_percent=item["RegisterVolumeBeforePercent"],
-                    register_volume_after_percent=item["RegisterVolumeAfterPercent"],
-                    volume_before_percent=item["VolumeBeforePercent"],
-                    volume_after_percent=item["VolumeAfterPercent"],
-                    status_name=item["StatusName"],
-                    total_record=item["TotalRecord"],
-                    row=item["Row"]
-                ) for item in data]
+            if stream:
+                return self._stream_records(response, EventTransferData)
+            data = response.json()
+            return self._records(EventTransferData, data)
         else:
             response.raise_for_status()
             return None
@@ -613,30 +571,12 @@ class VietStockFinance:
             'pageSize': page_size
         }
 
-        response = requests.post(url, headers=self._headers, data=payload)
+        response = self._transport.post(url, headers=self._headers, data=payload)
 
         if response.status_code == 200:
             data = response.json()
             if isinstance(data, list):
-                return [
-                    BondRelated(
-                        key_code=bond.get("KeyCode", ""),
-                        stock_code=bond.get("StockCode", ""),
-                        bond_code=bond.get("BondCode", ""),
-                        release_date=to_time_s(bond.get("ReleaseDate")),
-                        due_date=to_time_s(bond.get("DueDate")),
-                        face_value=bond.get("FaceValue", 0),
-                        issue_rate=bond.get("IssueRate", 0.0),
-                        issue_volume=bond.get("IssuaVolume", 0),
-                        outstanding_shares=bond.get("OutstandingShares", 0),
-                        company_code=bond.get("CompanyCode"),
-                        company_name=bond.get("CompanyName"),
-                        company_url=bond.get("CompanyURL"),
-                        interest_rate_type=bond.get("InterestRateType", ""),
-                        interest_period=bond.get("InterestPeriod", ""),
-                        total_record=bond.get("TotalRecord", 0)
-                    ) for bond in data
-                ]
+                return self._records(BondRelated, data)
             else:
                 logging.warning("Error: Data received is not in expected list format.")
                 return None
@@ -648,13 +588,15 @@ class VietStockFinance:
             self,
             symbol: str,
             page: int = 1,
-            page_size: int = 5
-    ) -> Union[List[NewsArticle], None]:
+            page_size: int = 5,
+            stream: bool = False
+    ) -> Union[List[NewsArticle], Iterator[NewsArticle], None]:
         """
         Fetches news articles based on provided parameters.
         :param symbol:
         :param page:
         :param page_size:
+        :param stream: if True, decode the response incrementally and return an iterator of records.
         :return:
         """
         url = f"{self.finance_base_url}/data/getnewsbycode"
@@ -666,25 +608,13 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token
         }
 
-        response = requests.post(url, data=params, headers=self._headers)
+        response = self._transport.post(url, data=params, headers=self._headers, stream=stream)
         if response.status_code == 200:
-            articles = []
+            if stream:
+                # the response is a list of groups, one per news type
+                return self._stream_records(response, NewsArticle, depth=2)
             response_data = response.json()
-            for group in response_data:
-                for item in group:
-                    article = NewsArticle(
-                        symbol=item.get('StockCode'),
-                        channel_id=item.get('ChannelID'),
-                        head=item.get('Head'),
-                        article_id=item.get('ArticleID'),
-                        title=item.get('Title'),
-                        publish_time=to_time_s(item.get('PublishTime')),
-                        content=item.get('Content'),
-                        url=item.get('URL'),
-                        total_row=item.get('TotalRow')
-                    )
-                    articles.append(article)
-            return articles
+            return self._records(NewsArticle, [item for group in response_data for item in group])
         else:
             response.raise_for_status()
             return None
@@ -713,24 +643,10 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token
         }
 
-        response = requests.post(url, data=params, headers=self._headers)
+        response = self._transport.post(url, data=params, headers=self._headers)
         if response.status_code == 200:
-            articles = []
             response_data = response.json()
-            for item in response_data:
-                article = ChannelNewsArticle(
-                    article_id=item.get('ArticleID'),
-                    title=item.get('Title'),
-                    head=item.get('Head'),
-                    head_image_url=item.get('HeadImageUrl'),
-                    publish_time=to_time_s(item.get('PublishTime')),
-                    channel_id=item.get('ChannelID'),
-                    url=item.get('URL'),
-                    row=item.get('Row'),
-                    total_row=item.get('TotalRow')
-                )
-                articles.append(article)
-            return articles
+            return self._records(ChannelNewsArticle, response_data)
         else:
             response.raise_for_status()
             return None
@@ -758,7 +674,7 @@ class VietStockFinance:
         """
         url = f"{self.finance_base_url}/data/eventstypedata"
 
-        events = []  # return this
+        items = []
         for event_type_id in EventType.ALL:
             params = {
                 'eventTypeID': event_type_id,
@@ -774,34 +690,14 @@ class VietStockFinance:
                 '__RequestVerificationToken': self._token
             }
 
-            response = requests.post(url, data=params, headers=self._headers)
+            response = self._transport.post(url, data=params, headers=self._headers)
             if response.status_code == 200:
                 response_data = response.json()
-                response_data = response_data[0]
-                for item in response_data:
-                    events.append(CompanyEvent(
-                        symbol=item.get('Code'),
-                        event_id=item.get('EventID'),
-                        event_type_id=item.get('EventTypeID'),
-                        channel_id=item.get('ChannelID'),
-                        company_name=item.get('CompanyName'),
-                        cat_id=item.get('CatID'),
-                        gdkhq_date=to_time_s(item.get('GDKHQDate')),
-                        ndkcc_date=to_time_s(item.get('NDKCCDate')),
-                        event_time=item.get('Time'),
-                        note=item.get('Note'),
-                        name=item.get('Name'),
-                        exchange=item.get('Exchange'),
-                        title=item.get('Title'),
-                        content=item.get('Content'),
-                        file_url=item.get('FileUrl'),
-                        date_order=to_time_s(item.get('DateOrder')),
-                        row=item.get('Row')
-                    ))
+                items.extend(response_data[0])
             else:
                 response.raise_for_status()
 
-        return events if len(events) > 0 else None
+        return self._records(CompanyEvent, items) if len(items) > 0 else None
 
     def events_same_industry(
         self,
@@ -825,7 +721,7 @@ class VietStockFinance:
         :return: List of EventSameIndustry or None if no events are found.
         """
         url = f"{self.finance_base_url}/data/eventstypedatasameindustry"
-        events = []  # return this
+        items = []
         for event_type_id in EventType.ALL:
             params = {
                 'eventTypeID': event_type_id,
@@ -841,40 +737,16 @@ class VietStockFinance:
                 '__RequestVerificationToken': self._token
             }
 
-            response = requests.post(url, data=params, headers=self._headers)
+            response = self._transport.post(url, data=params, headers=self._headers)
             if response.status_code == 200:
                 response_data = response.json()
-                response_data = response_data[0]
-
-                events = []
-                for item in response_data:
-                    events.append(EventSameIndustry(
-                        symbol=item.get('Code'),
-                        event_id=item.get('EventID'),
-                        event_type_id=item.get('EventTypeID'),
-                        channel_id=item.get('ChannelID'),
-                        company_name=item.get('CompanyName'),
-                        cat_id=item.get('CatID'),
-                        gdkhq_date=to_time_s(item.get('GDKHQDate')),
-                        ndkcc_date=to_time_s(item.get('NDKCCDate')),
-                        event_time=to_time_s(item.get('Time')),
-                        note=item.get('Note'),
-                        name=item.get('Name'),
-                        exchange=item.get('Exchange'),
-                        title=item.get('Title'),
-                        content=item.get('Content'),
-                        file_url=item.get('FileUrl'),
-                        date_order=to_time_s(item.get('DateOrder')),
-                        place=item.get('Place'),
-                        time_action=item.get('TimeAction'),
-                        from_date=to_time_s(item.get('FromDate')),
-                        row=item.get('Row')
-                    ))
+                # only the last event type is kept
+                items = response_data[0]
 
             else:
                 response.raise_for_status()
 
-        return events if len(events) > 0 else None
+        return self._records(EventSameIndustry, items) if len(items) > 0 else None
 
     @lru_cache(maxsize=2048)
     def _get_income_norm(self, symbol):
@@ -883,7 +755,7 @@ class VietStockFinance:
             "stockCode": symbol,
             "__RequestVerificationToken": self._token
         }
-        response = requests.post(url, data=payload, headers=self._headers)
+        response = self._transport.post(url, data=payload, headers=self._headers)
         if response.status_code == 200:
             pattern = r'\d+\.'
             data = response.json()['data']
@@ -914,30 +786,12 @@ class VietStockFinance:
             '__RequestVerificationToken': self._token,
         }
 
-        response = requests.post(url, data=payload, headers=self._headers)
+        response = self._transport.post(url, data=payload, headers=self._headers)
         datas = list()
         if response.status_code == 200:
             data = response.json().get('data', [])
 
-            datas = [
-                IncomeStatementData(
-                    row_number=item['RowNumber'],
-                    report_data_id=item['ReportDataID'],
-                    year_period=item['YearPeriod'],
-                    report_term_id=item['ReportTermID'],
-                    audit_opinion=item['YKienKiemToan'],
-                    audit_firm=item['CtyKiemToan'],
-                    is_united=item['IsUnited'],
-                    united_name=item['UnitedName'],
-                    audit_status_id=item['AuditStatusID'],
-                    audit_status_name=item['AuditStatusName'],
-                    period_begin=item['PeriodBegin'],
-                    period_end=item['PeriodEnd'],
-                    base_period_begin=item['BasePeriodBegin'],
-                    base_period_end=item['BasePeriodEnd'],
-                    is_show_data_permission=item['IsShowData_Permission']
-                ) for item in data
-            ]
+            datas = self._records(IncomeStatementData, data)
         else:
             response.raise_for_status()  # Raise an exception for non-200 status codes
 
@@ -0,0 +1,213 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple, Union
+
+import numpy as np
+
+from pyvietstock.schema import TradingInfo
+from pyvietstock.trading_calendar import DEFAULT_CALENDAR, ICT_OFFSET, TradingCalendar
+from pyvietstock.utils import convert_to_epoch
+
+FOREIGN_FIELDS = (
+    'f_buy_vol', 'f_sell_vol', 'f_buy_val', 'f_sell_val',
+    'f_buy_put_vol', 'f_sell_put_vol', 'f_buy_put_val', 'f_sell_put_val',
+    'total_room', 'curr_room', 'remain_room',
+)
+# traded values (VND) need float64, volumes and rooms fit float32
+VALUE_FIELDS = tuple(name for name in FOREIGN_FIELDS if name.endswith('_val'))
+COMPACT_FIELDS = tuple(name for name in FOREIGN_FIELDS if name not in VALUE_FIELDS)
+_COLUMNS = {
+    **{name: (False, j) for j, name in enumerate(COMPACT_FIELDS)},
+    **{name: (True, j) for j, name in enumerate(VALUE_FIELDS)},
+}
+DEFAULT_CAPACITY = 64
+
+
+class ForeignFlowTracker:
+    """
+    Samples the foreign flow and room fields of trading_info for a universe into a columnar time series:
+    (sample, symbol, field) arrays, float32 for volumes and rooms and float64 for traded values, plus a sample
+    time index. Storage starts small and doubles as samples arrive.
+    Foreign buy/sell fields are cumulative within a trading day, flows are derived from per-sample increments.
+    """
+
+    def __init__(self, symbols: Iterable[str], capacity: int = DEFAULT_CAPACITY):
+        """
+        :param capacity: samples allocated up front.
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self._index = {s: i for i, s in enumerate(self.symbols)}
+        self._n = 0
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._compact = np.full((capacity, len(self.symbols), len(COMPACT_FIELDS)), np.nan, dtype=np.float32)
+        self._values = np.full((capacity, len(self.symbols), len(VALUE_FIELDS)), np.nan)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self, capacity: int):
+        def grown(array, fill):
+            new = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            new[:self._n] = array[:self._n]
+            return new
+
+        self._times = grown(self._times, 0)
+        self._compact = grown(self._compact, np.nan)
+        self._values = grown(self._values, np.nan)
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:self._n]
+
+    def series(self, field: str) -> np.ndarray:
+        """
+        :return: a (sample, symbol) view of one field, float32 for volumes and rooms.
+        """
+        is_value, j = _COLUMNS[field]
+        return (self._values if is_value else self._compact)[:self._n, :, j]
+
+    def record(self, infos: Iterable[Union[TradingInfo, None]], sampled_at: Union[int, None] = None):
+        """
+        Appends one snapshot. Symbols missing from infos are stored as NaN.
+        """
+        compact = np.full((len(self.symbols), len(COMPACT_FIELDS)), np.nan, dtype=np.float32)
+        values = np.full((len(self.symbols), len(VALUE_FIELDS)), np.nan)
+        for info in infos:
+            if info is None:
+                continue
+            i = self._index.get(info.symbol.upper())
+            if i is not None:
+                compact[i] = [getattr(info, name) for name in COMPACT_FIELDS]
+                values[i] = [getattr(info, name) for name in VALUE_FIELDS]
+        with self._lock:
+            if self._n == len(self._times):
+                self._grow(max(2 * len(self._times), 1))
+            self._times[self._n] = sampled_at if sampled_at is not None else int(time.time())
+            self._compact[self._n] = compact
+            self._values[self._n] = values
+            self._n += 1
+
+    def sample(self, vf, max_workers: int = 16):
+        """
+        Fetches trading_info for the whole universe concurrently and records it.
+        :param vf: VietStockFinance instance.
+        """
+        def fetch(symbol):
+            try:
+                return vf.trading_info(symbol)
+            except Exception as e:
+                logging.warning(f"ForeignFlowTracker: trading_info failed for {symbol}: {e}")
+                return None
+
+        sampled_at = int(time.time())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            infos = list(executor.map(fetch, self.symbols))
+        self.record(infos, sampled_at)
+
+    def run(
+            self,
+            vf,
+            interval: float = 60,
+            stop: Union[threading.Event, None] = None,
+            max_samples: Union[int, None] = None,
+            calendar: Union[TradingCalendar, None] = None,
+    ):
+        """
+        Samples every interval seconds while the market is open, until stop is set or max_samples samples were taken.
+        When the market closes one last sample is taken, then no request is sent until the next session opens.
+        :param calendar: trading calendar, DEFAULT_CALENDAR by default.
+        """
+        calendar = calendar or DEFAULT_CALENDAR
+        stop = stop or threading.Event()
+        taken = 0
+        was_open = True
+        while not stop.is_set() and (max_samples is None or taken < max_samples):
+            started = time.time()
+            is_open = calendar.is_market_open(started)
+            if not (is_open or was_open):
+                stop.wait(max(0.0, calendar.next_session_open(started) - started))
+                continue
+            self.sample(vf)
+            taken += 1
+            was_open = is_open
+            stop.wait(max(0.0, interval - (time.time() - started)))
+
+    def _increments(self, fields: Iterable[str]) -> np.ndarray:
+        """
+        Per-sample float64 increments of fields, a (sample, symbol, field) array. The first sample of a trading day
+        counts its full cumulative value, missing samples are forward filled so a failed fetch does not drop the
+        flow around it.
+        """
+        data = np.stack([self.series(name) for name in fields], axis=-1).astype(np.float64)
+        last_valid = np.where(np.isnan(data), 0, np.arange(self._n)[:, None, None])
+        np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+        data = np.take_along_axis(data, last_valid, axis=0)
+        days = (self.times + ICT_OFFSET) // 86400
+        inc = data.copy()
+        if self._n > 1:
+            same_day = (days[1:] == days[:-1])[:, None, None]
+            inc[1:] = np.where(same_day, data[1:] - np.nan_to_num(data[:-1]), data[1:])
+        return inc
+
+    def net_flow(self, since: Union[int, str], value: bool = True, put_through: bool = True) -> np.ndarray:
+        """
+        Net foreign buying (buy - sell) per symbol accumulated by samples taken after since.
+        :param value: net value if True, net volume otherwise.
+        :param put_through: include put-through (negotiated) deals.
+        """
+        unit = 'val' if value else 'vol'
+        fields = [f'f_buy_{unit}', f'f_sell_{unit}']
+        if put_through:
+            fields += [f'f_buy_put_{unit}', f'f_sell_put_{unit}']
+        inc = self._increments(fields)[self.times > convert_to_epoch(since)]
+        net = inc[:, :, 0::2].sum(axis=2) - inc[:, :, 1::2].sum(axis=2)  # buy fields are at even positions
+        return np.nansum(net, axis=0)
+
+    def room_utilization(self) -> np.ndarray:
+        """
+        :return: (sample, symbol) share of the foreign room in use, 1 - remain_room / total_room.
+        """
+        total = self.series('total_room')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, 1.0 - self.series('remain_room').astype(np.float64) / total, np.nan)
+
+    def room_utilization_change(self, since: Union[int, str]) -> np.ndarray:
+        """
+        Change of room utilization per symbol between the first sample after since and the latest sample.
+        """
+        utilization = self.room_utilization()
+        start = np.searchsorted(self.times, convert_to_epoch(since), side='right')
+        if start >= self._n:
+            return np.full(len(self.symbols), np.nan)
+        return utilization[-1] - utilization[start]
+
+    def top_net_buyers(self, since: Union[int, str], n: int = 10, value: bool = True) -> List[Tuple[str, float]]:
+        """
+        :return: the n symbols with the largest net foreign buying since the given time, with their net flow.
+        Use a negative n for the top net sellers.
+        """
+        net = self.net_flow(since, value=value)
+        order = np.argsort(-net if n > 0 else net, kind='stable')[:abs(n)]
+        return [(self.symbols[i], float(net[i])) for i in order]
+
+    def save(self, path: str):
+        data = np.stack([self.series(name).astype(np.float64) for name in FOREIGN_FIELDS], axis=-1)
+        np.savez_compressed(path, symbols=np.array(self.symbols), times=self.times, data=data)
+
+    @classmethod
+    def load(cls, path: str) -> 'ForeignFlowTracker':
+        """
+        :param path: file written by save(), data holds FOREIGN_FIELDS in order.
+        """
+        with np.load(path) as f:
+            n = len(f['times'])
+            tracker = cls(f['symbols'].tolist(), capacity=max(DEFAULT_CAPACITY, n))
+            data = f['data']
+            tracker._times[:n] = f['times']
+            tracker._compact[:n] = data[:, :, [FOREIGN_FIELDS.index(name) for name in COMPACT_FIELDS]]
+            tracker._values[:n] = data[:, :, [FOREIGN_FIELDS.index(name) for name in VALUE_FIELDS]]
+            tracker._n = n
+        return tracker
@@ -0,0 +1,307 @@
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from pyvietstock.schema import MarketPrice, StockDealDetail, TradingInfo
+from pyvietstock.trading_calendar import DEFAULT_CALENDAR, TradingCalendar
+
+DEFAULT_SOCKET_PATH = '.cache/gateway.sock'
+DEFAULT_INTERVAL = 5.0
+MIN_INTERVAL = 1.0
+
+# endpoint -> (record type, whether it takes a symbol)
+ENDPOINTS: Dict[str, Tuple[type, bool]] = {
+    'market_prices': (MarketPrice, False),
+    'trading_info': (TradingInfo, True),
+    'stock_deal_detail': (StockDealDetail, True),
+}
+
+Topic = Tuple[str, str]  # (endpoint, symbol), symbol is '' for endpoints without one
+
+
+def _to_json(value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [dataclasses.asdict(v) for v in value]
+    return dataclasses.asdict(value)
+
+
+def to_records(message: dict):
+    """
+    Rebuilds the dataclasses of an update message received from the gateway.
+    """
+    record_type, _ = ENDPOINTS[message['endpoint']]
+    data = message.get('data')
+    if data is None:
+        return None
+    if isinstance(data, list):
+        return [record_type(**d) for d in data]
+    return record_type(**data)
+
+
+class _Subscriber:
+    """
+    One connection. Only the latest pending message per topic is kept, so a slow reader skips
+    intermediate updates instead of growing a queue.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.intervals: Dict[Topic, float] = {}
+        self.pending: Dict[Topic, bytes] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, topic: Topic, line: bytes):
+        self.pending[topic] = line
+        self.ready.set()
+
+    async def write_loop(self):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            pending, self.pending = self.pending, {}
+            self.writer.write(b''.join(pending.values()))
+            await self.writer.drain()
+
+
+class Gateway:
+    """
+    Fan-out gateway: polls every (endpoint, symbol) once, at the shortest interval any subscriber asked for,
+    and pushes changed values to all its subscribers as newline-delimited JSON over a Unix or TCP socket.
+
+    Requests, one JSON object per line:
+        {"op": "subscribe", "endpoint": "trading_info", "symbol": "FPT", "interval": 5}
+        {"op": "unsubscribe", "endpoint": "trading_info", "symbol": "FPT"}
+    Updates:
+        {"endpoint": "trading_info", "symbol": "FPT", "time": 1717002000.0, "data": {...}}
+    """
+
+    def __init__(
+            self,
+            vf,
+            path: Optional[str] = DEFAULT_SOCKET_PATH,
+            host: Optional[str] = None,
+            port: Optional[int] = None,
+            calendar: Optional[TradingCalendar] = None,
+    ):
+        """
+        :param vf: VietStockFinance instance used for every poll.
+        :param path: Unix socket path, used unless a port is given.
+        :param host: TCP host, default 127.0.0.1 when a port is given.
+        :param calendar: trading calendar, polls pause while the market is closed. DEFAULT_CALENDAR by default.
+        """
+        self.vf = vf
+        self.path = path
+        self.host = host
+        self.port = port
+        self.calendar = calendar or DEFAULT_CALENDAR
+        self._subscribers: Set[_Subscriber] = set()
+        self._pollers: Dict[Topic, asyncio.Task] = {}
+        self._wakeups: Dict[Topic, asyncio.Event] = {}  # set when the interval of a sleeping poller shrinks
+        self._latest: Dict[Topic, bytes] = {}
+        self.polls = 0
+
+    def _interval(self, topic: Topic) -> Optional[float]:
+        intervals = [s.intervals[topic] for s in self._subscribers if topic in s.intervals]
+        return min(intervals) if intervals else None
+
+    def _subscribers_of(self, topic: Topic):
+        return [s for s in self._subscribers if topic in s.intervals]
+
+    async def _fetch(self, topic: Topic) -> bytes:
+        endpoint, symbol = topic
+        method = getattr(self.vf, endpoint)
+        value = await asyncio.to_thread(method, symbol) if symbol else await asyncio.to_thread(method)
+        self.polls += 1
+        message = {'endpoint': endpoint, 'symbol': symbol or None, 'time': time.time(), 'data': _to_json(value)}
+        return (json.dumps(message, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+    async def _poll(self, topic: Topic):
+        last_data = None
+        wakeup = self._wakeups.setdefault(topic, asyncio.Event())
+        while self._interval(topic) is not None:
+            started = time.time()
+            try:
+                line = await self._fetch(topic)
+                data = line[line.index(b'"data"'):]
+                if data != last_data:
+                    last_data = data
+                    self._latest[topic] = line
+                    for subscriber in self._subscribers_of(topic):
+                        subscriber.push(topic, line)
+            except Exception as e:
+                logging.warning(f"Gateway: polling {topic[0]} {topic[1]} failed: {e}")
+            await self._wait_next_poll(topic, started, wakeup)
+        self._pollers.pop(topic, None)
+        self._latest.pop(topic, None)
+        self._wakeups.pop(topic, None)
+
+    async def _wait_next_poll(self, topic: Topic, started: float, wakeup: asyncio.Event):
+        """
+        Sleeps until the next poll of topic is due: one interval after started, or the next session open while the
+        market is closed. A shorter interval set by a new subscriber wakes the sleep and the due time is recomputed.
+        """
+        while True:
+            interval = self._interval(topic)
+            if interval is None:
+                return
+            now = time.time()
+            due = started + interval
+            if not self.calendar.is_market_open(now):
+                # nothing changes until the next session
+                due = max(due, self.calendar.next_session_open(now))
+            if due <= now:
+                return
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=due - now)
+            except asyncio.TimeoutError:
+                return
+
+    def _subscribe(self, subscriber: _Subscriber, topic: Topic, interval: float):
+        previous = self._interval(topic)
+        subscriber.intervals[topic] = max(MIN_INTERVAL, interval)
+        if topic in self._latest:
+            subscriber.push(topic, self._latest[topic])
+        poller = self._pollers.get(topic)
+        if poller is None or poller.done():
+            self._pollers[topic] = asyncio.create_task(self._poll(topic))
+        elif previous is not None and self._interval(topic) < previous and topic in self._wakeups:
+            self._wakeups[topic].set()
+
+    def _unsubscribe(self, subscriber: _Subscriber, topic: Topic):
+        subscriber.intervals.pop(topic, None)
+        subscriber.pending.pop(topic, None)
+        if self._interval(topic) is None and topic in self._pollers:
+            self._pollers.pop(topic).cancel()
+            self._latest.pop(topic, None)
+            self._wakeups.pop(topic, None)
+
+    def _topic(self, request: dict) -> Topic:
+        endpoint = request.get('endpoint')
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint}, expected one of {', '.join(ENDPOINTS)}")
+        _, needs_symbol = ENDPOINTS[endpoint]
+        symbol = (request.get('symbol') or '').upper()
+        if needs_symbol and not symbol:
+            raise ValueError(f"{endpoint} needs a symbol")
+        return endpoint, symbol if needs_symbol else ''
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriber = _Subscriber(writer)
+        self._subscribers.add(subscriber)
+        write_task = asyncio.create_task(subscriber.write_loop())
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    topic = self._topic(request)
+                    if request.get('op') == 'subscribe':
+                        self._subscribe(subscriber, topic, float(request.get('interval', DEFAULT_INTERVAL)))
+                    elif request.get('op') == 'unsubscribe':
+                        self._unsubscribe(subscriber, topic)
+                    else:
+                        raise ValueError(f"Unknown op {request.get('op')}")
+                except (ValueError, TypeError) as e:
+                    subscriber.push(('error', ''), (json.dumps({'error': str(e)}) + '\n').encode('utf-8'))
+        except ConnectionError:
+            pass
+        finally:
+            for topic in list(subscriber.intervals):
+                self._unsubscribe(subscriber, topic)
+            self._subscribers.discard(subscriber)
+            write_task.cancel()
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        if self.port is not None:
+            return await asyncio.start_server(self._handle, self.host or '127.0.0.1', self.port)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        return await asyncio.start_unix_server(self._handle, self.path)
+
+    async def serve(self):
+        server = await self.start()
+        address = f"{self.host or '127.0.0.1'}:{self.port}" if self.port is not None else self.path
+        logging.info(f"Gateway: listening on {address}")
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    def stats(self) -> dict:
+        return {
+            'subscribers': len(self._subscribers),
+            'topics': {f"{e}:{s}" if s else e: self._interval((e, s)) for e, s in self._pollers},
+            'polls': self.polls,
+        }
+
+
+class GatewayClient:
+    """
+    Asyncio client of the gateway.
+
+        async with GatewayClient() as client:
+            await client.subscribe('trading_info', 'FPT', interval=5)
+            async for message in client:
+                info = to_records(message)
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_SOCKET_PATH, host: Optional[str] = None, port: Optional[int] = None):
+        self.path = path
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        if self.port is not None:
+            self._reader, self._writer = await asyncio.open_connection(self.host or '127.0.0.1', self.port)
+        else:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        return self
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _send(self, request: dict):
+        self._writer.write((json.dumps(request) + '\n').encode('utf-8'))
+        await self._writer.drain()
+
+    async def subscribe(self, endpoint: str, symbol: Optional[str] = None, interval: float = DEFAULT_INTERVAL):
+        await self._send({'op': 'subscribe', 'endpoint': endpoint, 'symbol': symbol, 'interval': interval})
+
+    async def unsubscribe(self, endpoint: str, symbol: Optional[str] = None):
+        await self._send({'op': 'unsubscribe', 'endpoint': endpoint, 'symbol': symbol})
+
+    async def receive(self) -> dict:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Gateway closed the connection")
+        return json.loads(line)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return await self.receive()
+        except ConnectionError:
+            raise StopAsyncIteration
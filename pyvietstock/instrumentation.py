@@ -0,0 +1,242 @@
+import contextvars
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from pyvietstock.transport import RequestsTransport, Transport
+
+# endpoint of the last request made in the current thread or task, records built afterwards are attributed to it
+_current_endpoint: contextvars.ContextVar[str] = contextvars.ContextVar('pyvietstock_endpoint', default='')
+
+
+def current_endpoint() -> str:
+    return _current_endpoint.get()
+
+
+class Instrumentation:
+    """
+    Receives timings and counters of every request. This base class ignores them and is the default,
+    so an uninstrumented client only pays for one attribute check per call.
+    Endpoints are lower case URL paths, e.g. /company/tradinginfo.
+    """
+    enabled = False
+
+    def request(self, endpoint: str, seconds: float, size: int, status_code: Optional[int], cached: bool):
+        """
+        :param seconds: time spent in the transport, including reading a non-streamed body.
+        :param size: response bytes, for a streamed body only the bytes read so far.
+        :param status_code: None when the request raised.
+        """
+        pass
+
+    def decode(self, endpoint: str, seconds: float):
+        pass
+
+    def build(self, endpoint: str, record_type: type, seconds: float, count: int):
+        """
+        :param seconds: time spent building records, for streams it includes incremental JSON decoding.
+        :param count: records (or RecordBatch rows) built.
+        """
+        pass
+
+    def retry(self, endpoint: str):
+        pass
+
+
+NOOP = Instrumentation()
+
+
+class _EndpointStats:
+    __slots__ = ('requests', 'errors', 'cache_hits', 'retries', 'bytes', 'records', 'network', 'decode', 'build')
+
+    def __init__(self):
+        self.requests = self.errors = self.cache_hits = self.retries = self.bytes = self.records = 0
+        self.network = self.decode = self.build = 0.0
+
+
+class StatsCollector(Instrumentation):
+    """
+    Aggregates the measurements per endpoint in memory for quick profiling, see stats().
+    """
+    enabled = True
+
+    def __init__(self):
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    def request(self, endpoint, seconds, size, status_code, cached):
+        with self._lock:
+            stats = self._get(endpoint)
+            stats.requests += 1
+            stats.network += seconds
+            stats.bytes += size
+            stats.cache_hits += cached
+            stats.errors += status_code is None or status_code >= 400
+
+    def decode(self, endpoint, seconds):
+        with self._lock:
+            self._get(endpoint).decode += seconds
+
+    def build(self, endpoint, record_type, seconds, count):
+        with self._lock:
+            stats = self._get(endpoint)
+            stats.build += seconds
+            stats.records += count
+
+    def retry(self, endpoint):
+        with self._lock:
+            self._get(endpoint).retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        :return: endpoint -> requests, errors, retries, cache hit rate, bytes, records, and the seconds spent
+        in the network, decode and build phases in total and per request.
+        """
+        with self._lock:
+            summary = {}
+            for endpoint, s in sorted(self._endpoints.items()):
+                n = s.requests or 1
+                summary[endpoint] = {
+                    'requests': s.requests,
+                    'errors': s.errors,
+                    'retries': s.retries,
+                    'cache_hit_rate': s.cache_hits / n,
+                    'bytes': s.bytes,
+                    'records': s.records,
+                    'network_s': s.network,
+                    'decode_s': s.decode,
+                    'build_s': s.build,
+                    'network_ms_per_request': 1000 * s.network / n,
+                    'decode_ms_per_request': 1000 * s.decode / n,
+                    'build_ms_per_request': 1000 * s.build / n,
+                }
+            return summary
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Reports the measurements as OpenTelemetry metrics (histograms in seconds, counters) and one span per
+    phase, tagged with the endpoint. The exporters are whatever the application configured.
+    """
+    enabled = True
+
+    def __init__(self, meter=None, tracer=None):
+        """
+        :param meter: opentelemetry Meter, the global meter provider's 'pyvietstock' meter by default.
+        :param tracer: opentelemetry Tracer, the global tracer provider's 'pyvietstock' tracer by default.
+        """
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError("OpenTelemetryInstrumentation requires opentelemetry-api: pip install pyvietstock[otel]")
+        meter = meter or metrics.get_meter('pyvietstock')
+        self.tracer = tracer or trace.get_tracer('pyvietstock')
+        self._durations = {
+            phase: meter.create_histogram(f'pyvietstock.{phase}.duration', unit='s')
+            for phase in ('network', 'decode', 'build')
+        }
+        self._requests = meter.create_counter('pyvietstock.requests')
+        self._bytes = meter.create_counter('pyvietstock.response.size', unit='By')
+        self._records = meter.create_counter('pyvietstock.records')
+        self._retries = meter.create_counter('pyvietstock.retries')
+
+    def _span(self, phase: str, seconds: float, attributes: dict):
+        end = time.time_ns()
+        span = self.tracer.start_span(f'pyvietstock.{phase}', start_time=end - int(seconds * 1e9), attributes=attributes)
+        span.end(end_time=end)
+
+    def request(self, endpoint, seconds, size, status_code, cached):
+        attributes = {'endpoint': endpoint, 'cached': cached, 'status_code': status_code or 0}
+        self._durations['network'].record(seconds, attributes)
+        self._requests.add(1, attributes)
+        self._bytes.add(size, {'endpoint': endpoint})
+        self._span('network', seconds, attributes)
+
+    def decode(self, endpoint, seconds):
+        self._durations['decode'].record(seconds, {'endpoint': endpoint})
+        self._span('decode', seconds, {'endpoint': endpoint})
+
+    def build(self, endpoint, record_type, seconds, count):
+        attributes = {'endpoint': endpoint, 'record_type': record_type.__name__}
+        self._durations['build'].record(seconds, attributes)
+        self._records.add(count, attributes)
+        self._span('build', seconds, attributes)
+
+    def retry(self, endpoint):
+        self._retries.add(1, {'endpoint': endpoint})
+
+
+class _InstrumentedResponse:
+    """
+    Response proxy timing json(). A streamed response is reported once its body has been read,
+    with the bytes read and the time since the request started.
+    """
+
+    def __init__(self, response, endpoint: str, instrumentation: Instrumentation, started: Optional[float] = None):
+        self._response = response
+        self._endpoint = endpoint
+        self._instrumentation = instrumentation
+        self._started = started
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def json(self):
+        started = time.perf_counter()
+        try:
+            return self._response.json()
+        finally:
+            self._instrumentation.decode(self._endpoint, time.perf_counter() - started)
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        size = 0
+        try:
+            for chunk in self._response.iter_content(chunk_size):
+                size += len(chunk)
+                yield chunk
+        finally:
+            if self._started is not None:
+                self._instrumentation.request(self._endpoint, time.perf_counter() - self._started, size,
+                                              self._response.status_code, False)
+                self._started = None
+
+
+class InstrumentedTransport(Transport):
+    """
+    Measures the requests of an inner transport for an Instrumentation: network time and bytes per request,
+    cache hits (responses served by a CachingTransport underneath) and JSON decode time.
+    """
+
+    def __init__(self, inner: Optional[Transport] = None, instrumentation: Optional[Instrumentation] = None):
+        self.inner = inner or RequestsTransport()
+        self.instrumentation = instrumentation or StatsCollector()
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        endpoint = urlparse(url).path.lower()
+        _current_endpoint.set(endpoint)
+        started = time.perf_counter()
+        try:
+            response = self.inner.request(method, url, headers=headers, params=params, data=data, stream=stream)
+        except Exception:
+            self.instrumentation.request(endpoint, time.perf_counter() - started, 0, None, False)
+            raise
+        if stream:
+            return _InstrumentedResponse(response, endpoint, self.instrumentation, started)
+        self.instrumentation.request(endpoint, time.perf_counter() - started, len(response.content or b''),
+                                     response.status_code, getattr(response, 'from_cache', False))
+        return _InstrumentedResponse(response, endpoint, self.instrumentation)
+
+    def stats(self):
+        stats = getattr(self.instrumentation, 'stats', None)
+        return stats() if stats is not None else {}
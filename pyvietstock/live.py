@@ -0,0 +1,200 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from pyvietstock.params import HistoricalResolution
+from pyvietstock.schema import StockDealDetail, TradingInfo
+from pyvietstock.store import OHLCV_DTYPE, OHLCVStore
+from pyvietstock.trading_calendar import DAY_SECONDS, DEFAULT_CALENDAR, ICT_OFFSET, TradingCalendar
+from pyvietstock.utils import convert_to_epoch
+
+RESOLUTION = HistoricalResolution.ONE_DAY  # the live bar is a daily bar, intraday series are not supported
+_EXTRA_ROWS = 8  # room for a few new days before the series array is reallocated
+
+
+def _day(epoch: int) -> int:
+    return (epoch + ICT_OFFSET) // DAY_SECONDS
+
+
+class _Series:
+    """
+    Stored daily bars copied once into an array with spare rows. Today's partial bar is the last row and is
+    changed in place, a new day rolls it into history and starts a new row.
+    """
+
+    def __init__(self, bars: np.ndarray):
+        self.bars = np.empty(len(bars) + _EXTRA_ROWS, dtype=OHLCV_DTYPE)
+        self.bars[:len(bars)] = bars
+        self.length = len(bars)
+        self.today = _day(int(bars['time'][-1])) if len(bars) else None  # day of the last row
+        self.partial = False  # whether the last row is being built from live data
+        self.last_total_vol = -1.0
+
+    def row_for(self, day: int, price: float) -> Optional[np.void]:
+        """
+        :return: the row of day, a new one opened at price if the day is after the last row. None for a past day.
+        """
+        if self.today is not None and day < self.today:
+            return None
+        if self.today != day:
+            if self.length == len(self.bars):
+                grown = np.empty(2 * len(self.bars), dtype=OHLCV_DTYPE)
+                grown[:self.length] = self.bars[:self.length]
+                self.bars = grown
+            # daily bars of historical_data are stamped at midnight UTC of their date
+            self.bars[self.length] = (day * DAY_SECONDS, price, price, price, price, 0.0)
+            self.length += 1
+            self.today = day
+            self.last_total_vol = -1.0
+        self.partial = True
+        return self.bars[self.length - 1]
+
+
+class LiveHistory:
+    """
+    Daily bars from an OHLCVStore stitched with today's partial bar, which is built from stock_deal_detail deals
+    (or the open/high/low/last/volume of trading_info) and updated in place as they arrive.
+    series() is one contiguous array; history is read from the store once and never refetched.
+    If the store already holds a bar for today, live updates extend it.
+    """
+
+    def __init__(
+            self,
+            store: OHLCVStore,
+            symbols: Iterable[str] = (),
+            calendar: Optional[TradingCalendar] = None,
+    ):
+        """
+        :param store: store holding the daily bars (HistoricalResolution.ONE_DAY), see OHLCVStore.refresh.
+        :param symbols: symbols to load now, others are loaded on their first update.
+        """
+        self.store = store
+        self.calendar = calendar or DEFAULT_CALENDAR
+        self._series: Dict[str, _Series] = {}
+        for symbol in symbols:
+            self._get(symbol)
+
+    def _get(self, symbol: str) -> _Series:
+        symbol = symbol.upper()
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._series[symbol] = _Series(np.asarray(self.store.open(symbol, RESOLUTION)))
+        return series
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._series)
+
+    def series(self, symbol: str) -> np.ndarray:
+        """
+        :return: the bars of symbol with OHLCV_DTYPE, today's partial bar last. The array is a view, it changes
+        as updates arrive and is replaced when a new day needs more room, so call series() again to read.
+        """
+        series = self._get(symbol)
+        return series.bars[:series.length]
+
+    def partial_bar(self, symbol: str) -> Optional[np.void]:
+        """
+        :return: today's bar being built, or None before the first live update.
+        """
+        series = self._get(symbol)
+        return series.bars[series.length - 1] if series.partial else None
+
+    def on_deal(self, deal: StockDealDetail) -> bool:
+        """
+        Applies one deal. Deals already seen (total_vol not above the last one) are ignored,
+        so repeated polls of stock_deal_detail can be fed as they are.
+        :return: whether the series changed.
+        """
+        series = self._get(deal.symbol)
+        epoch = convert_to_epoch(deal.time)
+        day = _day(epoch)
+        if series.today == day and deal.total_vol <= series.last_total_vol:
+            return False
+        bar = series.row_for(day, deal.price)
+        if bar is None:
+            return False
+        bar['high'] = max(bar['high'], deal.price)
+        bar['low'] = min(bar['low'], deal.price)
+        bar['close'] = deal.price
+        bar['volume'] = max(bar['volume'], deal.total_vol)
+        series.last_total_vol = deal.total_vol
+        return True
+
+    def on_deals(self, deals: Iterable[StockDealDetail]) -> int:
+        """
+        Applies a batch of deals, e.g. one stock_deal_detail response (newest first), in trading order.
+        :return: number of deals applied.
+        """
+        return sum(self.on_deal(d) for d in sorted(deals, key=lambda d: (d.symbol, d.total_vol)))
+
+    def on_trading_info(self, info: TradingInfo, now: Union[int, None] = None) -> bool:
+        """
+        Overwrites today's bar with the session values of trading_info, which also cover put-through volume.
+        Ignored before the first trade of the day (no open price).
+        """
+        if not info.open_price or not info.last_price:
+            return False
+        series = self._get(info.symbol)
+        try:
+            epoch = convert_to_epoch(info.time)
+        except (ValueError, TypeError):
+            epoch = int(time.time()) if now is None else now
+        bar = series.row_for(_day(epoch), info.open_price)
+        if bar is None:
+            return False
+        bar['open'] = info.open_price
+        bar['high'] = info.highest_price or max(bar['high'], info.last_price)
+        bar['low'] = info.lowest_price or min(bar['low'], info.last_price)
+        bar['close'] = info.last_price
+        bar['volume'] = max(bar['volume'], info.total_vol)
+        series.last_total_vol = max(series.last_total_vol, info.total_vol)
+        return True
+
+    def poll(self, vf, symbols: Optional[Iterable[str]] = None, max_workers: int = 8,
+             use_trading_info: bool = False) -> int:
+        """
+        Fetches today's deals (or trading_info) of every symbol concurrently and applies them.
+        Nothing is fetched while the market is closed.
+        :param vf: VietStockFinance instance in the dataclass or lazy result mode.
+        :return: number of updates applied.
+        """
+        if not self.calendar.is_market_open():
+            return 0
+        symbols = [s.upper() for s in (symbols if symbols is not None else self.symbols)]
+
+        def fetch(symbol):
+            try:
+                return vf.trading_info(symbol) if use_trading_info else vf.stock_deal_detail(symbol) or []
+            except Exception as e:
+                logging.warning(f"LiveHistory: polling {symbol} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, symbols))
+        applied = 0
+        for result in results:
+            if result is None:
+                continue
+            applied += self.on_trading_info(result) if use_trading_info else self.on_deals(result)
+        return applied
+
+    def commit(self, symbol: Optional[str] = None) -> int:
+        """
+        Writes the live bars to the store (the last stored bar is replaced, newer ones appended),
+        e.g. after the close, so the next run starts from them.
+        :return: number of bars appended.
+        """
+        appended = 0
+        for s in ([symbol.upper()] if symbol else self.symbols):
+            series = self._series.get(s)
+            if series is None or not series.partial:
+                continue
+            stored = self.store.count(s, RESOLUTION)
+            start = max(stored - 1, 0)
+            appended += self.store.append(s, series.bars[start:series.length].copy(), RESOLUTION)
+            series.partial = False
+        return appended
@@ -72,3 +72,39 @@ class IncomeStatementPeriod:
     YEAR = "NAM"
     DEFAULT = QUARTER
 
+
+
+@dataclass
+class ResultMode:
+    DATACLASS = "dataclass"
+    LAZY = "lazy"
+    ARROW = "arrow"
+    DEFAULT = DATACLASS
+
+
+@dataclass
+class SessionPhase:
+    PRE_OPEN = "pre_open"
+    ATO = "ato"
+    CONTINUOUS = "continuous"
+    LUNCH_BREAK = "lunch_break"
+    ATC = "atc"
+    PUT_THROUGH = "put_through"
+    CLOSED = "closed"
+
+
+@dataclass
+class CorporateActionKind:
+    CASH_DIVIDEND = "cash_dividend"
+    STOCK_DIVIDEND = "stock_dividend"
+    RIGHTS = "rights"
+
+
+@dataclass
+class AlertKind:
+    CROSS_ABOVE = "cross_above"  # price moves from below to at or above the threshold
+    CROSS_BELOW = "cross_below"  # price moves from above to at or below the threshold
+    PERCENT_CHANGE = "percent_change"  # |change vs prior close| in % reaches the threshold
+    VOLUME_SPIKE = "volume_spike"  # session volume reaches threshold x the average volume
+    AT_CEILING = "at_ceiling"  # price reaches the ceiling price, the threshold is ignored
+    AT_FLOOR = "at_floor"  # price reaches the floor price, the threshold is ignored
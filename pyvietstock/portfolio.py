@@ -0,0 +1,189 @@
+import logging
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from pyvietstock.screener import Screener
+
+DEFAULT_LIMIT_THRESHOLD = 0.02  # within 2% of the ceiling or floor price
+
+
+class PortfolioBook:
+    """
+    Holdings of many portfolios as a dense (portfolios, symbols) quantity matrix over the union of held symbols,
+    with an optional matching matrix of average costs.
+    """
+
+    def __init__(
+            self,
+            holdings: Mapping[str, Mapping[str, float]],
+            costs: Optional[Mapping[str, Mapping[str, float]]] = None,
+    ):
+        """
+        :param holdings: portfolio id -> {symbol: quantity}, negative quantities are short positions.
+        :param costs: portfolio id -> {symbol: average cost per share}, for unrealized P&L.
+        """
+        self.ids: List[str] = list(holdings)
+        self.symbols: List[str] = sorted({s.upper() for positions in holdings.values() for s in positions})
+        column = {s: j for j, s in enumerate(self.symbols)}
+        self.quantities = np.zeros((len(self.ids), len(self.symbols)))
+        self.costs = np.full(self.quantities.shape, np.nan) if costs is not None else None
+        for i, portfolio_id in enumerate(self.ids):
+            for symbol, quantity in holdings[portfolio_id].items():
+                self.quantities[i, column[symbol.upper()]] += quantity
+            if costs is not None:
+                for symbol, cost in costs.get(portfolio_id, {}).items():
+                    if symbol.upper() in column:
+                        self.costs[i, column[symbol.upper()]] = cost
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class PriceSnapshot:
+    """
+    last, prior close, ceiling and floor prices aligned to a symbol list. A symbol that has not traded yet
+    today (last price 0 or missing) is marked at its prior close.
+    """
+
+    def __init__(self, symbols: Sequence[str], last: np.ndarray, prior_close: np.ndarray,
+                 ceiling: np.ndarray, floor: np.ndarray):
+        self.symbols = list(symbols)
+        self.prior_close = prior_close
+        self.last = np.where(last > 0, last, prior_close)
+        self.ceiling = ceiling
+        self.floor = floor
+
+    @classmethod
+    def from_screener(cls, screener: Screener, symbols: Sequence[str]) -> 'PriceSnapshot':
+        """
+        Picks the prices of symbols out of a Screener table, NaN for symbols it does not hold.
+        """
+        row = {s: i for i, s in enumerate(screener.symbols)}
+        index = np.array([row.get(s, -1) for s in symbols], dtype=np.int64)
+        found = index >= 0
+
+        def column(name):
+            values = np.full(len(symbols), np.nan)
+            values[found] = screener.column(name)[index[found]]
+            return values
+
+        missing = [s for s, ok in zip(symbols, found) if not ok]
+        if missing:
+            logging.warning(f"PriceSnapshot: no price for {', '.join(missing)}")
+        return cls(symbols, column('last_price'), column('prior_close_price'),
+                   column('ceiling_price'), column('floor_price'))
+
+    @classmethod
+    def fetch(cls, vf, symbols: Sequence[str], max_workers: int = 32) -> 'PriceSnapshot':
+        """
+        Fetches trading_info once per symbol, concurrently.
+        """
+        return cls.from_screener(Screener.load(vf, symbols, max_workers=max_workers), symbols)
+
+
+class Valuation:
+    """
+    Mark-to-market of every portfolio of a book, as arrays in book order (NaN prices count as 0).
+    - market_value: sum of quantity * last price; gross_exposure / net_exposure / long_exposure / short_exposure.
+    - day_pnl: change since the prior close, day_return: day_pnl over the prior close value.
+    - unrealized_pnl: against the average costs, when the book has them.
+    - near_ceiling / near_floor: gross value held in symbols within the threshold of their ceiling / floor price.
+    - weights: (portfolios, symbols) position value over gross exposure.
+    """
+
+    def __init__(self, book: PortfolioBook, snapshot: PriceSnapshot, limit_threshold: float = DEFAULT_LIMIT_THRESHOLD):
+        q = book.quantities
+        last = np.nan_to_num(snapshot.last)
+        prior = np.nan_to_num(snapshot.prior_close)
+        self.book = book
+        self.snapshot = snapshot
+
+        values = q * last
+        self.position_values = values
+        self.market_value = values.sum(axis=1)
+        self.prior_value = q @ prior
+        self.day_pnl = self.market_value - self.prior_value
+        long = np.where(values > 0, values, 0.0).sum(axis=1)
+        short = np.where(values < 0, -values, 0.0).sum(axis=1)
+        self.long_exposure = long
+        self.short_exposure = short
+        self.gross_exposure = long + short
+        self.net_exposure = long - short
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.day_return = np.where(self.prior_value != 0, self.day_pnl / np.abs(self.prior_value), np.nan)
+            self.weights = np.where(self.gross_exposure[:, None] > 0, values / self.gross_exposure[:, None], 0.0)
+            to_ceiling = (snapshot.ceiling - snapshot.last) / snapshot.last
+            to_floor = (snapshot.last - snapshot.floor) / snapshot.last
+        self.to_ceiling = to_ceiling
+        self.to_floor = to_floor
+        abs_values = np.abs(values)
+        self.near_ceiling = abs_values @ (to_ceiling <= limit_threshold).astype(np.float64)
+        self.near_floor = abs_values @ (to_floor <= limit_threshold).astype(np.float64)
+        if book.costs is not None:
+            self.unrealized_pnl = np.nansum(q * (last - book.costs), axis=1)
+        else:
+            self.unrealized_pnl = None
+
+    def to_records(self) -> List[dict]:
+        """
+        :return: one dict per portfolio with the summary values.
+        """
+        columns = {
+            'market_value': self.market_value,
+            'day_pnl': self.day_pnl,
+            'day_return': self.day_return,
+            'gross_exposure': self.gross_exposure,
+            'net_exposure': self.net_exposure,
+            'near_ceiling': self.near_ceiling,
+            'near_floor': self.near_floor,
+        }
+        if self.unrealized_pnl is not None:
+            columns['unrealized_pnl'] = self.unrealized_pnl
+        return [
+            {'portfolio': portfolio_id, **{name: float(values[i]) for name, values in columns.items()}}
+            for i, portfolio_id in enumerate(self.book.ids)
+        ]
+
+    def get(self, portfolio_id: str) -> dict:
+        return self.to_records()[self.book.ids.index(portfolio_id)]
+
+
+class PortfolioValuer:
+    """
+    Values many portfolios from one price snapshot: the union of held symbols is fetched once, concurrently,
+    then every portfolio is marked with a few matrix operations.
+    """
+
+    def __init__(self, vf, max_workers: int = 32, limit_threshold: float = DEFAULT_LIMIT_THRESHOLD):
+        """
+        :param vf: VietStockFinance instance in the dataclass result mode.
+        :param limit_threshold: relative distance to the ceiling / floor price counted as near the limit.
+        """
+        self.vf = vf
+        self.max_workers = max_workers
+        self.limit_threshold = limit_threshold
+
+    def snapshot(self, book: PortfolioBook) -> PriceSnapshot:
+        return PriceSnapshot.fetch(self.vf, book.symbols, self.max_workers)
+
+    def value(self, book: PortfolioBook, snapshot: Optional[PriceSnapshot] = None) -> Valuation:
+        """
+        :param snapshot: prices to use, fetched for the book's symbols if not given. A snapshot for other
+        symbols is re-aligned by symbol.
+        """
+        snapshot = snapshot or self.snapshot(book)
+        if snapshot.symbols != book.symbols:
+            snapshot = _realign(snapshot, book.symbols)
+        return Valuation(book, snapshot, self.limit_threshold)
+
+
+def _realign(snapshot: PriceSnapshot, symbols: Sequence[str]) -> PriceSnapshot:
+    row: Dict[str, int] = {s: i for i, s in enumerate(snapshot.symbols)}
+    index = np.array([row.get(s, -1) for s in symbols], dtype=np.int64)
+
+    def take(values):
+        return np.where(index >= 0, values[index], np.nan) if len(values) else np.full(len(symbols), np.nan)
+
+    return PriceSnapshot(symbols, take(snapshot.last), take(snapshot.prior_close),
+                         take(snapshot.ceiling), take(snapshot.floor))
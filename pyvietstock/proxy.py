@@ -0,0 +1,213 @@
+import dataclasses
+import inspect
+import json
+import logging
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlparse
+
+import requests
+
+from pyvietstock import schema
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.params import ResultMode
+from pyvietstock.transport import CachingTransport, CoalescingTransport, DEFAULT_CACHE_TTL, RequestsTransport, Transport
+
+DEFAULT_PROXY_HOST = '127.0.0.1'
+DEFAULT_PROXY_PORT = 8765
+
+EXPOSED_METHODS = (
+    'historical_data', 'trading_info', 'market_prices', 'stock_deal_detail', 'statistics_by_date_range',
+    'statistics_by_period', 'company_relation_filter', 'documents', 'header_news', 'event_transfer_data',
+    'bond_related', 'news_by_code', 'news_by_channel', 'events_by_type', 'events_same_industry', 'income_statement',
+)
+
+
+def _record_type(method_name: str) -> type:
+    """
+    :return: the schema dataclass a VietStockFinance method returns, read from its return annotation.
+    """
+    pending = [typing.get_type_hints(getattr(VietStockFinance, method_name))['return']]
+    while pending:
+        annotation = pending.pop()
+        if dataclasses.is_dataclass(annotation):
+            return annotation
+        pending.extend(typing.get_args(annotation))
+    raise TypeError(f"{method_name} does not return a schema record")
+
+
+RECORD_TYPES: Dict[str, type] = {name: _record_type(name) for name in EXPOSED_METHODS}
+SIGNATURES: Dict[str, inspect.Signature] = {name: inspect.signature(getattr(VietStockFinance, name))
+                                           for name in EXPOSED_METHODS}
+
+
+class UnknownMethodError(LookupError):
+    """
+    The method is not one of EXPOSED_METHODS, answered with 404.
+    """
+    pass
+
+
+class InvalidArgumentsError(ValueError):
+    """
+    The arguments do not fit the signature of the method, answered with 400.
+    """
+    pass
+
+
+class ProxyServer:
+    """
+    Local HTTP service exposing the VietStockFinance methods as JSON endpoints for a fleet of workers.
+    It holds the one authenticated session, and every call goes through a shared TTL cache
+    (market-aware, see CachingTransport) and single-flight coalescing of identical upstream requests.
+
+        POST /call/<method>   {"args": [...], "kwargs": {...}}
+        GET  /<method>?symbol=FPT&page=1
+        GET  /stats
+    Responses: {"type": "TradingInfo", "data": {...} or [...] or null}, errors: {"error": "..."}.
+    """
+
+    def __init__(
+            self,
+            vf: VietStockFinance,
+            host: str = DEFAULT_PROXY_HOST,
+            port: int = DEFAULT_PROXY_PORT,
+            ttl: float = DEFAULT_CACHE_TTL,
+            ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param vf: logged in client, its transport is wrapped with the shared cache and coalescing.
+        :param ttl: cache ttl in seconds, see CachingTransport.
+        :param ttls: ttl overrides by lower case URL path, see CachingTransport.
+        """
+        self.cache = CachingTransport(vf._transport, ttl=ttl, ttls=ttls)
+        self.coalescing = CoalescingTransport(self.cache)
+        self.vf = vf.set_transport(self.coalescing).set_result_mode(ResultMode.DATACLASS)
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def call(self, method: str, args=(), kwargs=None):
+        """
+        Checks the method name and binds the arguments to its signature before calling it, so errors raised
+        inside the call are never mistaken for a bad request.
+        """
+        if method not in EXPOSED_METHODS:
+            raise UnknownMethodError(f"Unknown method {method}")
+        if not isinstance(args, (list, tuple)) or not isinstance(kwargs or {}, dict):
+            raise InvalidArgumentsError("args must be a list and kwargs an object")
+        kwargs = dict(kwargs or {})
+        kwargs.pop('stream', None)
+        try:
+            SIGNATURES[method].bind(self.vf, *args, **kwargs)
+        except TypeError as e:
+            raise InvalidArgumentsError(f"{method}: {e}")
+        value = getattr(self.vf, method)(*args, **kwargs)
+        if isinstance(value, list):
+            data = [dataclasses.asdict(v) for v in value]
+        else:
+            data = dataclasses.asdict(value) if value is not None else None
+        return {'type': RECORD_TYPES[method].__name__, 'data': data}
+
+    def stats(self) -> dict:
+        return {'cache': self.cache.stats(), 'coalescing': self.coalescing.stats()}
+
+    def _handler_class(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: dict):
+                payload = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _dispatch(self, method: str, args, kwargs):
+                try:
+                    self._send(200, proxy.call(method, args, kwargs))
+                except UnknownMethodError as e:
+                    self._send(404, {'error': str(e)})
+                except InvalidArgumentsError as e:
+                    self._send(400, {'error': str(e)})
+                except requests.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else 502
+                    self._send(status, {'error': str(e)})
+                except Exception as e:
+                    logging.exception(f"ProxyServer: {method} failed")
+                    self._send(502, {'error': str(e)})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                name = url.path.strip('/')
+                if name == 'stats':
+                    return self._send(200, proxy.stats())
+                if name == 'methods':
+                    return self._send(200, {'methods': list(EXPOSED_METHODS)})
+                self._dispatch(name, (), dict(parse_qsl(url.query)))
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if not url.path.startswith('/call/'):
+                    return self._send(404, {'error': f"Unknown path {url.path}"})
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                except ValueError as e:
+                    return self._send(400, {'error': f"Invalid JSON: {e}"})
+                if not isinstance(body, dict):
+                    return self._send(400, {'error': "The body must be a JSON object"})
+                self._dispatch(url.path[len('/call/'):], body.get('args', ()), body.get('kwargs', {}))
+
+            def log_message(self, format, *args):
+                logging.debug(f"ProxyServer: {self.address_string()} {format % args}")
+
+        return Handler
+
+    def serve_forever(self):
+        logging.info(f"ProxyServer: listening on http://{self.address[0]}:{self.address[1]}")
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ProxyClient:
+    """
+    Thin VietStockFinance-compatible client of a ProxyServer: same method names and arguments,
+    results are rebuilt into the schema dataclasses. No login is needed on the worker side.
+    """
+
+    def __init__(self, base_url: str = f"http://{DEFAULT_PROXY_HOST}:{DEFAULT_PROXY_PORT}",
+                 transport: Optional[Transport] = None):
+        self.base_url = base_url.rstrip('/')
+        self._transport = transport or RequestsTransport()
+
+    def _call(self, method: str, *args, **kwargs):
+        body = json.dumps({'args': args, 'kwargs': kwargs}, default=str)
+        response = self._transport.post(f"{self.base_url}/call/{method}", data=body,
+                                        headers={'Content-Type': 'application/json'})
+        response.raise_for_status()
+        result = response.json()
+        record_type = getattr(schema, result['type'])
+        data = result['data']
+        if data is None:
+            return None
+        if isinstance(data, list):
+            return [record_type(**d) for d in data]
+        return record_type(**data)
+
+    def __getattr__(self, name):
+        if name not in EXPOSED_METHODS:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+
+    def stats(self) -> dict:
+        response = self._transport.get(f"{self.base_url}/stats")
+        response.raise_for_status()
+        return response.json()
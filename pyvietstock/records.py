@@ -0,0 +1,393 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+from pyvietstock.config import HOME_PAGE_URL
+from pyvietstock.schema import (
+    EventTransferData, HistoricalData, TradingInfo, MarketPrice, StockDealDetail,
+    StatisticsData, CompanyRelation, Document, HeaderNews, BondRelated, NewsArticle, ChannelNewsArticle, CompanyEvent,
+    EventSameIndustry, IncomeStatementData
+)
+from pyvietstock.utils import to_time_s
+
+_REQUIRED = object()
+
+
+class Field(NamedTuple):
+    """
+    Where a schema field comes from in a decoded Vietstock JSON item.
+    key: original Vietstock key (or tuple index for column-oriented responses).
+    convert: optional conversion applied to the raw value, e.g. to_time_s.
+    default: value used when the key is missing, if not given the key is required.
+    """
+    key: Union[str, int]
+    convert: Optional[Callable] = None
+    default: Any = _REQUIRED
+
+
+def _epoch_to_time_s(t):
+    return to_time_s(t, ns=1)
+
+
+def _buy_sell(is_buy):
+    return "B" if is_buy else "S"
+
+
+def _finance_url(path):
+    return f"{HOME_PAGE_URL}{path}"
+
+
+FIELDS: Dict[type, Dict[str, Field]] = {
+    HistoricalData: {
+        'time': Field(0, _epoch_to_time_s),
+        'open': Field(1),
+        'high': Field(2),
+        'low': Field(3),
+        'close': Field(4),
+        'volume': Field(5),
+    },
+    TradingInfo: {
+        'time': Field('TradingDate', to_time_s),
+        'symbol': Field('StockCode'),
+        'largest_trading_volume': Field('KLCPLH'),
+        'total_volume_traded': Field('KLCPNY'),
+        'prior_close_price': Field('PriorClosePrice'),
+        'ceiling_price': Field('CeilingPrice'),
+        'floor_price': Field('FloorPrice'),
+        'total_vol': Field('TotalVol'),
+        'total_val': Field('TotalVal'),
+        'market_capital': Field('MarketCapital'),
+        'highest_price': Field('HighestPrice'),
+        'lowest_price': Field('LowestPrice'),
+        'open_price': Field('OpenPrice'),
+        'last_price': Field('LastPrice'),
+        'avr_price': Field('AvrPrice'),
+        'change': Field('Change'),
+        'per_change': Field('PerChange'),
+        'min_52w': Field('Min52W'),
+        'max_52w': Field('Max52W'),
+        'vol_52w': Field('Vol52W'),
+        'outstanding_buy': Field('OutstandingBuy'),
+        'outstanding_sell': Field('OutstandingSell'),
+        'owned_ratio': Field('OwnedRatio'),
+        'dividend': Field('Dividend'),
+        'yield_': Field('Yield'),
+        'beta': Field('Beta'),
+        'eps': Field('EPS'),
+        'pe': Field('PE'),
+        'feps': Field('FEPS'),
+        'bvps': Field('BVPS'),
+        'pb': Field('PB'),
+        'total_room': Field('TotalRoom'),
+        'curr_room': Field('CurrRoom'),
+        'remain_room': Field('RemainRoom'),
+        'f_buy_vol': Field('F_BuyVol'),
+        'f_buy_val': Field('F_BuyVal'),
+        'f_sell_vol': Field('F_SellVol'),
+        'f_sell_val': Field('F_SellVal'),
+        'f_buy_put_vol': Field('F_BuyPutVol'),
+        'f_buy_put_val': Field('F_BuyPutVal'),
+        'f_sell_put_vol': Field('F_SellPutVol'),
+        'f_sell_put_val': Field('F_SellPutVal'),
+        'market_status': Field('MarketStatus'),
+        'color_id': Field('ColorId'),
+        'status_name': Field('StatusName'),
+        'stock_status': Field('StockStatus'),
+    },
+    MarketPrice: {
+        'time': Field('TradingDate', to_time_s),
+        'symbol': Field('Code'),
+        'name': Field('Name'),
+        'price': Field('Price'),
+        'change': Field('Change'),
+        'per_change': Field('PerChange'),
+    },
+    StockDealDetail: {
+        'time': Field('TradingDate', to_time_s),
+        'symbol': Field('Stockcode'),
+        'package': Field('Package'),
+        'price': Field('Price'),
+        'vol': Field('Vol'),
+        'total_vol': Field('TotalVol'),
+        'total_val': Field('TotalVal'),
+        'change': Field('Change'),
+        'side': Field('IsBuy', _buy_sell),
+        'per_change': Field('PerChange'),
+    },
+    StatisticsData: {
+        'f_date': Field('F_Date', to_time_s),
+        't_date': Field('T_Date', to_time_s),
+        'f_last_price': Field('F_LastPrice'),
+        'f_total_vol': Field('F_TotalVol'),
+        't_last_price': Field('T_LastPrice'),
+        't_total_vol': Field('T_TotalVol'),
+        'num_trading_days': Field('NoTr'),
+        'change': Field('Change'),
+        'per_change': Field('PerChange'),
+        'max_price': Field('MaxPrice'),
+        'min_price': Field('MinPrice'),
+        'avg_vol': Field('AvgVol'),
+        'max_vol': Field('MaxVol'),
+        'min_vol': Field('MinVol'),
+        'date_max_price': Field('DateMaxPrice', to_time_s),
+        'date_min_price': Field('DateMinPrice', to_time_s),
+        'date_max_vol': Field('DateMaxVol', to_time_s),
+        'date_min_vol': Field('DateMinVol', to_time_s),
+    },
+    CompanyRelation: {
+        'symbol': Field('StockCode', default=""),
+        'cat_id': Field('CatID', default=0),
+        'last_price': Field('LastPrice', default=0),
+        'change': Field('Change', default=0),
+        'per_change': Field('PerChange', default=0.0),
+        'highest_price': Field('HighestPrice', default=0),
+        'lowest_price': Field('LowestPrice', default=0),
+        'total_vol': Field('TotalVol', default=0),
+        'total_val': Field('TotalVal', default=0),
+        'foreign_buy_vol': Field('ForeignBuyVol', default=0),
+        'foreign_sell_vol': Field('ForeignSellVol', default=0),
+        'market_capital': Field('MarketCapital', default=0),
+        'pe': Field('PE', default=0.0),
+        'pb': Field('PB', default=0.0),
+        'url': Field('Url', default=""),
+    },
+    Document: {
+        'file_ext': Field('FileExt', default=""),
+        'update_time': Field('UpdateTime', default=None),
+        'total_row': Field('TotalRow', default=0),
+        'file_info_id': Field('FileInfoID', default=0),
+        'url': Field('Url', default=""),
+        'title': Field('Title', default=""),
+        'full_name': Field('FullName', default=""),
+        'last_update': Field('LastUpdate', to_time_s, default=None),
+    },
+    HeaderNews: {
+        'title': Field('Title', default=""),
+        'url': Field('URL', _finance_url, default=''),
+        'publish_time': Field('PublishTime', to_time_s, default=""),
+    },
+    EventTransferData: {
+        'event_id': Field('EventID'),
+        'symbol': Field('StockCode'),
+        'finance_url': Field('FinanceURL'),
+        'content': Field('Content'),
+        'title': Field('Title'),
+        'file_url': Field('FileUrl'),
+        'type_name': Field('TypeName'),
+        'transfer_type_id': Field('TransferTypeID'),
+        'position_cd': Field('PositionCD'),
+        'extra_position_nlq': Field('ExtraPositionNLQ'),
+        'extra_position_nlq_ex': Field('ExtraPositionNLQEx'),
+        'extra_position_nn': Field('ExtraPositionNN'),
+        'relationship_type': Field('RelationShipType'),
+        'dtthcd': Field('DTTHCD'),
+        'dtthlq': Field('DTTHLQ'),
+        'dtlqlq': Field('DTLQLQ'),
+        'nvth': Field('NVTH'),
+        'register_buy_volume': Field('RegisterBuyVolume'),
+        'buy_volume': Field('BuyVolume'),
+        'register_sell_volume': Field('RegisterSellVolume'),
+        'sell_volume': Field('SellVolume'),
+        'register_volume_before': Field('RegisterVolumeBefore'),
+        'register_volume_after': Field('RegisterVolumeAfter'),
+        'volume_before': Field('VolumeBefore'),
+        'volume_after': Field('VolumeAfter'),
+        'date_buy_expected': Field('DateBuyExpected'),
+        'date_sell_expected': Field('DateSellExpected'),
+        'date_action_to': Field('DateActionTo'),
+        'position_cd_ex': Field('PositionCDEx'),
+        'extra_position_id_nn_ex': Field('ExtraPositionIDNNEx'),
+        'date_action_from': Field('DateActionFrom'),
+        'ndd_title': Field('NDDTitle'),
+        'nddth': Field('NDDTH'),
+        'ndd_position': Field('NDDPosition'),
+        'ndd_extra_position': Field('NDDExtraPosition'),
+        'transfer_title_type_id': Field('TransferTitleTypeID'),
+        'register_buy_volume_percent': Field('RegisterBuyVolumePercent'),
+        'buy_volume_percent': Field('BuyVolumePercent'),
+        'register_sell_volume_percent': Field('RegisterSellVolumePercent'),
+        'sell_volume_percent': Field('SellVolumePercent'),
+        'register_volume_before_percent': Field('RegisterVolumeBeforePercent'),
+        'register_volume_after_percent': Field('RegisterVolumeAfterPercent'),
+        'volume_before_percent': Field('VolumeBeforePercent'),
+        'volume_after_percent': Field('VolumeAfterPercent'),
+        'status_name': Field('StatusName'),
+        'total_record': Field('TotalRecord'),
+        'row': Field('Row'),
+    },
+    BondRelated: {
+        'key_code': Field('KeyCode', default=""),
+        'stock_code': Field('StockCode', default=""),
+        'bond_code': Field('BondCode', default=""),
+        'release_date': Field('ReleaseDate', to_time_s, default=None),
+        'due_date': Field('DueDate', to_time_s, default=None),
+        'face_value': Field('FaceValue', default=0),
+        'issue_rate': Field('IssueRate', default=0.0),
+        'issue_volume': Field('IssuaVolume', default=0),
+        'outstanding_shares': Field('OutstandingShares', default=0),
+        'company_code': Field('CompanyCode', default=None),
+        'company_name': Field('CompanyName', default=None),
+        'company_url': Field('CompanyURL', default=None),
+        'interest_rate_type': Field('InterestRateType', default=""),
+        'interest_period': Field('InterestPeriod', default=""),
+        'total_record': Field('TotalRecord', default=0),
+    },
+    NewsArticle: {
+        'symbol': Field('StockCode', default=None),
+        'channel_id': Field('ChannelID', default=None),
+        'head': Field('Head', default=None),
+        'article_id': Field('ArticleID', default=None),
+        'title': Field('Title', default=None),
+        'publish_time': Field('PublishTime', to_time_s, default=None),
+        'content': Field('Content', default=None),
+        'url': Field('URL', default=None),
+        'total_row': Field('TotalRow', default=None),
+    },
+    ChannelNewsArticle: {
+        'article_id': Field('ArticleID', default=None),
+        'title': Field('Title', default=None),
+        'head': Field('Head', default=None),
+        'head_image_url': Field('HeadImageUrl', default=None),
+        'publish_time': Field('PublishTime', to_time_s, default=None),
+        'channel_id': Field('ChannelID', default=None),
+        'url': Field('URL', default=None),
+        'row': Field('Row', default=None),
+        'total_row': Field('TotalRow', default=None),
+    },
+    CompanyEvent: {
+        'symbol': Field('Code', default=None),
+        'event_id': Field('EventID', default=None),
+        'event_type_id': Field('EventTypeID', default=None),
+        'channel_id': Field('ChannelID', default=None),
+        'company_name': Field('CompanyName', default=None),
+        'cat_id': Field('CatID', default=None),
+        'gdkhq_date': Field('GDKHQDate', to_time_s, default=None),
+        'ndkcc_date': Field('NDKCCDate', to_time_s, default=None),
+        'event_time': Field('Time', default=None),
+        'note': Field('Note', default=None),
+        'name': Field('Name', default=None),
+        'exchange': Field('Exchange', default=None),
+        'title': Field('Title', default=None),
+        'content': Field('Content', default=None),
+        'file_url': Field('FileUrl', default=None),
+        'date_order': Field('DateOrder', to_time_s, default=None),
+        'row': Field('Row', default=None),
+    },
+    EventSameIndustry: {
+        'symbol': Field('Code', default=None),
+        'event_id': Field('EventID', default=None),
+        'event_type_id': Field('EventTypeID', default=None),
+        'channel_id': Field('ChannelID', default=None),
+        'company_name': Field('CompanyName', default=None),
+        'cat_id': Field('CatID', default=None),
+        'gdkhq_date': Field('GDKHQDate', to_time_s, default=None),
+        'ndkcc_date': Field('NDKCCDate', to_time_s, default=None),
+        'event_time': Field('Time', to_time_s, default=None),
+        'note': Field('Note', default=None),
+        'name': Field('Name', default=None),
+        'exchange': Field('Exchange', default=None),
+        'title': Field('Title', default=None),
+        'content': Field('Content', default=None),
+        'file_url': Field('FileUrl', default=None),
+        'date_order': Field('DateOrder', to_time_s, default=None),
+        'place': Field('Place', default=None),
+        'time_action': Field('TimeAction', default=None),
+        'from_date': Field('FromDate', to_time_s, default=None),
+        'row': Field('Row', default=None),
+    },
+    IncomeStatementData: {
+        'row_number': Field('RowNumber'),
+        'report_data_id': Field('ReportDataID'),
+        'year_period': Field('YearPeriod'),
+        'report_term_id': Field('ReportTermID'),
+        'audit_opinion': Field('YKienKiemToan'),
+        'audit_firm': Field('CtyKiemToan'),
+        'is_united': Field('IsUnited'),
+        'united_name': Field('UnitedName'),
+        'audit_status_id': Field('AuditStatusID'),
+        'audit_status_name': Field('AuditStatusName'),
+        'period_begin': Field('PeriodBegin'),
+        'period_end': Field('PeriodEnd'),
+        'base_period_begin': Field('BasePeriodBegin'),
+        'base_period_end': Field('BasePeriodEnd'),
+        'is_show_data_permission': Field('IsShowData_Permission'),
+    },
+}
+
+
+def resolve(field: Field, item):
+    value = item[field.key] if field.default is _REQUIRED else item.get(field.key, field.default)
+    return value if field.convert is None else field.convert(value)
+
+
+def build_record(record_type: type, item):
+    """
+    Eagerly builds a schema dataclass from one decoded JSON item.
+    """
+    return record_type(**{name: resolve(field, item) for name, field in FIELDS[record_type].items()})
+
+
+class RecordView:
+    """
+    Read-only view over one decoded JSON item. Attributes use the schema's snake_case names, are looked up
+    in the raw item on first access and converted then. dataclasses.fields and dataclasses.asdict work on views.
+    """
+    __slots__ = ('_item', '_values')
+    _fields: Dict[str, Field] = {}
+    record_type: type = None
+
+    def __init__(self, item):
+        self._item = item
+        self._values = {}
+
+    def __getattr__(self, name):
+        field = type(self)._fields.get(name)
+        if field is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._values[name] = resolve(field, self._item)
+            return value
+
+    @property
+    def raw(self):
+        return self._item
+
+    def to_record(self):
+        """
+        :return: the equivalent schema dataclass.
+        """
+        return build_record(self.record_type, self._item)
+
+    def __eq__(self, other):
+        if isinstance(other, RecordView):
+            return self.record_type is other.record_type and self._item == other._item
+        if isinstance(other, self.record_type):
+            return self.to_record() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # views are rebuilt as plain dataclasses on unpickling, e.g. when sent to a process pool
+        return build_record, (self.record_type, self._item)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._item!r})"
+
+
+_view_types: Dict[type, type] = {}
+
+
+def view_type(record_type: type) -> type:
+    """
+    :return: the RecordView subclass for a schema dataclass, created once.
+    """
+    view = _view_types.get(record_type)
+    if view is None:
+        view = _view_types[record_type] = type(f"{record_type.__name__}View", (RecordView,), {
+            '__slots__': (),
+            '_fields': FIELDS[record_type],
+            'record_type': record_type,
+            '__dataclass_fields__': record_type.__dataclass_fields__,
+        })
+    return view
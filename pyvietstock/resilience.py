@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from pyvietstock.instrumentation import NOOP, Instrumentation
+from pyvietstock.transport import DEFAULT_TIMEOUT, RequestsTransport, Transport
+
+DEFAULT_LATENCY_WINDOW = 200
+DEFAULT_HEDGE_QUANTILE = 0.95
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIME = 30
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    Raised without sending anything while the circuit of an endpoint is open.
+    """
+    pass
+
+
+def endpoint_of(url: str) -> str:
+    return urlparse(url).path.lower()
+
+
+class LatencyTracker:
+    """
+    Latencies of the last window successful calls per endpoint, with percentiles computed on demand.
+    """
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, endpoint: str) -> int:
+        return len(self._samples.get(endpoint, ()))
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        """
+        :param q: quantile between 0 and 1, e.g. 0.95.
+        :return: the latency in seconds, None without samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            endpoint: {
+                'count': self.count(endpoint),
+                'p50': self.percentile(endpoint, 0.5),
+                'p95': self.percentile(endpoint, 0.95),
+                'p99': self.percentile(endpoint, 0.99),
+            } for endpoint in list(self._samples)
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects calls for recovery_time seconds.
+    Then one trial call is let through (half open): success closes the circuit, failure opens it again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, recovery_time: float = DEFAULT_RECOVERY_TIME):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.recovery_time:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+
+class ResilientTransport(Transport):
+    """
+    Wraps a transport with per-endpoint timeouts, optional hedging and per-endpoint circuit breakers.
+    Every endpoint has its own bounded worker pool: a timed out call keeps running until the inner transport
+    gives up, so a stalled endpoint can only tie up its own workers, never those of healthy endpoints.
+
+    Hedging: when a call has not answered after the live p95 latency of its endpoint, an identical request is
+    fired and whichever answer arrives first is used. Every wrapped endpoint is a read, so duplicates are safe.
+    A timeout raises requests.Timeout. Exceptions and 5xx responses count as failures for the breaker.
+    """
+
+    def __init__(
+            self,
+            inner: Optional[Transport] = None,
+            timeouts: Optional[Dict[str, float]] = None,
+            default_timeout: float = DEFAULT_TIMEOUT,
+            hedge: bool = False,
+            hedge_quantile: float = DEFAULT_HEDGE_QUANTILE,
+            min_samples: int = 20,
+            failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+            recovery_time: float = DEFAULT_RECOVERY_TIME,
+            max_workers: int = 8,
+            instrumentation: Optional[Instrumentation] = None,
+    ):
+        """
+        :param timeouts: timeout in seconds by lower case URL path, e.g. {'/company/tradinginfo': 5}.
+        :param hedge: fire a duplicate request after the hedge_quantile latency of the endpoint.
+        :param min_samples: hedging starts once an endpoint has this many latency samples.
+        :param max_workers: requests in flight at once per endpoint, hedges and abandoned calls included.
+        :param instrumentation: receives a retry event for every hedge fired.
+        """
+        self.inner = inner or RequestsTransport()
+        self.timeouts = {path.lower(): seconds for path, seconds in (timeouts or {}).items()}
+        self.default_timeout = default_timeout
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.instrumentation = instrumentation or NOOP
+        self.latency = LatencyTracker()
+        self.max_workers = max_workers
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+        self.hedges = 0
+        self.hedges_won = 0
+        self.timeouts_hit = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.recovery_time)
+            return breaker
+
+    def _executor(self, endpoint: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(endpoint)
+            if executor is None:
+                executor = self._executors[endpoint] = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='pyvietstock-resilient')
+            return executor
+
+    def _timed(self, endpoint: str, method, url, headers, params, data, stream):
+        started = time.perf_counter()
+        response = self.inner.request(method, url, headers=headers, params=params, data=data, stream=stream)
+        if response.status_code < 500:
+            self.latency.observe(endpoint, time.perf_counter() - started)
+        return response
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        endpoint = endpoint_of(url)
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {endpoint}, failing fast")
+        timeout = self.timeouts.get(endpoint, self.default_timeout)
+        deadline = time.monotonic() + timeout
+        call = (endpoint, method, url, headers, params, data, stream)
+        executor = self._executor(endpoint)
+
+        first = executor.submit(self._timed, *call)
+        futures = [first]
+        hedge_after = None
+        if self.hedge and not stream and self.latency.count(endpoint) >= self.min_samples:
+            hedge_after = self.latency.percentile(endpoint, self.hedge_quantile)
+
+        response, error = None, None
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(futures, timeout=min(remaining, hedge_after or remaining), return_when=FIRST_COMPLETED)
+            if not done:
+                if hedge_after is not None:
+                    # the first answer is later than usual: fire one duplicate and take whichever comes first
+                    futures.append(executor.submit(self._timed, *call))
+                    hedge_after = None
+                    with self._lock:
+                        self.hedges += 1
+                    self.instrumentation.retry(endpoint)
+                continue
+            future = done.pop()
+            futures.remove(future)
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if future is not first:
+                with self._lock:
+                    self.hedges_won += 1
+            break
+
+        if response is None:
+            self._failure(endpoint, breaker)
+            if error is not None and not futures:
+                raise error
+            with self._lock:
+                self.timeouts_hit += 1
+            raise requests.Timeout(f"{method} {endpoint} did not answer within {timeout}s")
+        if response.status_code >= 500:
+            self._failure(endpoint, breaker)
+        else:
+            breaker.record_success()
+        return response
+
+    def _failure(self, endpoint: str, breaker: CircuitBreaker):
+        was_open = breaker.state == CircuitBreaker.OPEN
+        breaker.record_failure()
+        if not was_open and breaker.state == CircuitBreaker.OPEN:
+            logging.warning(f"ResilientTransport: circuit opened for {endpoint} for {breaker.recovery_time}s")
+
+    def stats(self) -> dict:
+        return {
+            'latency': self.latency.stats(),
+            'breakers': {e: b.state for e, b in self._breakers.items()},
+            'hedges': self.hedges,
+            'hedges_won': self.hedges_won,
+            'timeouts': self.timeouts_hit,
+        }
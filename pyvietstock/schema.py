@@ -288,3 +288,61 @@ class IncomeStatementData:
     base_period_begin: int
     base_period_end: int
     is_show_data_permission: bool
+
+
+@dataclass
+class SymbolInfo:
+    symbol: str
+    exchange: Union[str, None]
+    cat_id: Union[int, None]
+    company_name: Union[str, None]
+    status: Union[str, None]
+    updated_at: int  # epoch seconds of the last refresh, 0 if only seen as a peer
+
+
+@dataclass
+class IntradayBar:
+    symbol: str
+    interval: int  # minutes
+    time: str  # start of the bar
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    vwap: float
+    buy_volume: float
+    sell_volume: float
+    imbalance: float  # (buy_volume - sell_volume) / volume
+
+
+@dataclass
+class CorporateAction:
+    symbol: str
+    event_id: Union[int, None]
+    ex_date: str  # YYYY-MM-DD, first trading day without the entitlement
+    kind: str  # CorporateActionKind
+    cash: float  # VND per share (cash dividend)
+    ratio: float  # new shares per held share (stock dividend, bonus, rights)
+    price: float  # VND per new share (rights)
+    price_factor: float  # multiplier applied to prices before ex_date
+    volume_factor: float  # multiplier applied to volumes before ex_date
+
+
+@dataclass
+class AlertRule:
+    rule_id: str
+    symbol: str
+    kind: str  # AlertKind
+    threshold: float
+    once: bool = True  # deactivate after the first alert, otherwise fire again each time the condition turns true
+
+
+@dataclass
+class Alert:
+    rule_id: str
+    symbol: str
+    kind: str
+    threshold: float
+    value: float  # price, % change or volume ratio that triggered the rule
+    time: Union[str, float, int]
@@ -0,0 +1,181 @@
+import ast
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from pyvietstock.schema import TradingInfo
+
+NUMERIC_FIELDS = [
+    f.name for f in fields(TradingInfo)
+    if f.type in (float, int) and f.name != 'color_id'
+]
+
+_COMPARE_OPS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+_BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+}
+
+
+class Screener:
+    """
+    Columnar table of TradingInfo snapshots for cross-sectional screening.
+    Every numeric field is stored as a float64 array, filters and ranks run as vectorized numpy operations.
+    """
+
+    def __init__(self, records: Iterable[TradingInfo] = (), industries: Union[Dict[str, int], None] = None):
+        """
+        :param records: TradingInfo snapshots, one per symbol.
+        :param industries: optional mapping symbol -> CatID used for group ranks, e.g. from SymbolMaster.
+        """
+        records = [r for r in records if r is not None]
+        self.symbols = np.array([r.symbol for r in records], dtype=object)
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.array([getattr(r, name) for r in records], dtype=np.float64)
+            for name in NUMERIC_FIELDS
+        }
+        industries = industries or {}
+        self.columns['cat_id'] = np.array(
+            [industries.get(s, np.nan) for s in self.symbols], dtype=np.float64
+        )
+
+    @classmethod
+    def load(cls, vf, symbols: Iterable[str], max_workers: int = 16, symbol_master=None) -> 'Screener':
+        """
+        Fetches trading_info for every symbol concurrently and builds the table.
+        :param vf: VietStockFinance instance.
+        :param symbols: universe to load.
+        :param symbol_master: optional SymbolMaster used to attach CatID to each symbol.
+        """
+        def fetch(symbol):
+            try:
+                return vf.trading_info(symbol)
+            except Exception as e:
+                logging.warning(f"Screener: trading_info failed for {symbol}: {e}")
+                return None
+
+        symbols = list(symbols)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            records = list(executor.map(fetch, symbols))
+        industries = {}
+        if symbol_master is not None:
+            for symbol in symbols:
+                info = symbol_master.get(symbol)
+                if info is not None and info.cat_id is not None:
+                    industries[info.symbol] = info.cat_id
+        return cls(records, industries)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise KeyError(f"Unknown column: {name}")
+        return self.columns[name]
+
+    def mask(self, expression: str) -> np.ndarray:
+        """
+        Evaluates a boolean expression over the columns, e.g. "pe < 10 and remain_room > 0".
+        Supports comparisons (chained too), and/or/not, + - * / and numeric constants.
+        Comparisons against NaN are False.
+        """
+        tree = ast.parse(expression, mode='eval')
+        result = self._eval(tree.body)
+        if np.ndim(result) == 0:
+            return np.full(len(self), bool(result))
+        return np.asarray(result, dtype=bool)
+
+    def _eval(self, node):
+        if isinstance(node, ast.BoolOp):
+            values = [np.asarray(self._eval(v), dtype=bool) for v in node.values]
+            reduce = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return reduce.reduce(values)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(operand)
+            if isinstance(node.op, ast.USub):
+                return np.negative(operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left)
+            result = None
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARE_OPS:
+                    raise ValueError(f"Unsupported comparison: {ast.unparse(node)}")
+                right = self._eval(comparator)
+                with np.errstate(invalid='ignore'):
+                    part = _COMPARE_OPS[type(op)](left, right)
+                result = part if result is None else np.logical_and(result, part)
+                left = right
+            return result
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return _BINARY_OPS[type(node.op)](self._eval(node.left), self._eval(node.right))
+        if isinstance(node, ast.Name):
+            return self.column(node.id)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        raise ValueError(f"Unsupported expression: {ast.unparse(node)}")
+
+    def filter(self, expression: str) -> List[str]:
+        """
+        :return: symbols matching the expression.
+        """
+        return list(self.symbols[self.mask(expression)])
+
+    def top(self, n: int, by: str, where: Union[str, None] = None, ascending: bool = False) -> List[str]:
+        """
+        :return: the n symbols with the largest (or smallest) value of a column, optionally filtered first.
+        NaN values are ranked last.
+        """
+        values = self.column(by)
+        index = np.arange(len(self))
+        if where:
+            index = index[self.mask(where)]
+        selected = values[index]
+        selected = np.where(np.isnan(selected), np.inf if ascending else -np.inf, selected)
+        order = np.argsort(selected if ascending else -selected, kind='stable')[:n]
+        return list(self.symbols[index[order]])
+
+    def percentile_rank(self, column: str, group_by: Union[str, None] = None) -> np.ndarray:
+        """
+        Percentile rank (0..1] of every symbol for a column, within its group (e.g. group_by='cat_id')
+        or across the whole table: the share of the group with a value at or below it, so tied values share
+        the same (max) rank. NaN values get NaN ranks.
+        """
+        values = self.column(column)
+        groups = np.zeros(len(self)) if group_by is None else self.column(group_by)
+        valid = ~np.isnan(values) & ~np.isnan(groups)
+        ranks = np.full(len(self), np.nan)
+        if not valid.any():
+            return ranks
+
+        idx = np.flatnonzero(valid)
+        g, v = groups[idx], values[idx]
+        order = np.lexsort((v, g))
+        g_sorted, v_sorted = g[order], v[order]
+        new_group = g_sorted[1:] != g_sorted[:-1]
+        starts = np.flatnonzero(np.r_[True, new_group])
+        sizes = np.diff(np.r_[starts, len(order)])
+        group_start = np.repeat(starts, sizes)
+        # ties take the position of the last equal value of their group
+        run_ends = np.flatnonzero(np.r_[new_group | (v_sorted[1:] != v_sorted[:-1]), True])
+        last_equal = run_ends[np.searchsorted(run_ends, np.arange(len(order)))]
+        position = last_equal - group_start + 1
+        ranks[idx[order]] = position / np.repeat(sizes, sizes)
+        return ranks
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import requests
+
+from pyvietstock.account import login
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.transport import Transport, RequestsTransport
+
+DEFAULT_MAX_AGE = 6 * 3600
+DEFAULT_THROTTLE_COOLDOWN = 300
+THROTTLED_STATUS_CODES = (429,)
+EXPIRED_STATUS_CODES = (401, 403)
+
+
+class Session:
+    """
+    One authenticated Vietstock account: its captured headers and token plus usage bookkeeping.
+    """
+
+    def __init__(self, user_name: str, password: str):
+        self.user_name = user_name
+        self.password = password
+        self.cache_path = f".cache/login-{hashlib.sha1(user_name.encode('utf-8')).hexdigest()[:12]}.json"
+        self.headers = None
+        self.token = None
+        self.logged_in_at = 0.0
+        self.expired = True
+        self.throttled_until = 0.0
+        self.in_use = 0
+        self.requests = 0
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+    def available(self, now: float) -> bool:
+        return self.throttled_until <= now
+
+    def __repr__(self):
+        return f"Session({self.user_name!r}, in_use={self.in_use}, requests={self.requests})"
+
+
+class SessionPool:
+    """
+    Holds several authenticated sessions and hands them out to worker threads or coroutines.
+    The least loaded available session is picked, each session re-logs in on its own when it is older than
+    max_age or the server rejected its token, and a throttled session is left out for throttle_cooldown seconds.
+    """
+
+    def __init__(
+            self,
+            credentials: Iterable[Tuple[str, str]],
+            transport: Optional[Transport] = None,
+            max_age: float = DEFAULT_MAX_AGE,
+            throttle_cooldown: float = DEFAULT_THROTTLE_COOLDOWN,
+            login_func: Callable = login,
+    ):
+        """
+        :param credentials: (user name, password) pairs, one per account.
+        :param transport: transport shared by every client handed out, RequestsTransport by default.
+        :param login_func: login function with the signature of pyvietstock.account.login.
+        """
+        self.sessions: List[Session] = [Session(u, p) for u, p in credentials]
+        if not self.sessions:
+            raise ValueError("SessionPool needs at least one account")
+        self.transport = transport or RequestsTransport()
+        self.max_age = max_age
+        self.throttle_cooldown = throttle_cooldown
+        self._login = login_func
+        self._condition = threading.Condition()
+
+    def refresh(self, session: Session, force: bool = False):
+        """
+        Logs the session in again if it is expired, too old, or force is set. Other sessions are not blocked.
+        """
+        with session.lock:
+            stale = session.expired or time.time() - session.logged_in_at > self.max_age
+            if not (force or stale):
+                return
+            logging.info(f"SessionPool: logging in {session.user_name}")
+            headers, token = self._login(session.user_name, session.password,
+                                         cache_path=session.cache_path, refresh=force or session.token is not None)
+            if token is None:
+                raise RuntimeError(f"Login failed for {session.user_name}")
+            session.headers, session.token = headers, token
+            session.logged_in_at = time.time()
+            session.expired = False
+
+    def acquire(self, timeout: Optional[float] = None) -> Session:
+        """
+        Takes the least loaded session that is not throttled, waiting while every session is throttled.
+        The session is logged in (again) if needed. Return it with release().
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while True:
+                now = time.time()
+                available = [s for s in self.sessions if s.available(now)]
+                if available:
+                    session = min(available, key=lambda s: (s.in_use, s.last_used))
+                    session.in_use += 1
+                    session.last_used = now
+                    break
+                wait = min(s.throttled_until for s in self.sessions) - now
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError("No session available, every account is throttled")
+                    wait = min(wait, deadline - now)
+                self._condition.wait(wait)
+        try:
+            self.refresh(session)
+        except Exception:
+            self.release(session)
+            raise
+        return session
+
+    def release(self, session: Session, status_code: Optional[int] = None):
+        """
+        Returns a session to the pool. A throttling status code takes it out of rotation for a while,
+        an authentication error makes it log in again on next use.
+        """
+        with self._condition:
+            session.in_use -= 1
+            session.requests += 1
+            if status_code in THROTTLED_STATUS_CODES:
+                self.mark_throttled(session)
+            elif status_code in EXPIRED_STATUS_CODES:
+                session.expired = True
+            self._condition.notify_all()
+
+    def mark_throttled(self, session: Session, cooldown: Optional[float] = None):
+        session.throttled_until = time.time() + (self.throttle_cooldown if cooldown is None else cooldown)
+        logging.warning(f"SessionPool: {session.user_name} throttled until {time.ctime(session.throttled_until)}")
+
+    @contextmanager
+    def client(self, timeout: Optional[float] = None):
+        """
+        Yields a VietStockFinance bound to one pooled session for the duration of the block.
+        HTTP errors raised inside the block are used to detect throttled or expired sessions.
+        """
+        session = self.acquire(timeout)
+        status_code = None
+        try:
+            yield VietStockFinance(self.transport).set_session(session.headers, session.token)
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            raise
+        finally:
+            self.release(session, status_code)
+
+    @asynccontextmanager
+    async def async_client(self, timeout: Optional[float] = None):
+        """
+        Coroutine version of client(). Waiting and logging in run in a worker thread.
+        """
+        session = await asyncio.to_thread(self.acquire, timeout)
+        status_code = None
+        try:
+            yield VietStockFinance(self.transport).set_session(session.headers, session.token)
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            raise
+        finally:
+            self.release(session, status_code)
+
+    def stats(self) -> List[dict]:
+        now = time.time()
+        return [{
+            'user_name': s.user_name,
+            'in_use': s.in_use,
+            'requests': s.requests,
+            'throttled': not s.available(now),
+            'age': now - s.logged_in_at if s.logged_in_at else None,
+        } for s in self.sessions]
@@ -0,0 +1,139 @@
+import os
+import time
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from pyvietstock.params import HistoricalResolution
+from pyvietstock.schema import HistoricalData
+from pyvietstock.utils import convert_to_epoch
+
+DEFAULT_STORE_DIR = '.cache/ohlcv'
+
+# One fixed-width record per bar, sorted by time. The time column doubles as the date index.
+OHLCV_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+
+def to_bars(records: Iterable[HistoricalData]) -> np.ndarray:
+    """
+    Converts HistoricalData records to a structured array with OHLCV_DTYPE, sorted by time.
+    """
+    records = list(records)
+    bars = np.empty(len(records), dtype=OHLCV_DTYPE)
+    for i, r in enumerate(records):
+        bars[i] = (convert_to_epoch(r.time), r.open, r.high, r.low, r.close, r.volume)
+    return np.sort(bars, order='time', kind='stable')
+
+
+class OHLCVStore:
+    """
+    Memory-mapped OHLCV store, one binary file per symbol and resolution: <root>/<resolution>/<symbol>.bin.
+    Reads return zero-copy views of the file, appends never rewrite existing records.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+
+    def path(self, symbol: str, resolution: str = HistoricalResolution.DEFAULT) -> str:
+        return os.path.join(self.root, resolution, f"{symbol.upper()}.bin")
+
+    def symbols(self, resolution: str = HistoricalResolution.DEFAULT) -> List[str]:
+        directory = os.path.join(self.root, resolution)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f[:-4] for f in os.listdir(directory) if f.endswith('.bin'))
+
+    def count(self, symbol: str, resolution: str = HistoricalResolution.DEFAULT) -> int:
+        path = self.path(symbol, resolution)
+        return os.path.getsize(path) // OHLCV_DTYPE.itemsize if os.path.exists(path) else 0
+
+    def open(self, symbol: str, resolution: str = HistoricalResolution.DEFAULT) -> np.ndarray:
+        """
+        :return: a read-only memmap over all bars of the symbol, or an empty array if there is none.
+        """
+        n = self.count(symbol, resolution)
+        if n == 0:
+            return np.empty(0, dtype=OHLCV_DTYPE)
+        return np.memmap(self.path(symbol, resolution), dtype=OHLCV_DTYPE, mode='r', shape=(n,))
+
+    def slice(
+            self,
+            symbol: str,
+            resolution: str = HistoricalResolution.DEFAULT,
+            from_time: Union[int, str, None] = None,
+            to_time: Union[int, str, None] = None
+    ) -> np.ndarray:
+        """
+        :return: a zero-copy view of the bars with from_time <= time <= to_time, located by binary search.
+        """
+        bars = self.open(symbol, resolution)
+        times = bars['time']
+        start = 0 if from_time is None else np.searchsorted(times, convert_to_epoch(from_time), side='left')
+        end = len(bars) if to_time is None else np.searchsorted(times, convert_to_epoch(to_time), side='right')
+        return bars[start:end]
+
+    def last_time(self, symbol: str, resolution: str = HistoricalResolution.DEFAULT) -> Union[int, None]:
+        bars = self.open(symbol, resolution)
+        return int(bars['time'][-1]) if len(bars) else None
+
+    def append(
+            self,
+            symbol: str,
+            bars: Union[np.ndarray, Iterable[HistoricalData]],
+            resolution: str = HistoricalResolution.DEFAULT
+    ) -> int:
+        """
+        Appends bars newer than the last stored bar. A bar with the same time as the last stored bar
+        replaces it in place, so an incomplete bar of the current session can be refreshed.
+        :return: number of bars appended.
+        """
+        if not isinstance(bars, np.ndarray):
+            bars = to_bars(bars)
+        if len(bars) == 0:
+            return 0
+        bars = np.sort(bars.astype(OHLCV_DTYPE, copy=False), order='time', kind='stable')
+        path = self.path(symbol, resolution)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        n = self.count(symbol, resolution)
+        if n:
+            last = self.last_time(symbol, resolution)
+            same = bars[bars['time'] == last]
+            if len(same):
+                stored = np.memmap(path, dtype=OHLCV_DTYPE, mode='r+', offset=(n - 1) * OHLCV_DTYPE.itemsize, shape=(1,))
+                stored[0] = same[-1]
+                stored.flush()
+                del stored
+            bars = bars[bars['time'] > last]
+
+        # drop duplicated times within the batch, keeping the latest version
+        if len(bars) > 1:
+            keep = np.append(bars['time'][1:] != bars['time'][:-1], True)
+            bars = bars[keep]
+        with open(path, 'ab') as f:
+            f.write(bars.tobytes())
+        return len(bars)
+
+    def refresh(
+            self,
+            vf,
+            symbol: str,
+            resolution: str = HistoricalResolution.DEFAULT,
+            from_time: Union[int, str, None] = None
+    ) -> int:
+        """
+        Fetches bars from the last stored bar (or from_time for a new symbol) up to now and appends them.
+        :param vf: VietStockFinance instance.
+        :return: number of bars appended.
+        """
+        last = self.last_time(symbol, resolution)
+        start = last if last is not None else from_time
+        records = vf.historical_data(symbol, resolution=resolution, from_time=start, to_time=int(time.time()))
+        return self.append(symbol, records or [], resolution)
@@ -0,0 +1,71 @@
+import codecs
+import json
+from typing import Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+_DELIMITERS = _WHITESPACE + ',]}'
+
+
+def iter_json_items(chunks: Iterable[bytes], depth: int = 1, encoding: str = 'utf-8') -> Iterator:
+    """
+    Incrementally decodes a JSON array from byte chunks and yields its items one at a time.
+    With depth=2 the top-level array is expected to hold arrays, and the items of those inner arrays are
+    yielded instead (e.g. news grouped by type). Only the item being decoded is held in memory.
+    """
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    level = 0
+
+    def scan(final: bool):
+        nonlocal buffer, level
+        pos = 0
+        n = len(buffer)
+        while True:
+            while pos < n and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= n:
+                break
+            char = buffer[pos]
+            if char == ',':
+                pos += 1
+                continue
+            if char == ']' and level > 0:
+                level -= 1
+                pos += 1
+                continue
+            if char == '[' and level < depth:
+                level += 1
+                pos += 1
+                continue
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            if not final and not isinstance(value, (dict, list, str)) and (end == n or buffer[end] not in _DELIMITERS):
+                break  # a number may continue in the next chunk, e.g. "1500." + "0"
+            pos = end
+            if level == depth:
+                yield value
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += text_decoder.decode(chunk)
+        yield from scan(final=False)
+    buffer += text_decoder.decode(b'', final=True)
+    yield from scan(final=True)
+    if buffer.strip():
+        raise ValueError(f"Unexpected trailing data in JSON stream: {buffer[:50]!r}")
+
+
+def iter_response_items(response, depth: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+    """
+    Streams the items of a JSON array response, see iter_json_items.
+    """
+    return iter_json_items(response.iter_content(chunk_size=chunk_size), depth=depth)
@@ -0,0 +1,187 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Set, Union
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.schema import SymbolInfo
+
+DEFAULT_SYMBOLS_PATH = '.cache/symbols.json'
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+class SymbolMaster:
+    """
+    Local symbol master table with O(1) lookups by symbol, industry (CatID) and exchange.
+    It is built from company_relation_filter (peers), events_same_industry (exchange, company name, CatID)
+    and trading_info (status), stored as JSON and refreshed incrementally. A symbol that appears in no recent
+    industry event gets its exchange from its own events (events_by_type) instead.
+    """
+
+    def __init__(self, path: str = DEFAULT_SYMBOLS_PATH):
+        self.path = path
+        self._by_symbol: Dict[str, SymbolInfo] = {}
+        self._by_cat: Dict[int, Set[str]] = {}
+        self._by_exchange: Dict[str, Set[str]] = {}
+        if os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._by_symbol)
+
+    def __contains__(self, symbol: str):
+        return symbol.upper() in self._by_symbol
+
+    def get(self, symbol: str) -> Union[SymbolInfo, None]:
+        return self._by_symbol.get(symbol.upper())
+
+    def symbols(self) -> List[str]:
+        return sorted(self._by_symbol)
+
+    def by_industry(self, cat_id: int) -> List[SymbolInfo]:
+        return [self._by_symbol[s] for s in sorted(self._by_cat.get(cat_id, ()))]
+
+    def by_exchange(self, exchange: str) -> List[SymbolInfo]:
+        return [self._by_symbol[s] for s in sorted(self._by_exchange.get(exchange.upper(), ()))]
+
+    def exchanges(self) -> List[str]:
+        return sorted(self._by_exchange)
+
+    def peers(self, symbol: str) -> List[SymbolInfo]:
+        info = self.get(symbol)
+        if info is None or info.cat_id is None:
+            return []
+        return [peer for peer in self.by_industry(info.cat_id) if peer.symbol != info.symbol]
+
+    def add(self, info: SymbolInfo):
+        """
+        Inserts or replaces a symbol, fields that are None keep their previous value.
+        """
+        info.symbol = info.symbol.upper()
+        old = self._by_symbol.get(info.symbol)
+        if old is not None:
+            for field, value in asdict(old).items():
+                if getattr(info, field) is None:
+                    setattr(info, field, value)
+            info.updated_at = max(info.updated_at, old.updated_at)
+            self._unindex(old)
+        if info.exchange:
+            info.exchange = info.exchange.upper()
+        self._by_symbol[info.symbol] = info
+        if info.cat_id is not None:
+            self._by_cat.setdefault(info.cat_id, set()).add(info.symbol)
+        if info.exchange:
+            self._by_exchange.setdefault(info.exchange, set()).add(info.symbol)
+
+    def _unindex(self, info: SymbolInfo):
+        if info.cat_id is not None:
+            self._by_cat.get(info.cat_id, set()).discard(info.symbol)
+        if info.exchange:
+            self._by_exchange.get(info.exchange, set()).discard(info.symbol)
+
+    def load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for row in json.load(f):
+                self.add(SymbolInfo(**row))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump([asdict(self._by_symbol[s]) for s in self.symbols()], f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def stale(self, max_age: int = DEFAULT_MAX_AGE) -> List[str]:
+        """
+        :return: symbols that were never refreshed or were refreshed more than max_age seconds ago.
+        """
+        deadline = time.time() - max_age
+        return [s for s, info in self._by_symbol.items() if info.updated_at < deadline]
+
+    def _refresh_symbol(self, vf: VietStockFinance, symbol: str, page_size: int, max_pages: int) -> List[SymbolInfo]:
+        found = []
+        for page in range(1, max_pages + 1):
+            peers = vf.company_relation_filter(symbol, page=page, page_size=page_size) or []
+            found.extend(SymbolInfo(p.symbol, None, p.cat_id, None, None, 0) for p in peers if p.symbol)
+            if len(peers) < page_size:
+                break
+
+        for event in vf.events_same_industry(symbol) or []:
+            if event.symbol:
+                found.append(SymbolInfo(event.symbol, event.exchange, event.cat_id, event.company_name, None, 0))
+
+        symbol = symbol.upper()
+        exchange = company_name = None
+        known = self.get(symbol)
+        if not any(f.exchange and f.symbol.upper() == symbol for f in found) and not (known and known.exchange):
+            # events_same_industry only covers recent events, the symbol's own events carry its exchange too
+            for event in vf.events_by_type(symbol, page_size=1) or []:
+                if event.exchange and event.symbol.upper() == symbol:
+                    exchange, company_name = event.exchange, event.company_name or None
+                    break
+
+        info = vf.trading_info(symbol)
+        status = info.status_name if info is not None else None
+        found.append(SymbolInfo(symbol, exchange, None, company_name, status, int(time.time())))
+        return found
+
+    def build(
+            self,
+            vf: VietStockFinance,
+            seeds: Iterable[str] = (),
+            max_age: int = DEFAULT_MAX_AGE,
+            max_symbols: Union[int, None] = None,
+            max_workers: int = 8,
+            page_size: int = 100,
+            max_pages: int = 10,
+    ) -> int:
+        """
+        Crawls peers starting from the seeds and the stale symbols already in the table, refreshing only
+        symbols older than max_age. Newly discovered peers are crawled in the following rounds.
+        :return: number of symbols refreshed, failed refreshes are not counted and are logged.
+        """
+        for seed in seeds:
+            if seed.upper() not in self._by_symbol:
+                self.add(SymbolInfo(seed, None, None, None, None, 0))
+
+        refreshed = 0
+        visited, failed = set(), []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                todo = [s for s in self.stale(max_age) if s not in visited]
+                if max_symbols is not None:
+                    todo = todo[:max(0, max_symbols - refreshed - len(failed))]
+                if not todo:
+                    break
+                visited.update(todo)
+                for symbol, result in zip(todo, executor.map(
+                        lambda s: self._safe_refresh(vf, s, page_size, max_pages), todo)):
+                    if result is None:
+                        failed.append(symbol)
+                        continue
+                    for info in result:
+                        self.add(info)
+                    refreshed += 1
+                logging.info(f"Symbol master: {refreshed} refreshed, {len(failed)} failed, {len(self)} known")
+                self.save()
+        if failed:
+            logging.warning(f"Symbol master: {len(failed)} symbols failed to refresh and stay stale until the next "
+                            f"build: {', '.join(sorted(failed))}")
+        missing = sorted(s for s in visited.difference(failed) if s in self._by_symbol and not self._by_symbol[s].exchange)
+        if missing:
+            logging.warning(f"Symbol master: no exchange found for {len(missing)} symbols, they are left out of "
+                            f"by_exchange: {', '.join(missing)}")
+        return refreshed
+
+    def _safe_refresh(self, vf, symbol, page_size, max_pages) -> Union[List[SymbolInfo], None]:
+        """
+        :return: the records found, None if the refresh failed.
+        """
+        try:
+            return self._refresh_symbol(vf, symbol, page_size, max_pages)
+        except Exception as e:
+            logging.error(f"Symbol master: failed to refresh {symbol}: {e}")
+            return None
@@ -0,0 +1,200 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Union
+
+from pyvietstock.params import SessionPhase
+from pyvietstock.utils import convert_to_epoch
+
+ICT_OFFSET = 7 * 3600
+DAY_SECONDS = 86400
+
+# HOSE order-matching schedule, minutes of the day in ICT. HNX and UPCoM have no ATO phase but trade in
+# the same windows, so the same schedule is used for every exchange.
+SESSION_SCHEDULE = (
+    (0, SessionPhase.PRE_OPEN),
+    (9 * 60, SessionPhase.ATO),
+    (9 * 60 + 15, SessionPhase.CONTINUOUS),
+    (11 * 60 + 30, SessionPhase.LUNCH_BREAK),
+    (13 * 60, SessionPhase.CONTINUOUS),
+    (14 * 60 + 30, SessionPhase.ATC),
+    (14 * 60 + 45, SessionPhase.PUT_THROUGH),
+    (15 * 60, SessionPhase.CLOSED),
+)
+OPEN_PHASES = frozenset({SessionPhase.ATO, SessionPhase.CONTINUOUS, SessionPhase.ATC, SessionPhase.PUT_THROUGH})
+MARKET_CLOSE_MINUTE = 15 * 60
+
+# Exchange holidays on weekdays, as announced by the exchanges. Extend with TradingCalendar(holidays=...)
+# or TradingCalendar.add_holidays() when a new year is published.
+HOLIDAYS = (
+    # 2024
+    '2024-01-01', '2024-02-08', '2024-02-09', '2024-02-12', '2024-02-13', '2024-02-14',
+    '2024-04-18', '2024-04-29', '2024-04-30', '2024-05-01', '2024-09-02', '2024-09-03',
+    # 2025
+    '2025-01-01', '2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-01-31',
+    '2025-04-07', '2025-04-30', '2025-05-01', '2025-05-02', '2025-09-01', '2025-09-02',
+    # 2026
+    '2026-01-01', '2026-01-02', '2026-02-16', '2026-02-17', '2026-02-18', '2026-02-19', '2026-02-20',
+    '2026-04-27', '2026-04-30', '2026-05-01', '2026-08-31', '2026-09-01', '2026-09-02',
+)
+
+TimeInput = Union[datetime, int, float, str, None]
+
+
+def end_of_day(epoch: int) -> int:
+    """
+    :return: the last second of the ICT calendar day of epoch.
+    """
+    return (epoch + ICT_OFFSET) // DAY_SECONDS * DAY_SECONDS + DAY_SECONDS - 1 - ICT_OFFSET
+
+
+def _build_minute_tables():
+    phases = []
+    for minute in range(24 * 60):
+        phase = SessionPhase.PRE_OPEN
+        for start, name in SESSION_SCHEDULE:
+            if minute >= start:
+                phase = name
+        phases.append(phase)
+    opens = [m for m in range(1, len(phases)) if phases[m] in OPEN_PHASES and phases[m - 1] not in OPEN_PHASES]
+    next_open = []
+    for minute in range(len(phases)):
+        later = [m for m in opens if m > minute]
+        next_open.append(later[0] if later else None)
+    return phases, opens, next_open
+
+
+_PHASE_BY_MINUTE, SESSION_OPEN_MINUTES, _NEXT_OPEN_BY_MINUTE = _build_minute_tables()
+
+
+class TradingCalendar:
+    """
+    Trading days and session phases of the Vietnamese exchanges.
+    Everything is precomputed into per-day and per-minute tables, so every query is a couple of list lookups.
+    Times are epoch seconds (or anything convert_to_epoch accepts), default now. Days are ICT calendar days.
+    """
+
+    def __init__(self, holidays: Iterable[str] = HOLIDAYS, start: str = '2000-01-01', end: str = '2035-12-31'):
+        self._first_day = self._day_number(date.fromisoformat(start))
+        self._last_day = self._day_number(date.fromisoformat(end))
+        self._holidays = set()
+        self.add_holidays(holidays)
+
+    @staticmethod
+    def _day_number(d: date) -> int:
+        return (d - date(1970, 1, 1)).days
+
+    def add_holidays(self, holidays: Iterable[str]):
+        self._holidays.update(self._day_number(date.fromisoformat(h)) for h in holidays)
+        n = self._last_day - self._first_day + 1
+        trading = [False] * n
+        for i in range(n):
+            day = self._first_day + i
+            # 1970-01-01 was a Thursday, (day + 3) % 7 is the ISO weekday - 1
+            trading[i] = (day + 3) % 7 < 5 and day not in self._holidays
+        previous, following = [None] * n, [None] * n
+        last = None
+        for i in range(n):
+            last = i if trading[i] else last
+            previous[i] = last
+        last = None
+        for i in range(n - 1, -1, -1):
+            last = i if trading[i] else last
+            following[i] = last
+        self._trading, self._previous, self._following = trading, previous, following
+
+    def _split(self, t: TimeInput):
+        if t is None:
+            t = time.time()
+        epoch = int(t) if isinstance(t, float) else convert_to_epoch(t)
+        day, second = divmod(epoch + ICT_OFFSET, DAY_SECONDS)
+        i = day - self._first_day
+        if not 0 <= i < len(self._trading):
+            raise ValueError(f"{t} is outside the calendar range")
+        return i, second
+
+    def _epoch(self, i: int, minute: int) -> int:
+        return (self._first_day + i) * DAY_SECONDS + minute * 60 - ICT_OFFSET
+
+    def _date(self, i: int) -> str:
+        return (date(1970, 1, 1) + timedelta(days=self._first_day + i)).isoformat()
+
+    def is_trading_day(self, t: TimeInput = None) -> bool:
+        i, _ = self._split(t)
+        return self._trading[i]
+
+    def session_phase(self, t: TimeInput = None) -> str:
+        """
+        :return: a SessionPhase value, always SessionPhase.CLOSED on weekends and holidays.
+        """
+        i, second = self._split(t)
+        if not self._trading[i]:
+            return SessionPhase.CLOSED
+        return _PHASE_BY_MINUTE[second // 60]
+
+    def is_market_open(self, t: TimeInput = None) -> bool:
+        """
+        :return: True while orders are matched (ATO, continuous, ATC and the put-through window),
+        i.e. while prices, deals and foreign flows can change.
+        """
+        return self.session_phase(t) in OPEN_PHASES
+
+    def next_session_open(self, t: TimeInput = None) -> int:
+        """
+        :return: epoch of the first session opening strictly after t, the morning or afternoon session.
+        """
+        i, second = self._split(t)
+        if self._trading[i]:
+            minute = _NEXT_OPEN_BY_MINUTE[second // 60]
+            if minute is not None:
+                return self._epoch(i, minute)
+        following = self._following[i + 1] if i + 1 < len(self._following) else None
+        if following is None:
+            raise ValueError(f"No trading day after {t} in the calendar range")
+        return self._epoch(following, SESSION_OPEN_MINUTES[0])
+
+    def last_completed_trading_day(self, t: TimeInput = None) -> str:
+        """
+        :return: the latest trading day (YYYY-MM-DD) whose sessions have all ended at t.
+        """
+        i, second = self._split(t)
+        if self._trading[i] and second >= MARKET_CLOSE_MINUTE * 60:
+            return self._date(i)
+        previous = self._previous[i - 1] if i > 0 else None
+        if previous is None:
+            raise ValueError(f"No trading day before {t} in the calendar range")
+        return self._date(previous)
+
+    def trading_days(self, from_date: str, to_date: str) -> List[str]:
+        """
+        :return: trading days between two dates, both included.
+        """
+        start = self._day_number(date.fromisoformat(from_date)) - self._first_day
+        end = self._day_number(date.fromisoformat(to_date)) - self._first_day
+        return [self._date(i) for i in range(max(start, 0), min(end, len(self._trading) - 1) + 1) if self._trading[i]]
+
+    def valid_until(self, t: TimeInput = None) -> Optional[int]:
+        """
+        :return: None while the market is open, otherwise the epoch until which market data cannot change.
+        """
+        if self.is_market_open(t):
+            return None
+        return self.next_session_open(t)
+
+
+DEFAULT_CALENDAR = TradingCalendar()
+
+
+def is_market_open(t: TimeInput = None) -> bool:
+    return DEFAULT_CALENDAR.is_market_open(t)
+
+
+def session_phase(t: TimeInput = None) -> str:
+    return DEFAULT_CALENDAR.session_phase(t)
+
+
+def next_session_open(t: TimeInput = None) -> int:
+    return DEFAULT_CALENDAR.next_session_open(t)
+
+
+def last_completed_trading_day(t: TimeInput = None) -> str:
+    return DEFAULT_CALENDAR.last_completed_trading_day(t)
@@ -0,0 +1,561 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+from pyvietstock.trading_calendar import DEFAULT_CALENDAR, TradingCalendar
+
+TOKEN_FIELD = '__RequestVerificationToken'
+DEFAULT_ARCHIVE_DIR = '.cache/archive'
+DEFAULT_CACHE_TTL = 30
+DEFAULT_TIMEOUT = 30  # seconds, requests without a timeout can hang forever on a stalled connection
+# endpoints whose data only changes while the market is open: quotes, deals, price history and trading statistics
+MARKET_DATA_PATHS = frozenset(path.lower() for path in (
+    '/tvnew/history',
+    '/company/tradinginfo',
+    '/data/getmarketprice',
+    '/data/getstockdealdetail',
+    '/data/StatisticByDate',
+    '/data/StatisticByPeriod',
+))
+
+
+def normalize_params(params: Union[Dict, None]) -> Dict:
+    """
+    Normalizes request parameters so that equivalent requests produce the same key.
+    The verification token is dropped, None values are removed (requests does not send them)
+    and every value is converted to a string.
+    """
+    if not params:
+        return {}
+    normalized = {}
+    for key, value in params.items():
+        if key == TOKEN_FIELD or value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            normalized[key] = [str(v) for v in value]
+        else:
+            normalized[key] = str(value)
+    return dict(sorted(normalized.items()))
+
+
+def request_key(method: str, url: str, params: Union[Dict, None] = None, data: Union[Dict, None] = None) -> str:
+    """
+    :return: a stable hash of the endpoint and its normalized parameters.
+    """
+    raw = json.dumps({
+        'method': method.upper(),
+        'url': url,
+        'params': normalize_params(params),
+        'data': normalize_params(data),
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class ArchivedResponse:
+    """
+    Minimal stand-in for requests.Response, served from a response archive.
+    When created with a path, the gzip file is only read on access, and iter_content() decompresses it chunk by chunk.
+    """
+
+    from_cache = False  # set on responses served by CachingTransport
+
+    def __init__(self, status_code: int, content: Optional[bytes], url: Optional[str] = None, path: Optional[str] = None):
+        self.status_code = status_code
+        self._content = content
+        self.url = url
+        self.path = path
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            with gzip.open(self.path, 'rb') as f:
+                self._content = f.read()
+        return self._content
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start:start + chunk_size]
+            return
+        with gzip.open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class ArchiveMissError(KeyError):
+    pass
+
+
+class Transport:
+    """
+    Sends HTTP requests on behalf of VietStockFinance. Subclasses must implement request().
+    """
+
+    def request(self, method: str, url: str, headers=None, params=None, data=None, stream: bool = False):
+        """
+        :param stream: if True the body may be consumed incrementally with response.iter_content().
+        """
+        raise NotImplementedError()
+
+    def get(self, url: str, headers=None, params=None, stream: bool = False):
+        return self.request('GET', url, headers=headers, params=params, stream=stream)
+
+    def post(self, url: str, headers=None, params=None, data=None, stream: bool = False):
+        return self.request('POST', url, headers=headers, params=params, data=data, stream=stream)
+
+
+class RequestsTransport(Transport):
+    def __init__(self, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        return requests.request(method, url, headers=headers, params=params, data=data, stream=stream,
+                                timeout=self.timeout)
+
+
+class SessionTransport(Transport):
+    """
+    HTTP/1.1 over a requests.Session, keeping up to pool_size connections per host alive between calls.
+    """
+
+    def __init__(self, pool_size: int = 32, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        return self.session.request(method, url, headers=headers, params=params, data=data, stream=stream,
+                                    timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class _HTTPXResponse:
+    """
+    Adapts an httpx.Response to the subset of requests.Response used by the library.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.url = str(response.url)
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self._response.encoding or 'utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        return self._response.iter_bytes(chunk_size)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._response.close()
+
+
+# connection-specific headers are not allowed over HTTP/2, the host is sent as the :authority pseudo-header
+_HOP_BY_HOP_HEADERS = frozenset({'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade', 'host'})
+
+
+class HTTP2Transport(Transport):
+    """
+    Multiplexes concurrent calls over one HTTP/2 connection per host with httpx (pip install pyvietstock[http2]).
+    The client is thread-safe, so one instance can serve a whole thread pool.
+    """
+
+    def __init__(self, max_connections: int = 4, http2: bool = True, timeout: Optional[float] = DEFAULT_TIMEOUT):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HTTP2Transport requires httpx: pip install pyvietstock[http2]")
+        self.client = httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections), timeout=timeout)
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        headers = {k: v for k, v in (headers or {}).items() if k.lower() not in _HOP_BY_HOP_HEADERS}
+        request = self.client.build_request(method, url, headers=headers, params=params, data=data)
+        response = self.client.send(request, stream=stream)
+        return _HTTPXResponse(response)
+
+    def close(self):
+        self.client.close()
+
+
+class FakeTransport(Transport):
+    """
+    In-memory transport for tests and offline development. Responses are registered per method and URL,
+    optionally for exact parameters, and every request is kept in calls.
+    Unregistered requests get a 404 response.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Union[str, Tuple[str, str]], Tuple[int, Union[bytes, Callable]]] = {}
+        self.calls = []
+
+    def add(self, url: str, body, method: str = 'POST', status_code: int = 200, params=None, data=None):
+        """
+        :param body: bytes, str, a JSON-serializable object, or a callable(method, url, params, data)
+        returning one of those.
+        :param params: if params or data are given, the response only matches these exact parameters.
+        """
+        key = request_key(method, url, params, data) if params or data else (method.upper(), url)
+        self._routes[key] = (status_code, body)
+        return self
+
+    @staticmethod
+    def _encode(body) -> bytes:
+        if isinstance(body, bytes):
+            return body
+        if isinstance(body, str):
+            return body.encode('utf-8')
+        return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        self.calls.append((method.upper(), url, params, data))
+        route = self._routes.get(request_key(method, url, params, data)) or self._routes.get((method.upper(), url))
+        if route is None:
+            return ArchivedResponse(404, b'', url)
+        status_code, body = route
+        if callable(body):
+            body = body(method, url, params, data)
+        return ArchivedResponse(status_code, self._encode(body), url)
+
+
+BACKENDS = {
+    'requests': RequestsTransport,
+    'session': SessionTransport,
+    'http2': HTTP2Transport,
+    'fake': FakeTransport,
+}
+
+
+def make_transport(backend: str, **kwargs) -> Transport:
+    """
+    :param backend: one of BACKENDS: requests, session (pooled HTTP/1.1), http2 or fake.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown transport backend {backend}, expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[backend](**kwargs)
+
+
+class ResponseArchive:
+    """
+    On-disk archive of raw responses. Bodies are gzip compressed and stored under
+    <root>/<key[:2]>/<key>.json.gz, an append-only index.jsonl describes every entry.
+    """
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json.gz")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put(self, key: str, method: str, url: str, params, data, response):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+
+        entry = {
+            'key': key,
+            'method': method.upper(),
+            'url': url,
+            'params': normalize_params(params),
+            'data': normalize_params(data),
+            'status_code': response.status_code,
+            'recorded_at': int(time.time()),
+        }
+        with self._lock:
+            with open(os.path.join(self.root, 'index.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def get(self, key: str, url: Optional[str] = None, stream: bool = False) -> ArchivedResponse:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise ArchiveMissError(f"No archived response for {url or key}")
+        response = ArchivedResponse(200, None, url, path)
+        if not stream:
+            response.content  # read now, so a replay does not depend on the file staying in place
+        return response
+
+    def index(self):
+        """
+        :return: a dict of key -> latest index entry.
+        """
+        entries = {}
+        path = os.path.join(self.root, 'index.jsonl')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries[entry['key']] = entry
+        return entries
+
+
+class RecordingTransport(Transport):
+    """
+    Forwards requests to the inner transport and writes every successful response to the archive.
+    """
+
+    def __init__(self, archive: Union[ResponseArchive, str] = DEFAULT_ARCHIVE_DIR, inner: Optional[Transport] = None):
+        self.archive = archive if isinstance(archive, ResponseArchive) else ResponseArchive(archive)
+        self.inner = inner or RequestsTransport()
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        # the whole body is read to archive it, so streaming does not save memory while recording
+        response = self.inner.request(method, url, headers=headers, params=params, data=data)
+        if response.status_code == 200:
+            key = request_key(method, url, params, data)
+            self.archive.put(key, method, url, params, data, response)
+        else:
+            logging.warning(f"Not recording {method} {url}: status {response.status_code}")
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses from the archive only, no network access is made.
+    Raises ArchiveMissError if a request was never recorded.
+    """
+
+    def __init__(self, archive: Union[ResponseArchive, str] = DEFAULT_ARCHIVE_DIR):
+        self.archive = archive if isinstance(archive, ResponseArchive) else ResponseArchive(archive)
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        return self.archive.get(request_key(method, url, params, data), url, stream)
+
+
+class SharedResponse:
+    """
+    Response shared by coalesced callers: the body is decoded once and every caller gets the same result,
+    which must therefore be treated as read-only.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._decoded = None
+        self._decoded_ready = False
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def json(self):
+        with self._lock:
+            if not self._decoded_ready:
+                self._decoded = self._response.json()
+                self._decoded_ready = True
+        return self._decoded
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs a function at most once per key at a time. Callers arriving while a call for the same key is in
+    flight wait for it and share its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+
+class CoalescingTransport(Transport):
+    """
+    De-duplicates concurrent identical requests: calls with the same method, endpoint and normalized
+    parameters that overlap in time share one upstream request and one decoded result.
+    Streaming requests are passed through, their body can only be consumed once.
+    """
+
+    def __init__(self, inner: Optional[Transport] = None):
+        self.inner = inner or RequestsTransport()
+        self.single_flight = SingleFlight()
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        if stream:
+            return self.inner.request(method, url, headers=headers, params=params, data=data, stream=True)
+        return self.single_flight.do(
+            request_key(method, url, params, data),
+            lambda: SharedResponse(self.inner.request(method, url, headers=headers, params=params, data=data))
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: upstream calls made, calls served by joining one in flight, and calls in flight now.
+        """
+        return self.single_flight.stats()
+
+
+class CachingTransport(Transport):
+    """
+    Keeps successful responses in memory. Market data is cached for ttl seconds while the market is open,
+    and while it is closed until the next session opens, since it cannot change in between.
+    Other endpoints (news, events, documents...) are cached for ttl seconds.
+    """
+
+    def __init__(
+            self,
+            inner: Optional[Transport] = None,
+            ttl: float = DEFAULT_CACHE_TTL,
+            calendar: Optional[TradingCalendar] = None,
+            market_paths: Iterable[str] = MARKET_DATA_PATHS,
+            max_entries: int = 10000,
+            ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param ttl: seconds a response is reused for.
+        :param calendar: trading calendar deciding when market data can change, DEFAULT_CALENDAR by default.
+        :param market_paths: lower case URL paths of the market data endpoints.
+        :param max_entries: the oldest entries are dropped beyond this size.
+        :param ttls: ttl overrides by lower case URL path, e.g. a longer one for news.
+        """
+        self.inner = inner or RequestsTransport()
+        self.ttl = ttl
+        self.calendar = calendar or DEFAULT_CALENDAR
+        self.market_paths = frozenset(market_paths)
+        self.max_entries = max_entries
+        self.ttls = {path.lower(): seconds for path, seconds in (ttls or {}).items()}
+        self._entries: Dict[str, Tuple[float, float, bytes]] = {}  # key -> (fetched at, expires at, content)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def expires_at(self, url: str, now: float) -> float:
+        """
+        Market data fetched while the market is closed is what it will be at the next open,
+        so its ttl only starts running then.
+        """
+        path = urlparse(url).path.lower()
+        ttl = self.ttls.get(path, self.ttl)
+        if path in self.market_paths:
+            valid_until = self.calendar.valid_until(now)
+            if valid_until is not None:
+                return valid_until + ttl
+        return now + ttl
+
+    def put(self, key: str, url: str, content: bytes, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now, self.expires_at(url, now), content)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def lookup(self, key: str, now: Optional[float] = None) -> Optional[Tuple[float, float, bytes]]:
+        """
+        :return: (fetched at, expires at, content) of a fresh entry, or None.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                return None
+            return entry
+
+    def request(self, method, url, headers=None, params=None, data=None, stream=False):
+        if stream:
+            return self.inner.request(method, url, headers=headers, params=params, data=data, stream=True)
+        key = request_key(method, url, params, data)
+        entry = self.lookup(key)
+        if entry is not None:
+            self.hits += 1
+            response = ArchivedResponse(200, entry[2], url)
+            response.from_cache = True
+            return response
+        self.misses += 1
+        response = self.inner.request(method, url, headers=headers, params=params, data=data)
+        if response.status_code == 200:
+            self.put(key, url, response.content)
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
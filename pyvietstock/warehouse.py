@@ -0,0 +1,284 @@
+import dataclasses
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from pyvietstock.schema import BondRelated, CompanyEvent, Document, EventTransferData, NewsArticle
+from pyvietstock.utils import to_time_s
+
+DEFAULT_WAREHOUSE_PATH = '.cache/warehouse.sqlite'
+DEFAULT_SINCE = '2000-01-01'
+
+
+class Table(NamedTuple):
+    """
+    How a record type is stored: its natural key, and the fields used as date and type in the indexes.
+    Every table also gets a symbol and a sortable date column.
+    """
+    record_type: type
+    key: str
+    date: str
+    type: Optional[str] = None
+
+
+TABLES: Dict[str, Table] = {
+    'event_transfers': Table(EventTransferData, 'event_id', 'date_action_from', 'transfer_type_id'),
+    'company_events': Table(CompanyEvent, 'event_id', 'gdkhq_date', 'event_type_id'),
+    'news': Table(NewsArticle, 'article_id', 'publish_time', 'channel_id'),
+    'documents': Table(Document, 'file_info_id', 'last_update'),
+    'bonds': Table(BondRelated, 'bond_code', 'release_date', 'interest_rate_type'),
+}
+
+# datasets whose pages merge one page per type, and the field telling the types apart
+_MERGED_BY = {'company_events': 'event_type_id', 'news': 'channel_id'}
+
+_SQL_TYPES = {int: 'INTEGER', float: 'REAL', bool: 'INTEGER'}
+_DMY = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})')
+
+
+def _sortable_date(value) -> Optional[str]:
+    """
+    Normalizes the date formats found in Vietstock records to "YYYY-MM-DD HH:MM:SS" so they sort as text.
+    """
+    if value is None or value == '':
+        return None
+    value = str(value)
+    if value.startswith('/Date('):
+        return to_time_s(value)
+    match = _DMY.match(value)
+    if match:
+        day, month, year = match.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return value
+
+
+def _columns(record_type: type) -> List[str]:
+    return [f.name for f in dataclasses.fields(record_type)]
+
+
+def _sql_type(annotation) -> str:
+    return _SQL_TYPES.get(annotation, 'TEXT')
+
+
+def _fetch_page(vf, dataset: str, symbol: str, page: int, page_size: int, since: str):
+    if dataset == 'event_transfers':
+        return vf.event_transfer_data(symbol, f_date=since, t_date=datetime.now().strftime('%Y-%m-%d'),
+                                      page=page, page_size=page_size)
+    if dataset == 'company_events':
+        return vf.events_by_type(symbol, from_date=since, page=page, page_size=page_size)
+    if dataset == 'news':
+        return vf.news_by_code(symbol, page=page, page_size=page_size)
+    if dataset == 'documents':
+        return vf.documents(symbol, page=page)
+    if dataset == 'bonds':
+        return vf.bond_related(symbol, page=page, page_size=page_size)
+    raise ValueError(f"Unknown dataset {dataset}, expected one of {', '.join(TABLES)}")
+
+
+class Warehouse:
+    """
+    Embedded SQLite warehouse for events, insider transfers, news, documents and bonds.
+    Records are upserted by their natural ID and indexed by symbol, date and type, so ad-hoc questions
+    run locally. Syncs fetch newest-first and stop once every type of record has reached rows that are already stored.
+    """
+
+    def __init__(self, path: str = DEFAULT_WAREHOUSE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.connection:
+            for name, table in TABLES.items():
+                fields = dataclasses.fields(table.record_type)
+                columns = [f"{f.name} {_sql_type(f.type)}" for f in fields if f.name != 'symbol']
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} (symbol TEXT, date TEXT, synced_at INTEGER, "
+                    f"{', '.join(columns)}, PRIMARY KEY ({table.key}))"
+                )
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name}_symbol_date ON {name} (symbol, date)")
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name}_date ON {name} (date)")
+                if table.type:
+                    self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name}_type ON {name} ({table.type}, date)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS symbols (symbol TEXT PRIMARY KEY, exchange TEXT, cat_id INTEGER, "
+                "company_name TEXT, status TEXT, updated_at INTEGER)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS symbols_cat_id ON symbols (cat_id)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state (dataset TEXT, symbol TEXT, synced_at INTEGER, rows INTEGER, "
+                "PRIMARY KEY (dataset, symbol))"
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def upsert(self, dataset: str, symbol: str, records: Iterable) -> int:
+        """
+        Inserts or replaces records (dataclasses or lazy views) of one dataset fetched for symbol.
+        Records without a natural ID are skipped.
+        :return: number of rows written.
+        """
+        table = TABLES[dataset]
+        fields = [c for c in _columns(table.record_type) if c != 'symbol']
+        has_symbol = 'symbol' in _columns(table.record_type)
+        columns = ['symbol', 'date', 'synced_at'] + fields
+        now = int(time.time())
+        rows = []
+        for record in records:
+            if getattr(record, table.key) is None:
+                continue
+            record_symbol = (getattr(record, 'symbol') if has_symbol else None) or symbol
+            rows.append([record_symbol.upper(), _sortable_date(getattr(record, table.date)), now] +
+                        [getattr(record, c) for c in fields])
+        updates = ', '.join(f"{c} = excluded.{c}" for c in columns if c != table.key)
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO {dataset} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({table.key}) DO UPDATE SET {updates}",
+                rows
+            )
+        return len(rows)
+
+    def upsert_symbols(self, infos: Iterable):
+        """
+        Stores SymbolInfo records of the symbol master so queries can filter by exchange or industry.
+        """
+        columns = ['symbol', 'exchange', 'cat_id', 'company_name', 'status', 'updated_at']
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO symbols ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [[getattr(info, c) for c in columns] for info in infos]
+            )
+
+    def known_keys(self, dataset: str, symbol: str) -> Set:
+        table = TABLES[dataset]
+        cursor = self.connection.execute(f"SELECT {table.key} FROM {dataset} WHERE symbol = ?", (symbol.upper(),))
+        return {row[0] for row in cursor}
+
+    def last_synced(self, dataset: str, symbol: str) -> Optional[int]:
+        row = self.connection.execute(
+            "SELECT synced_at FROM sync_state WHERE dataset = ? AND symbol = ?", (dataset, symbol.upper())
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(
+            self,
+            vf,
+            dataset: str,
+            symbols: Iterable[str],
+            since: Optional[str] = None,
+            page_size: int = 20,
+            max_pages: int = 50,
+            full: bool = False,
+            max_workers: int = 8,
+    ) -> Dict[str, int]:
+        """
+        Fetches a dataset for every symbol concurrently and writes the rows that are not stored yet.
+        Pages are read newest first until a page is empty or every type on it (event type, news channel...)
+        has reached an already stored row.
+        :param vf: VietStockFinance instance in the dataclass or lazy result mode.
+        :param since: start date (YYYY-MM-DD) for the datasets with a date filter, default everything.
+        :param full: re-read every page and upsert all rows instead of stopping at stored ones.
+        :return: symbol -> number of rows written, failed symbols are left out.
+        """
+        symbols = [s.upper() for s in symbols]
+        known = {s: set() if full else self.known_keys(dataset, s) for s in symbols}
+        key, merged_by = TABLES[dataset].key, _MERGED_BY.get(dataset)
+
+        def type_of(record):
+            return getattr(record, merged_by) if merged_by else None
+
+        def fetch(symbol):
+            new, caught_up = [], set()
+            try:
+                for page in range(1, max_pages + 1):
+                    batch = _fetch_page(vf, dataset, symbol, page, page_size, since or DEFAULT_SINCE) or []
+                    if not batch:
+                        break
+                    new.extend(r for r in batch if getattr(r, key) not in known[symbol])
+                    # merged pages (events_by_type, news_by_code) hold one page per type: a type is caught up
+                    # at its first stored row, the others keep paging
+                    types = {type_of(r) for r in batch}
+                    caught_up.update(type_of(r) for r in batch if getattr(r, key) in known[symbol])
+                    if types <= caught_up:
+                        break
+            except Exception as e:
+                logging.warning(f"Warehouse: {dataset} sync failed for {symbol}: {e}")
+                return symbol, None
+            return symbol, new
+
+        written = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for symbol, records in executor.map(fetch, symbols):
+                if records is None:
+                    continue
+                written[symbol] = self.upsert(dataset, symbol, records)
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO sync_state (dataset, symbol, synced_at, rows) VALUES (?, ?, ?, ?)",
+                        (dataset, symbol, int(time.time()), written[symbol])
+                    )
+        logging.info(f"Warehouse: {dataset}: {sum(written.values())} new rows for {len(written)} symbols")
+        return written
+
+    def query(self, sql: str, params: Sequence = ()) -> List[dict]:
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def select(
+            self,
+            dataset: str,
+            symbols: Optional[Iterable[str]] = None,
+            from_date: Optional[str] = None,
+            to_date: Optional[str] = None,
+            types: Optional[Iterable] = None,
+            cat_id: Optional[int] = None,
+            exchange: Optional[str] = None,
+            limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Rows of a dataset filtered on the indexed columns, newest first.
+        :param types: values of the table type column, e.g. transfer_type_id for event_transfers.
+        :param cat_id: industry, requires the symbols table (upsert_symbols).
+        :param exchange: exchange, requires the symbols table (upsert_symbols).
+        """
+        table = TABLES[dataset]
+        where, params = [], []
+        if symbols is not None:
+            symbols = [s.upper() for s in symbols]
+            where.append(f"t.symbol IN ({', '.join('?' * len(symbols))})")
+            params.extend(symbols)
+        if from_date is not None:
+            where.append("t.date >= ?")
+            params.append(from_date)
+        if to_date is not None:
+            where.append("t.date < ?")
+            params.append(to_date)
+        if types is not None and table.type:
+            types = list(types)
+            where.append(f"t.{table.type} IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        join = ''
+        if cat_id is not None or exchange is not None:
+            join = 'JOIN symbols s ON s.symbol = t.symbol'
+            if cat_id is not None:
+                where.append("s.cat_id = ?")
+                params.append(cat_id)
+            if exchange is not None:
+                where.append("s.exchange = ?")
+                params.append(exchange)
+        sql = f"SELECT t.* FROM {dataset} t {join}"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY t.date DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self.query(sql, params)
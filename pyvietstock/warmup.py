@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from pyvietstock.trading_calendar import DEFAULT_CALENDAR, TradingCalendar
+from pyvietstock.transport import CachingTransport
+
+DEFAULT_LEAD_TIME = 15 * 60
+
+# dataset name -> fetch(vf, symbol). Consumers hit the warm entries when they call with the same parameters.
+# Only market data endpoints: their entries stay valid until the open. Other datasets (e.g. news_by_code) expire
+# after their ttl, so warming them needs a CachingTransport ttl for their path longer than lead_time.
+DEFAULT_DATASETS: Dict[str, Callable] = {
+    'trading_info': lambda vf, symbol: vf.trading_info(symbol),
+    'historical_data': lambda vf, symbol: vf.historical_data(symbol),
+    'statistics_by_period': lambda vf, symbol: vf.statistics_by_period(symbol),
+}
+
+
+def find_cache(transport) -> Optional[CachingTransport]:
+    """
+    :return: the CachingTransport in a chain of wrapping transports (InstrumentedTransport, CoalescingTransport...)
+    following their inner attributes, or None.
+    """
+    seen = set()
+    while transport is not None and id(transport) not in seen:
+        if isinstance(transport, CachingTransport):
+            return transport
+        seen.add(id(transport))
+        transport = getattr(transport, 'inner', None)
+    return None
+
+
+class WarmupScheduler:
+    """
+    Pre-fetches datasets for watchlists into a CachingTransport during a window before each session opens,
+    so the first requests after the open are served from cache instead of all hitting the server at once.
+    """
+
+    def __init__(
+            self,
+            vf,
+            watchlists: Dict[str, Iterable[str]],
+            datasets: Optional[Dict[str, Callable]] = None,
+            max_workers: int = 8,
+            lead_time: float = DEFAULT_LEAD_TIME,
+            calendar: Optional[TradingCalendar] = None,
+    ):
+        """
+        :param vf: VietStockFinance instance whose transport is the CachingTransport shared with the consumers.
+        :param watchlists: watchlist name -> symbols.
+        :param datasets: dataset name -> fetch(vf, symbol), DEFAULT_DATASETS by default.
+        :param max_workers: number of requests in flight at once.
+        :param lead_time: seconds before the open at which the warm-up starts.
+        :param calendar: trading calendar, DEFAULT_CALENDAR by default.
+        """
+        self.cache = find_cache(vf._transport)
+        if self.cache is None:
+            logging.warning("WarmupScheduler: the client has no CachingTransport, warmed responses will not be kept")
+        self.vf = vf
+        self.watchlists = {name: [s.upper() for s in symbols] for name, symbols in watchlists.items()}
+        self.datasets = datasets or DEFAULT_DATASETS
+        self.max_workers = max_workers
+        self.lead_time = lead_time
+        self.calendar = calendar or DEFAULT_CALENDAR
+        self._status: Dict[Tuple[str, str], Tuple[float, Optional[str]]] = {}  # (dataset, symbol) -> (time, error)
+        self._lock = threading.Lock()
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted({s for symbols in self.watchlists.values() for s in symbols})
+
+    def _fetch(self, job: Tuple[str, str]):
+        dataset, symbol = job
+        error = None
+        try:
+            self.datasets[dataset](self.vf, symbol)
+        except Exception as e:
+            error = str(e)
+            logging.warning(f"WarmupScheduler: {dataset} failed for {symbol}: {e}")
+        with self._lock:
+            self._status[job] = (time.time(), error)
+
+    def warm(self) -> Dict[str, dict]:
+        """
+        Fetches every dataset for every watchlist symbol once, at most max_workers requests at a time.
+        :return: the freshness report after the warm-up.
+        """
+        jobs = [(dataset, symbol) for dataset in self.datasets for symbol in self.symbols]
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._fetch, jobs))
+        logging.info(f"WarmupScheduler: warmed {len(jobs)} requests in {time.time() - started:.1f}s")
+        return self.freshness()
+
+    def freshness(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """
+        :return: per dataset: number of symbols, how many were fetched and failed, and the age in seconds
+        of the oldest and newest successful fetch (None if there is none).
+        """
+        now = time.time() if now is None else now
+        symbols = self.symbols
+        report = {}
+        with self._lock:
+            for dataset in self.datasets:
+                statuses = [self._status.get((dataset, s)) for s in symbols]
+                fetched = [t for t, error in filter(None, statuses) if error is None]
+                report[dataset] = {
+                    'symbols': len(symbols),
+                    'fetched': len(fetched),
+                    'failed': sum(1 for status in statuses if status is not None and status[1] is not None),
+                    'oldest_age': now - min(fetched) if fetched else None,
+                    'newest_age': now - max(fetched) if fetched else None,
+                }
+        return report
+
+    def run(self, stop: Optional[threading.Event] = None, max_runs: Optional[int] = None):
+        """
+        Warms up once per session (morning and afternoon), lead_time seconds before it opens,
+        until stop is set or max_runs warm-ups were done. Starting inside a window warms up right away.
+        """
+        stop = stop or threading.Event()
+        runs = 0
+        while not stop.is_set() and (max_runs is None or runs < max_runs):
+            opens_at = self.calendar.next_session_open()
+            if stop.wait(max(0.0, opens_at - self.lead_time - time.time())):
+                break
+            self.warm()
+            runs += 1
+            stop.wait(max(0.0, opens_at - time.time()))
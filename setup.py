@@ -8,6 +8,17 @@ setup(
         'playwright==1.44.0',
         're==2.2.1'
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+        'numpy': ['numpy'],
+        'otel': ['opentelemetry-api'],
+        'http2': ['httpx[http2]'],
+    },
+    entry_points={
+        'console_scripts': [
+            'pyvietstock=pyvietstock.cli:main',
+        ],
+    },
     author='Kim T. Nguyen',
     author_email='kimnt93@gmail.com',
     description='Vietstock API for Python',
@@ -0,0 +1,46 @@
+import numpy as np
+
+from pyvietstock.adjust import AdjustmentEngine, _day_start, parse_action
+from pyvietstock.params import CorporateActionKind
+from pyvietstock.schema import CompanyEvent
+from pyvietstock.store import OHLCV_DTYPE
+
+
+def _event(event_id, title, ex_date='2025-06-10 00:00:00'):
+    return CompanyEvent('FPT', event_id, 1, 0, '', 0, ex_date, ex_date, ex_date, '', title, 'HOSE', title, '', '', '', 1)
+
+
+def _bars(close, ex_date='2025-06-10'):
+    bars = np.zeros(1, dtype=OHLCV_DTYPE)
+    bars['time'] = _day_start(ex_date) - 86400
+    bars['close'] = close
+    return bars
+
+
+def test_share_issue_paying_stock_dividend_is_a_stock_dividend():
+    action = parse_action(_event(1, 'Phát hành thêm cổ phiếu trả cổ tức, tỷ lệ 100:15'))
+    assert action.kind == CorporateActionKind.STOCK_DIVIDEND
+    assert action.ratio == 0.15
+
+
+def test_rights_issue():
+    action = parse_action(_event(1, 'Phát hành thêm cổ phiếu, quyền mua tỷ lệ 10:1, giá 10.000 đồng'))
+    assert action.kind == CorporateActionKind.RIGHTS
+    assert (action.ratio, action.price) == (0.1, 10000)
+
+
+def test_cash_dividend_uses_thousand_vnd_bars_by_default():
+    engine = AdjustmentEngine(path=None)
+    assert engine.update('FPT', [_event(1, 'Trả cổ tức bằng tiền, 2.000 đồng/CP')], _bars(85.0))
+    price, _ = engine.factors('FPT', np.array([_day_start('2025-06-09')]))
+    assert np.isclose(price[0], (85000 - 2000) / 85000)
+
+
+def test_action_without_reference_close_is_computed_once_bars_exist():
+    engine = AdjustmentEngine(path=None)
+    events = [_event(1, 'Trả cổ tức bằng tiền, 2.000 đồng/CP')]
+    engine.update('FPT', events, None)
+    assert engine.actions('FPT') == []
+    assert engine.update('FPT', events, _bars(85.0))
+    assert engine.actions('FPT')[0].price_factor < 1.0
+    assert not engine.update('FPT', events, _bars(85.0))
@@ -0,0 +1,49 @@
+import dataclasses
+import math
+
+from pyvietstock.alerts import AlertEngine
+from pyvietstock.params import AlertKind
+from pyvietstock.schema import AlertRule, StockDealDetail, TradingInfo
+
+
+def _deal(price):
+    return StockDealDetail('2025-10-21 09:15:00', 'FPT', '', price, 100, 100, 0.0, 0.0, 'B', 0.0)
+
+
+def test_limit_rules_ignore_threshold_while_limits_are_unknown():
+    engine = AlertEngine([
+        AlertRule('ceiling', 'FPT', AlertKind.AT_CEILING, 0.0),
+        AlertRule('floor', 'FPT', AlertKind.AT_FLOOR, 1000.0),
+    ])
+    assert engine.on_deal(_deal(100.0)) == []
+    assert engine.evaluate('FPT', 100.0) == []
+    fired = engine.evaluate('FPT', 107.0, ceiling=107.0, floor=93.0)
+    assert [alert.rule_id for alert in fired] == ['ceiling']
+
+
+def test_limit_rules_use_limits_of_last_trading_info():
+    engine = AlertEngine([AlertRule('floor', 'FPT', AlertKind.AT_FLOOR, 0.0)])
+    info = TradingInfo(**{f.name: math.nan if f.type is float else None for f in dataclasses.fields(TradingInfo)})
+    info.symbol, info.last_price, info.ceiling_price, info.floor_price = 'FPT', 100.0, 107.0, 93.0
+    assert engine.on_trading_info(info) == []
+    assert [alert.rule_id for alert in engine.on_deal(_deal(93.0))] == ['floor']
+
+
+def test_index_stays_correct_across_removals_and_compaction():
+    engine = AlertEngine()
+    for i in range(3000):
+        engine.add(AlertRule(f'r{i}', f'S{i % 3}', AlertKind.CROSS_ABOVE, 100.0 + i % 7, once=i % 2 == 0))
+    for i in range(0, 3000, 5):
+        engine.remove(f'r{i}')
+    for symbol in ('S0', 'S1', 'S2'):
+        engine.evaluate(symbol, 90.0)
+    fired = {alert.rule_id for symbol in ('S0', 'S1', 'S2') for alert in engine.evaluate(symbol, 110.0)}
+    assert fired == {f'r{i}' for i in range(3000) if i % 5}
+    # once rules are spent, the others stay and fire again on the next crossing
+    assert len(engine) == len([i for i in range(3000) if i % 5 and i % 2])
+    assert len(engine._ids) == len(engine)  # compacted
+    for symbol in ('S0', 'S1', 'S2'):
+        engine.evaluate(symbol, 90.0)
+    fired = {alert.rule_id for symbol in ('S0', 'S1', 'S2') for alert in engine.evaluate(symbol, 110.0)}
+    assert fired == {f'r{i}' for i in range(3000) if i % 5 and i % 2}
+    assert engine.rule('r1').threshold == 101.0
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from pyvietstock.analytics import RollingCorrelation, align_closes, log_returns
+from pyvietstock.params import HistoricalResolution
+from pyvietstock.store import OHLCV_DTYPE, OHLCVStore
+from pyvietstock.trading_calendar import DEFAULT_CALENDAR, ICT_OFFSET
+
+DAYS = DEFAULT_CALENDAR.trading_days('2025-06-02', '2025-09-30')
+
+
+def _closes(seed=7, n=3):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.02, (len(DAYS), n))
+    steps[:, 1] += steps[:, 0]  # make two symbols correlated
+    return 100 * np.exp(np.cumsum(steps, axis=0))
+
+
+def _epoch(day):
+    return int(np.datetime64(day, 's').astype(np.int64)) - ICT_OFFSET
+
+
+def test_align_closes_places_bars_on_trading_days(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    bars = np.zeros(3, dtype=OHLCV_DTYPE)
+    bars['time'] = [_epoch('2025-08-29'), _epoch('2025-08-30'), _epoch('2025-09-04')]  # a Saturday in between
+    bars['close'] = [10.0, 11.0, 12.0]
+    store.append('FPT', bars, HistoricalResolution.ONE_DAY)
+
+    days, closes = align_closes(store, ['FPT', 'VNM'], '2025-08-29', '2025-09-04')
+    assert [str(d) for d in days.astype('datetime64[D]')] == ['2025-08-29', '2025-09-03', '2025-09-04']
+    np.testing.assert_array_equal(closes[:, 0], [10.0, np.nan, 12.0])
+    assert np.isnan(closes[:, 1]).all()
+
+
+def test_rolling_window_matches_numpy_on_the_last_window():
+    closes = _closes()
+    days = np.array(DAYS, dtype='datetime64[D]').astype(np.int64)
+    rolling = RollingCorrelation(['A', 'B', 'C'], window=30, min_periods=10)
+    for day, row in zip(days, closes):
+        rolling.update(int(day), row)
+    rolling.update(int(days[5]), closes[0] * 2)  # older days are ignored
+
+    window = log_returns(closes)[-30:]
+    np.testing.assert_allclose(rolling.correlation(), np.corrcoef(window, rowvar=False), atol=1e-9)
+    np.testing.assert_allclose(rolling.covariance(), np.cov(window, rowvar=False), atol=1e-12)
+    assert rolling.window_days() == DAYS[-30:]
+    assert [pair[:2] for pair in rolling.pairs(0.5)] == [('A', 'B')]
+
+    fitted = RollingCorrelation(['A', 'B', 'C'], window=30, min_periods=10).fit(days, closes)
+    np.testing.assert_allclose(fitted.correlation(), rolling.correlation(), atol=1e-9)
+
+
+def test_missing_returns_are_excluded_pairwise():
+    closes = _closes()
+    closes[10:40, 2] = np.nan
+    days = np.array(DAYS, dtype='datetime64[D]').astype(np.int64)
+    rolling = RollingCorrelation(['A', 'B', 'C'], window=len(DAYS), min_periods=20).fit(days, closes)
+    returns = log_returns(closes)
+    both = ~np.isnan(returns[:, 2])
+    assert rolling.correlation()[0, 2] == pytest.approx(np.corrcoef(returns[both, 0], returns[both, 2])[0, 1])
+    assert np.isnan(rolling.correlation()).sum() == 0
+    rolling.min_periods = both.sum() + 1
+    assert np.isnan(rolling.correlation()[0, 2]) and not np.isnan(rolling.correlation()[0, 1])
@@ -0,0 +1,56 @@
+import pyarrow as pa
+import pytest
+
+from pyvietstock.arrow import TIMESTAMP, record_batch, schema
+from pyvietstock.records import FIELDS, _REQUIRED, _buy_sell
+from pyvietstock.schema import HistoricalData
+
+SAMPLE_VALUES = {
+    pa.bool_(): True,
+    pa.int64(): 1,
+    pa.float64(): 1.5,
+    pa.string(): 'x',
+    TIMESTAMP: '/Date(1717002000000)/',
+}
+
+TIMED_TYPES = [
+    record_type for record_type in FIELDS
+    if any(f.type == TIMESTAMP for f in schema(record_type)) and not isinstance(next(iter(FIELDS[record_type].values())).key, int)
+]
+
+
+def _item(record_type, time_value):
+    """
+    A decoded JSON item with a sample value for every field, time_value for every timestamp field
+    (a missing key when time_value is ...).
+    """
+    item = {}
+    for arrow_field in schema(record_type):
+        field = FIELDS[record_type][arrow_field.name]
+        if arrow_field.type == TIMESTAMP:
+            if time_value is ... and field.default is not _REQUIRED:
+                continue
+            item[field.key] = None if time_value is ... else time_value
+        elif field.convert is _buy_sell:
+            item[field.key] = True
+        else:
+            item[field.key] = SAMPLE_VALUES.get(arrow_field.type, 'x')
+    return item
+
+
+@pytest.mark.parametrize('record_type', TIMED_TYPES, ids=lambda t: t.__name__)
+@pytest.mark.parametrize('time_value', [None, '', 'not a date', ...], ids=['null', 'empty', 'unparseable', 'missing'])
+def test_null_timestamps_stay_null(record_type, time_value):
+    batch = record_batch(record_type, [_item(record_type, '/Date(1717002000000)/'), _item(record_type, time_value)])
+    assert batch.schema == schema(record_type)
+    for arrow_field in schema(record_type):
+        if arrow_field.type == TIMESTAMP:
+            column = batch.column(arrow_field.name)
+            assert column[0].value == 1717002000000
+            assert not column[1].is_valid
+
+
+def test_historical_data_null_time():
+    batch = record_batch(HistoricalData, [[1717002000, 1.0, 2.0, 0.5, 1.5, 100.0], [None, 1.0, 2.0, 0.5, 1.5, 100.0]])
+    assert batch.column('time')[0].value == 1717002000000
+    assert not batch.column('time')[1].is_valid
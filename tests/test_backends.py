@@ -0,0 +1,74 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+
+from pyvietstock.transport import BACKENDS, FakeTransport, make_transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.server.peers.append(self.client_address)
+        form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+        body = json.dumps([{'code': form['code'][0], 'page': n} for n in range(50)]).encode()
+        self.send_response(200 if form['code'][0] != 'BAD' else 500)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.peers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('backend', ['requests', 'session', 'http2'])
+def test_network_backends_return_the_same_responses(server, backend):
+    url = f'http://127.0.0.1:{server.server_address[1]}/data/test'
+    transport = make_transport(backend, timeout=5)
+    response = transport.post(url, headers={'Connection': 'keep-alive'}, data={'code': 'FPT'})
+    assert response.status_code == 200 and response.json()[49] == {'code': 'FPT', 'page': 49}
+
+    streamed = transport.post(url, data={'code': 'VNM'}, stream=True)
+    assert json.loads(b''.join(streamed.iter_content(chunk_size=100))) == \
+        [{'code': 'VNM', 'page': n} for n in range(50)]
+    streamed.close()
+
+    with pytest.raises(requests.HTTPError):
+        transport.post(url, data={'code': 'BAD'}).raise_for_status()
+
+
+def test_session_backend_reuses_its_connection(server):
+    url = f'http://127.0.0.1:{server.server_address[1]}/data/test'
+    transport = make_transport('session', pool_size=2)
+    for code in ('FPT', 'VNM', 'HPG'):
+        assert transport.post(url, data={'code': code}).status_code == 200
+    transport.close()
+    assert len(set(server.peers)) == 1
+
+
+def test_fake_backend_matches_exact_parameters_first():
+    fake = make_transport('fake')
+    assert isinstance(fake, FakeTransport) and set(BACKENDS) == {'requests', 'session', 'http2', 'fake'}
+    fake.add('http://x.test/a', {'any': True}).add('http://x.test/a', 'exact', data={'code': 'FPT', 'page': 1})
+    assert fake.post('http://x.test/a', data={'page': '1', 'code': 'FPT'}).content == b'exact'
+    assert fake.post('http://x.test/a', data={'code': 'VNM'}).json() == {'any': True}
+    assert fake.get('http://x.test/a').status_code == 404
+    assert fake.calls[-1] == ('GET', 'http://x.test/a', None, None)
+    with pytest.raises(ValueError):
+        make_transport('curl')
@@ -0,0 +1,69 @@
+from pyvietstock.bars import BarAggregator
+from pyvietstock.schema import StockDealDetail
+
+
+def _deal(time, price, vol, total_vol):
+    return StockDealDetail(time, 'FPT', '', price, vol, total_vol, 0.0, 0.0, 'B', 0.0)
+
+
+def test_total_vol_watermark_resets_on_new_day():
+    aggregator = BarAggregator(['FPT'], intervals=(1,))
+    aggregator.update(_deal('2025-10-20 14:29:00', 100.0, 1000, 1_000_000))
+    assert aggregator.update(_deal('2025-10-20 14:29:10', 100.0, 10, 1_000_000)) == []  # already seen
+
+    completed = aggregator.update(_deal('2025-10-21 09:15:00', 101.0, 500, 500))
+    assert [bar.close for bar in completed] == [100.0]
+    bar = aggregator.current('FPT', 1)
+    assert (bar.open, bar.volume) == (101.0, 500)
+
+    aggregator.update(_deal('2025-10-21 09:15:20', 102.0, 200, 700))
+    assert aggregator.current('FPT', 1).volume == 700
+
+
+def test_update_many_orders_deals_by_day():
+    aggregator = BarAggregator(['FPT'], intervals=(1,))
+    aggregator.update_many([
+        _deal('2025-10-21 09:15:00', 101.0, 500, 500),
+        _deal('2025-10-20 14:29:00', 100.0, 1000, 1_000_000),
+    ])
+    assert aggregator.current('FPT', 1).close == 101.0
+
+
+def _ticks():
+    ticks, total = [], 0
+    for j in range(40):
+        total += 10 + j
+        ticks.append(StockDealDetail(f'2025-10-21 09:{15 + j // 6:02d}:{(j % 6) * 10:02d}', 'FPT' if j % 3 else 'VNM',
+                                     '', 100.0 + j % 7, 10 + j, total, 0.0, 0.0, 'B' if j % 2 else 'S', 0.0))
+    return ticks
+
+
+def _key(bar):
+    return bar.symbol, bar.interval, bar.time, bar.open, bar.high, bar.low, bar.close, bar.volume, bar.buy_volume
+
+
+def test_update_many_matches_tick_by_tick_updates():
+    ticks = _ticks()
+    one_by_one = BarAggregator(intervals=(1, 5))
+    single = [bar for tick in ticks for bar in one_by_one.update(tick)]
+    batched = BarAggregator(intervals=(1, 5))
+    # newest first, and a repeated poll holding deals that were already applied
+    many = batched.update_many(ticks[:25][::-1]) + batched.update_many(ticks[::-1])
+    assert sorted(map(_key, many)) == sorted(map(_key, single))
+    for symbol in ('FPT', 'VNM'):
+        for interval in (1, 5):
+            assert _key(batched.current(symbol, interval)) == _key(one_by_one.current(symbol, interval))
+    assert batched.update_many(ticks) == []
+
+
+def test_bar_is_emitted_by_the_next_tick_or_by_flush_once_its_interval_ended():
+    emitted = []
+    aggregator = BarAggregator(['FPT'], intervals=(1,), on_bar=emitted.append)
+    aggregator.update(_deal('2025-10-21 09:15:00', 100.0, 10, 10))
+    assert aggregator.flush('2025-10-21 09:15:59') == [] and emitted == []
+    bars = aggregator.flush('2025-10-21 09:16:00')
+    assert [bar.close for bar in bars] == [100.0] and emitted == bars
+    assert aggregator.current('FPT', 1) is None
+    aggregator.update(_deal('2025-10-21 09:16:30', 101.0, 5, 15))
+    assert [bar.open for bar in aggregator.update(_deal('2025-10-21 09:17:00', 102.0, 5, 20))] == [101.0]
+    assert len(emitted) == 2
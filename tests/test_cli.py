@@ -0,0 +1,33 @@
+import csv
+import pickle
+
+from pyvietstock.cli import build_parser, export_partition, fetch_raw
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.transport import FakeTransport
+
+BASE_URLS = ('http://api.test', 'http://finance.test')
+
+
+def bond(i):
+    return {'StockCode': 'FPT', 'BondCode': f'FPT{i:03d}', 'ReleaseDate': '/Date(1700000000000)/', 'FaceValue': 100000}
+
+
+def test_export_builds_records_from_raw_responses(tmp_path):
+    pages = {1: [bond(i) for i in range(2)], 2: [bond(2)]}
+    transport = FakeTransport().add(f'{BASE_URLS[1]}/Data/GetBondRelated',
+                                    lambda method, url, params, data: pages.get(data['page'], []))
+    args = build_parser().parse_args(['export', 'bonds', '--symbols', 'FPT', '--page-size', '2', '--format', 'csv'])
+    vf = VietStockFinance(transport, *BASE_URLS).set_session({}, 'token')
+
+    responses = fetch_raw(vf, 'bonds', 'FPT', args)
+    assert [data['page'] for _, _, _, data, _, _ in responses] == [1, 2]
+    # what crosses to the worker process is raw bytes, not records
+    responses = pickle.loads(pickle.dumps(responses))
+    args = pickle.loads(pickle.dumps(args))
+
+    path = tmp_path / 'bonds.csv'
+    assert export_partition(responses, BASE_URLS, 'bonds', 'FPT', args, str(path)) == 3
+    with open(path, encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['bond_code'] for row in rows] == ['FPT000', 'FPT001', 'FPT002']
+    assert rows[0]['release_date'] != ''
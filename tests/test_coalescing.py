@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from pyvietstock.transport import CoalescingTransport, FakeTransport, SingleFlight
+
+URL = 'http://finance.test/company/tradinginfo'
+
+
+def test_concurrent_identical_requests_share_one_upstream_call():
+    release = threading.Event()
+    upstream = []
+
+    def respond(method, url, params, data):
+        upstream.append(data['code'])
+        release.wait(5)
+        return {'code': data['code']}
+
+    transport = CoalescingTransport(FakeTransport().add(URL, respond))
+    results = []
+
+    def worker(code):
+        results.append(transport.post(URL, data={'code': code}).json())
+
+    threads = [threading.Thread(target=worker, args=(code,)) for code in ['FPT'] * 5 + ['VNM']]
+    for thread in threads:
+        thread.start()
+    while transport.stats()['in_flight'] < 2 or transport.stats()['coalesced'] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(upstream) == ['FPT', 'VNM']
+    assert sorted(r['code'] for r in results) == ['FPT'] * 5 + ['VNM']
+    assert transport.stats() == {'calls': 2, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_sequential_requests_are_not_coalesced():
+    fake = FakeTransport().add(URL, {'ok': True})
+    transport = CoalescingTransport(fake)
+    transport.post(URL, data={'code': 'FPT'})
+    transport.post(URL, data={'code': 'FPT'})
+    assert len(fake.calls) == 2
+
+
+def test_waiters_share_the_leader_error():
+    single_flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError('upstream down')
+
+    def call():
+        try:
+            single_flight.do('key', failing)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while single_flight.stats()['coalesced'] < 1:
+        threading.Event().wait(0.01)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
+    with pytest.raises(KeyError):
+        single_flight.do('other', lambda: {}['missing'])
@@ -0,0 +1,53 @@
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from pyvietstock.foreign import ForeignFlowTracker
+from pyvietstock.schema import TradingInfo
+
+DAY = 1717372800  # 2024-06-03 00:00 UTC, 07:00 ICT
+
+
+def info(symbol, **values):
+    fields = {f.name: (math.nan if f.type is float else None) for f in dataclasses.fields(TradingInfo)}
+    return TradingInfo(**{**fields, 'symbol': symbol, **values})
+
+
+def flows(buy_vol, sell_vol, buy_val, sell_val, remain_room=50.0):
+    return dict(f_buy_vol=buy_vol, f_sell_vol=sell_vol, f_buy_val=buy_val, f_sell_val=sell_val,
+                f_buy_put_vol=0.0, f_sell_put_vol=0.0, f_buy_put_val=0.0, f_sell_put_val=0.0,
+                total_room=100.0, curr_room=100.0 - remain_room, remain_room=remain_room)
+
+
+def test_storage_starts_small_and_grows_with_compact_volumes():
+    tracker = ForeignFlowTracker(['FPT', 'VNM'], capacity=2)
+    for k in range(5):
+        tracker.record([info('FPT', **flows(k, 0, k * 1e12, 0))], sampled_at=DAY + 3600 + k)
+    assert len(tracker) == 5 and tracker._compact.shape[0] == 8
+    assert tracker.series('f_buy_vol').dtype == np.float32
+    assert tracker.series('f_buy_val').dtype == np.float64
+    assert tracker.series('f_buy_val')[-1, 0] == 4e12
+    assert np.isnan(tracker.series('f_buy_vol')[:, 1]).all()
+
+
+def test_net_flow_uses_increments_within_a_day():
+    tracker = ForeignFlowTracker(['FPT'])
+    tracker.record([info('FPT', **flows(100, 40, 1e9, 4e8))], sampled_at=DAY + 3600)
+    tracker.record([None], sampled_at=DAY + 7200)  # failed fetch, forward filled
+    tracker.record([info('FPT', **flows(300, 50, 3e9, 5e8, remain_room=40.0))], sampled_at=DAY + 10800)
+    assert tracker.net_flow(DAY + 3600, value=False).tolist() == [190.0]
+    assert tracker.net_flow(DAY).tolist() == [2.5e9]
+    assert tracker.room_utilization_change(DAY).tolist() == pytest.approx([0.1])
+
+
+def test_save_and_load_round_trip(tmp_path):
+    tracker = ForeignFlowTracker(['FPT'])
+    tracker.record([info('FPT', **flows(100, 40, 1e9, 4e8))], sampled_at=DAY + 3600)
+    path = str(tmp_path / 'foreign.npz')
+    tracker.save(path)
+    loaded = ForeignFlowTracker.load(path)
+    assert loaded.symbols == ['FPT'] and loaded.times.tolist() == [DAY + 3600]
+    for name in ('f_buy_vol', 'f_sell_val', 'remain_room'):
+        assert loaded.series(name).tolist() == tracker.series(name).tolist()
@@ -0,0 +1,132 @@
+import asyncio
+import dataclasses
+import json
+import math
+import time
+
+from pyvietstock import gateway
+from pyvietstock.gateway import Gateway, GatewayClient, _Subscriber, to_records
+from pyvietstock.schema import TradingInfo
+
+
+class Calendar:
+    def __init__(self, open_):
+        self.open = open_
+
+    def is_market_open(self, t=None):
+        return self.open
+
+    def next_session_open(self, t=None):
+        return time.time() + 3600
+
+
+class Client:
+    def __init__(self):
+        self.calls = 0
+
+    def market_prices(self):
+        self.calls += 1
+        return None
+
+
+def subscribers(gw, count):
+    created = [_Subscriber(None) for _ in range(count)]
+    gw._subscribers.update(created)
+    return created
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+def test_faster_subscriber_wakes_the_sleeping_poller(monkeypatch):
+    monkeypatch.setattr(gateway, 'MIN_INTERVAL', 0.01)
+    client = Client()
+    gw = Gateway(client, calendar=Calendar(True))
+
+    async def scenario():
+        slow, fast = subscribers(gw, 2)
+        gw._subscribe(slow, ('market_prices', ''), 60)
+        while client.calls < 1:
+            await asyncio.sleep(0.01)
+        assert json.loads(slow.pending[('market_prices', '')])['data'] is None
+        gw._subscribe(fast, ('market_prices', ''), 0.05)
+        started = time.monotonic()
+        while client.calls < 3:
+            await asyncio.sleep(0.01)
+        elapsed = time.monotonic() - started
+        gw._unsubscribe(slow, ('market_prices', ''))
+        gw._unsubscribe(fast, ('market_prices', ''))
+        return elapsed
+
+    assert run(scenario()) < 1
+    assert gw.stats()['topics'] == {}
+
+
+def test_closed_market_waits_for_the_session_even_when_woken(monkeypatch):
+    monkeypatch.setattr(gateway, 'MIN_INTERVAL', 0.01)
+    client = Client()
+    gw = Gateway(client, calendar=Calendar(False))
+
+    async def scenario():
+        slow, fast = subscribers(gw, 2)
+        gw._subscribe(slow, ('market_prices', ''), 60)
+        while client.calls < 1:
+            await asyncio.sleep(0.01)
+        gw._subscribe(fast, ('market_prices', ''), 0.01)
+        await asyncio.sleep(0.2)
+        gw._unsubscribe(slow, ('market_prices', ''))
+        gw._unsubscribe(fast, ('market_prices', ''))
+
+    run(scenario())
+    assert client.calls == 1
+
+
+def test_unchanged_values_are_pushed_once(monkeypatch):
+    monkeypatch.setattr(gateway, 'MIN_INTERVAL', 0.01)
+    client = Client()
+    gw = Gateway(client, calendar=Calendar(True))
+
+    async def scenario():
+        subscriber, = subscribers(gw, 1)
+        gw._subscribe(subscriber, ('market_prices', ''), 0.01)
+        while client.calls < 1:
+            await asyncio.sleep(0.005)
+        subscriber.pending.clear()
+        while client.calls < 4:
+            await asyncio.sleep(0.005)
+        gw._unsubscribe(subscriber, ('market_prices', ''))
+        return subscriber.pending
+
+    assert run(scenario()) == {}
+
+
+def test_clients_share_one_poller_over_tcp():
+    class InfoClient:
+        def __init__(self):
+            self.calls = []
+
+        def trading_info(self, symbol):
+            self.calls.append(symbol)
+            fields = {f.name: (math.nan if f.type is float else None) for f in dataclasses.fields(TradingInfo)}
+            return TradingInfo(**{**fields, 'symbol': symbol, 'last_price': 101.5})
+
+    async def scenario():
+        vf = InfoClient()
+        gw = Gateway(vf, port=0, calendar=Calendar(True))
+        server = await gw.start()
+        port = server.sockets[0].getsockname()[1]
+        async with GatewayClient(port=port) as first, GatewayClient(port=port) as second:
+            await first.subscribe('trading_info', 'fpt', interval=60)
+            await second.subscribe('trading_info', 'FPT', interval=60)
+            messages = [await first.receive(), await second.receive()]
+            await second.subscribe('no_such_endpoint')
+            error = await second.receive()
+        server.close()
+        await server.wait_closed()
+        return vf, messages, error
+
+    vf, messages, error = run(scenario())
+    assert vf.calls == ['FPT']
+    assert [to_records(m).last_price for m in messages] == [101.5, 101.5]
+    assert messages[0]['symbol'] == 'FPT' and 'no_such_endpoint' in error['error']
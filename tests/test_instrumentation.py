@@ -0,0 +1,44 @@
+import pytest
+import requests
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.instrumentation import InstrumentedTransport, StatsCollector
+from pyvietstock.transport import CachingTransport, FakeTransport
+
+FINANCE_URL = 'http://finance.test'
+BONDS_URL = f'{FINANCE_URL}/Data/GetBondRelated'
+NEWS_URL = f'{FINANCE_URL}/data/getnewsbycode'
+BONDS = [{'StockCode': 'FPT', 'BondCode': f'FPT{i}'} for i in range(3)]
+
+
+def test_stats_count_requests_records_errors_and_cache_hits():
+    fake = FakeTransport().add(BONDS_URL, BONDS).add(NEWS_URL, b'', status_code=500)
+    vf = VietStockFinance(CachingTransport(fake), finance_base_url=FINANCE_URL).set_instrumentation(StatsCollector())
+    vf.bond_related('FPT')
+    vf.bond_related('FPT')
+    with pytest.raises(requests.HTTPError):
+        vf.news_by_code('FPT')
+
+    stats = vf.stats()
+    bonds = stats['/data/getbondrelated']
+    assert (bonds['requests'], bonds['records'], bonds['errors'], bonds['cache_hit_rate']) == (2, 6, 0, 0.5)
+    assert bonds['bytes'] == 2 * len(fake.post(BONDS_URL).content)
+    assert bonds['decode_s'] > 0 and bonds['build_s'] > 0
+    assert (stats['/data/getnewsbycode']['requests'], stats['/data/getnewsbycode']['errors']) == (1, 1)
+
+
+def test_streams_are_reported_once_consumed_and_instrumentation_can_be_turned_off():
+    fake = FakeTransport().add(NEWS_URL, [[{'ArticleID': 1}, {'ArticleID': 2}]])
+    collector = StatsCollector()
+    vf = VietStockFinance(fake, finance_base_url=FINANCE_URL).set_instrumentation(collector)
+    assert isinstance(vf._transport, InstrumentedTransport)
+    articles = vf.news_by_code('FPT', stream=True)
+    assert collector.stats() == {}
+    assert len(list(articles)) == 2
+    news = collector.stats()['/data/getnewsbycode']
+    assert (news['requests'], news['records'], news['bytes']) == (1, 2, len(fake.post(NEWS_URL).content))
+
+    vf.set_instrumentation(None)
+    assert vf._transport is fake and vf.stats() == {}
+    vf.news_by_code('FPT')
+    assert collector.stats()['/data/getnewsbycode']['requests'] == 1
@@ -0,0 +1,76 @@
+import dataclasses
+import math
+
+import numpy as np
+
+from pyvietstock.live import RESOLUTION, LiveHistory
+from pyvietstock.schema import StockDealDetail, TradingInfo
+from pyvietstock.store import OHLCV_DTYPE, OHLCVStore
+
+DAY = 86400
+
+
+def _midnight(day):
+    return int(np.datetime64(day, 's').astype(np.int64))
+
+
+def _store(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    bars = np.zeros(3, dtype=OHLCV_DTYPE)
+    bars['time'] = [_midnight(d) for d in ('2025-10-16', '2025-10-17', '2025-10-20')]
+    bars['open'] = bars['high'] = bars['low'] = bars['close'] = [98.0, 99.0, 100.0]
+    bars['volume'] = 1000.0
+    store.append('FPT', bars, RESOLUTION)
+    return store
+
+
+def _deal(time, price, total_vol):
+    return StockDealDetail(f'2025-10-21 {time}+07:00', 'FPT', '', price, 100, total_vol, 0.0, 0.0, 'B', 0.0)
+
+
+def _info(**values):
+    fields = {f.name: (math.nan if f.type is float else None) for f in dataclasses.fields(TradingInfo)}
+    return TradingInfo(**{**fields, 'symbol': 'FPT', **values})
+
+
+def test_deals_build_todays_bar_after_the_stored_history(tmp_path):
+    live = LiveHistory(_store(tmp_path), ['fpt'])
+    assert live.symbols == ['FPT'] and live.partial_bar('FPT') is None
+    deals = [_deal('09:20:00', 102.0, 300), _deal('09:16:00', 99.5, 200), _deal('09:15:00', 101.0, 100)]
+    assert live.on_deals(deals) == 3
+    assert live.on_deals(deals) == 0  # the same poll again
+    assert not live.on_deal(StockDealDetail('2025-10-17 10:00:00+07:00', 'FPT', '', 90.0, 1, 1, 0.0, 0.0, 'B', 0.0))
+
+    series = live.series('FPT')
+    assert series['time'].tolist()[-1] == _midnight('2025-10-21') and len(series) == 4
+    assert series[-1].tolist()[1:] == (101.0, 102.0, 99.5, 102.0, 300.0)
+    assert series['close'][:3].tolist() == [98.0, 99.0, 100.0]
+
+
+def test_trading_info_overwrites_the_session_values_and_commit_persists_them(tmp_path):
+    store = _store(tmp_path)
+    live = LiveHistory(store)
+    assert not live.on_trading_info(_info(open_price=0.0, last_price=0.0))  # before the first trade
+    live.on_deal(_deal('09:15:00', 101.0, 100))
+    assert live.on_trading_info(_info(time='2025-10-21 10:00:00+07:00', open_price=100.5, highest_price=103.0,
+                                      lowest_price=99.0, last_price=102.5, total_vol=5000.0))
+    assert live.partial_bar('FPT').tolist()[1:] == (100.5, 103.0, 99.0, 102.5, 5000.0)
+    assert not live.on_deal(_deal('09:30:00', 104.0, 4000))  # already counted by trading_info
+
+    assert live.commit() == 1 and store.count('FPT', RESOLUTION) == 4
+    assert live.partial_bar('FPT') is None
+
+    live.on_deal(_deal('14:45:00', 104.0, 6000))
+    assert live.commit('FPT') == 0
+    assert store.open('FPT', RESOLUTION)[-1].tolist()[1:] == (100.5, 104.0, 99.0, 104.0, 6000.0)
+    np.testing.assert_array_equal(LiveHistory(store).series('FPT'), live.series('FPT'))
+
+
+def test_new_days_roll_the_partial_bar_into_history(tmp_path):
+    live = LiveHistory(OHLCVStore(str(tmp_path)))
+    for day in range(1, 13):
+        deal = StockDealDetail(f'2025-09-{day:02d} 10:00:00+07:00', 'VNM', '', 60.0 + day, 10, 10, 0.0, 0.0, 'S', 0.0)
+        assert live.on_deal(deal)
+    series = live.series('VNM')
+    assert len(series) == 12 and series['close'].tolist() == [60.0 + day for day in range(1, 13)]
+    assert np.all(np.diff(series['time']) == DAY)
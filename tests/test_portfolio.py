@@ -0,0 +1,69 @@
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from pyvietstock.portfolio import PortfolioBook, PortfolioValuer, PriceSnapshot, Valuation
+from pyvietstock.schema import TradingInfo
+
+PRICES = {  # last, prior close, ceiling, floor
+    'FPT': (104.0, 100.0, 107.0, 93.0),
+    'VNM': (0.0, 50.0, 53.5, 46.5),  # not traded yet today
+    'HPG': (26.7, 25.0, 26.75, 23.25),  # within 2% of the ceiling
+}
+
+
+def info(symbol, last, prior, ceiling, floor):
+    fields = {f.name: (math.nan if f.type is float else None) for f in dataclasses.fields(TradingInfo)}
+    return TradingInfo(**{**fields, 'symbol': symbol, 'last_price': last, 'prior_close_price': prior,
+                          'ceiling_price': ceiling, 'floor_price': floor})
+
+
+class Client:
+    def __init__(self):
+        self.calls = []
+
+    def trading_info(self, symbol):
+        self.calls.append(symbol)
+        return info(symbol, *PRICES[symbol]) if symbol in PRICES else None
+
+
+def _book():
+    return PortfolioBook(
+        {'p1': {'fpt': 100, 'VNM': 200}, 'p2': {'HPG': 1000, 'FPT': -50}},
+        costs={'p1': {'FPT': 90.0}, 'p2': {'HPG': 20.0, 'FPT': 120.0}},
+    )
+
+
+def test_book_is_a_dense_matrix_over_the_held_symbols():
+    book = _book()
+    assert book.symbols == ['FPT', 'HPG', 'VNM'] and len(book) == 2
+    np.testing.assert_array_equal(book.quantities, [[100, 0, 200], [-50, 1000, 0]])
+    assert np.isnan(book.costs[0, 2]) and book.costs[1, 0] == 120.0
+
+
+def test_valuation_marks_every_portfolio_from_one_snapshot():
+    vf = Client()
+    valuation = PortfolioValuer(vf).value(_book())
+    assert sorted(vf.calls) == ['FPT', 'HPG', 'VNM']
+
+    p1, p2 = valuation.to_records()
+    assert p1['market_value'] == pytest.approx(100 * 104 + 200 * 50)
+    assert p1['day_pnl'] == pytest.approx(100 * 4) and p1['day_return'] == pytest.approx(400 / 20000)
+    assert p1['unrealized_pnl'] == pytest.approx(100 * 14) and p1['near_ceiling'] == 0.0
+    assert p2['gross_exposure'] == pytest.approx(26700 + 5200) and p2['net_exposure'] == pytest.approx(26700 - 5200)
+    assert p2['near_ceiling'] == pytest.approx(26700) and p2['near_floor'] == 0.0
+    assert p2['unrealized_pnl'] == pytest.approx(1000 * 6.7 - 50 * (104 - 120))
+    assert valuation.weights[1].tolist() == pytest.approx([-5200 / 31900, 26700 / 31900, 0.0])
+    assert valuation.get('p2') == p2
+
+
+def test_snapshot_for_other_symbols_is_realigned():
+    snapshot = PriceSnapshot(['VNM', 'FPT', 'MSN'], np.array([51.0, 0.0, 70.0]), np.array([50.0, 100.0, 69.0]),
+                             np.full(3, np.inf), np.zeros(3))
+    assert snapshot.last.tolist() == [51.0, 100.0, 70.0]
+    valuation = PortfolioValuer(Client()).value(_book(), snapshot)
+    assert isinstance(valuation, Valuation) and valuation.snapshot.symbols == ['FPT', 'HPG', 'VNM']
+    # HPG has no price: it counts as 0
+    assert valuation.market_value.tolist() == pytest.approx([100 * 100 + 200 * 51, -50 * 100])
@@ -0,0 +1,47 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.proxy import ProxyServer
+from pyvietstock.transport import FakeTransport
+
+FINANCE_URL = 'http://finance.test'
+
+
+@pytest.fixture
+def proxy_url():
+    def broken(method, url, params, data):
+        raise TypeError("bug inside the client")
+
+    transport = FakeTransport().add(f'{FINANCE_URL}/company/tradinginfo', broken)
+    proxy = ProxyServer(VietStockFinance(transport, finance_base_url=FINANCE_URL), port=0)
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://{proxy.address[0]}:{proxy.address[1]}'
+    proxy.shutdown()
+
+
+def call(proxy_url, method, body):
+    return requests.post(f'{proxy_url}/call/{method}', data=json.dumps(body), timeout=5)
+
+
+def test_unknown_method_is_404(proxy_url):
+    assert call(proxy_url, 'login', {}).status_code == 404
+    assert requests.get(f'{proxy_url}/no_such_method', timeout=5).status_code == 404
+
+
+def test_bad_arguments_are_400(proxy_url):
+    assert call(proxy_url, 'trading_info', {'args': []}).status_code == 400
+    assert call(proxy_url, 'trading_info', {'args': ['FPT'], 'kwargs': {'nope': 1}}).status_code == 400
+    assert call(proxy_url, 'trading_info', {'args': 'FPT'}).status_code == 400
+    assert call(proxy_url, 'trading_info', ['FPT']).status_code == 400
+
+
+def test_errors_inside_the_call_are_502(proxy_url, caplog):
+    response = call(proxy_url, 'trading_info', {'args': ['FPT']})
+    assert response.status_code == 502
+    assert 'bug inside the client' in response.json()['error']
+    assert 'trading_info failed' in caplog.text
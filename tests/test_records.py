@@ -0,0 +1,45 @@
+import dataclasses
+import pickle
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.params import ResultMode
+from pyvietstock.records import RecordView, build_record, view_type
+from pyvietstock.schema import BondRelated
+from pyvietstock.transport import FakeTransport
+
+FINANCE_URL = 'http://finance.test'
+BONDS = [
+    {'StockCode': 'FPT', 'BondCode': 'FPT2024', 'ReleaseDate': '/Date(1717002000000)/', 'FaceValue': 100000},
+    {'StockCode': 'FPT', 'BondCode': 'FPT2025'},
+]
+
+
+def _client(mode):
+    transport = FakeTransport().add(f'{FINANCE_URL}/Data/GetBondRelated', BONDS)
+    return VietStockFinance(transport, finance_base_url=FINANCE_URL).set_result_mode(mode)
+
+
+def test_lazy_views_equal_the_eager_records():
+    views = _client(ResultMode.LAZY).bond_related('FPT')
+    records = _client(ResultMode.DATACLASS).bond_related('FPT')
+    assert all(isinstance(view, RecordView) for view in views)
+    assert views == records and [view.to_record() for view in views] == records
+    assert views[0].release_date == records[0].release_date == '2024-05-29 17:00:00'
+    assert views[1].face_value == 0 and views[1].raw == BONDS[1]
+    assert dataclasses.asdict(views[0]) == dataclasses.asdict(records[0])
+    assert [f.name for f in dataclasses.fields(views[0])] == [f.name for f in dataclasses.fields(BondRelated)]
+
+
+def test_views_convert_fields_on_first_access_only():
+    view = view_type(BondRelated)(dict(BONDS[0]))
+    assert view._values == {}
+    assert view.bond_code == 'FPT2024' and list(view._values) == ['bond_code']
+    view.raw['BondCode'] = 'changed'
+    assert view.bond_code == 'FPT2024'
+    assert view_type(BondRelated) is type(view)
+
+
+def test_views_unpickle_as_dataclasses():
+    view = view_type(BondRelated)(BONDS[0])
+    restored = pickle.loads(pickle.dumps(view))
+    assert type(restored) is BondRelated and restored == build_record(BondRelated, BONDS[0])
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from pyvietstock.resilience import CircuitBreaker, CircuitOpenError, ResilientTransport
+from pyvietstock.transport import FakeTransport
+
+SLOW_URL = 'http://finance.test/company/slow'
+FAST_URL = 'http://finance.test/company/fast'
+
+
+def test_breaker_opens_after_threshold_and_recovers_through_half_open():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # a single trial call
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+
+def test_server_errors_open_the_circuit():
+    fake = FakeTransport().add(FAST_URL, b'', status_code=503)
+    transport = ResilientTransport(fake, failure_threshold=2, recovery_time=60)
+    assert transport.post(FAST_URL).status_code == 503
+    assert transport.post(FAST_URL).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        transport.post(FAST_URL)
+    assert len(fake.calls) == 2
+    assert transport.stats()['breakers'] == {'/company/fast': 'open'}
+
+
+def test_timeout_is_counted_and_raised():
+    release = threading.Event()
+    fake = FakeTransport().add(SLOW_URL, lambda *_: release.wait(5) and b'{}')
+    transport = ResilientTransport(fake, timeouts={'/company/slow': 0.05})
+    try:
+        with pytest.raises(requests.Timeout):
+            transport.post(SLOW_URL)
+    finally:
+        release.set()
+    assert transport.stats()['timeouts'] == 1
+
+
+def test_hedge_wins_when_the_first_call_stalls():
+    release = threading.Event()
+    calls = []
+
+    def respond(method, url, params, data):
+        calls.append(url)
+        if len(calls) == 1:
+            release.wait(5)
+            return b'"first"'
+        return b'"hedge"'
+
+    transport = ResilientTransport(FakeTransport().add(SLOW_URL, respond), hedge=True, min_samples=1)
+    transport.latency.observe('/company/slow', 0.01)
+    try:
+        assert transport.post(SLOW_URL).json() == 'hedge'
+    finally:
+        release.set()
+    stats = transport.stats()
+    assert (stats['hedges'], stats['hedges_won']) == (1, 1)
+
+
+def test_stalled_endpoint_does_not_starve_healthy_ones():
+    release = threading.Event()
+    fake = FakeTransport().add(SLOW_URL, lambda *_: release.wait(5) and b'{}').add(FAST_URL, b'{}')
+    transport = ResilientTransport(fake, timeouts={'/company/slow': 0.02, '/company/fast': 1}, max_workers=2,
+                                   failure_threshold=100)
+    try:
+        for _ in range(4):  # every worker of the slow endpoint stays busy after its caller gave up
+            with pytest.raises(requests.Timeout):
+                transport.post(SLOW_URL)
+        assert transport.post(FAST_URL).status_code == 200
+        assert transport.stats()['breakers']['/company/fast'] == 'closed'
+    finally:
+        release.set()
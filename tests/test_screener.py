@@ -0,0 +1,28 @@
+import dataclasses
+import math
+
+import numpy as np
+
+from pyvietstock.schema import TradingInfo
+from pyvietstock.screener import Screener
+
+
+def info(symbol, **values):
+    fields = {f.name: (math.nan if f.type is float else None) for f in dataclasses.fields(TradingInfo)}
+    return TradingInfo(**{**fields, 'symbol': symbol, **values})
+
+
+def test_tied_values_share_the_max_rank():
+    volumes = {'AAA': 0.0, 'BBB': 0.0, 'CCC': 0.0, 'DDD': 5.0, 'EEE': math.nan}
+    screener = Screener([info(s, total_vol=v) for s, v in volumes.items()])
+    ranks = screener.percentile_rank('total_vol')
+    assert ranks[:4].tolist() == [0.75, 0.75, 0.75, 1.0]
+    assert np.isnan(ranks[4])
+
+
+def test_ranks_within_groups_handle_ties_per_group():
+    values = {'AAA': 1.0, 'BBB': 1.0, 'CCC': 2.0, 'DDD': 1.0, 'EEE': 3.0}
+    industries = {'AAA': 1, 'BBB': 1, 'CCC': 1, 'DDD': 2, 'EEE': 2}
+    screener = Screener([info(s, pe=v) for s, v in values.items()], industries)
+    ranks = screener.percentile_rank('pe', group_by='cat_id')
+    assert ranks.tolist() == [2 / 3, 2 / 3, 1.0, 0.5, 1.0]
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+import requests
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.session_pool import SessionPool
+from pyvietstock.transport import FakeTransport
+
+BONDS_URL = f'{VietStockFinance(FakeTransport()).finance_base_url}/Data/GetBondRelated'
+
+
+class Logins:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, user_name, password, cache_path=None, refresh=False):
+        self.calls.append((user_name, refresh))
+        return {'User': user_name}, f'{user_name}-token-{len(self.calls)}'
+
+
+def _pool(transport=None, **kwargs):
+    logins = Logins()
+    pool = SessionPool([('a', 'x'), ('b', 'y')], transport=transport or FakeTransport(), login_func=logins, **kwargs)
+    return pool, logins
+
+
+def test_acquire_spreads_load_and_logs_in_once():
+    pool, logins = _pool()
+    first, second = pool.acquire(), pool.acquire()
+    assert {first.user_name, second.user_name} == {'a', 'b'}
+    pool.release(first)
+    assert pool.acquire() is first
+    assert sorted(logins.calls) == [('a', False), ('b', False)]
+
+
+def test_throttled_session_is_skipped_and_expired_session_logs_in_again():
+    pool, logins = _pool(throttle_cooldown=60)
+    a = next(s for s in pool.sessions if s.user_name == 'a')
+    pool.mark_throttled(a)
+    assert [pool.acquire().user_name for _ in range(2)] == ['b', 'b']
+
+    pool.mark_throttled(pool.sessions[1])
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    b = pool.sessions[1]
+    b.throttled_until = 0.0
+    pool.release(b, status_code=401)
+    assert pool.acquire() is b and b.token == 'b-token-2' and logins.calls[-1] == ('b', True)
+
+
+def test_client_marks_the_session_throttled_on_429():
+    transport = FakeTransport().add(BONDS_URL, b'', status_code=429)
+    pool, _ = _pool(transport)
+    with pytest.raises(requests.HTTPError):
+        with pool.client() as vf:
+            vf.bond_related('FPT')
+    assert [s['throttled'] for s in pool.stats()].count(True) == 1
+    assert all(s['in_use'] == 0 for s in pool.stats())
+
+
+def test_async_client_uses_the_session_token():
+    transport = FakeTransport().add(BONDS_URL, lambda method, url, params, data: [{'BondCode': data['__RequestVerificationToken']}])
+    pool, _ = _pool(transport)
+
+    async def fetch():
+        async with pool.async_client() as vf:
+            return vf.bond_related('FPT')
+
+    assert asyncio.run(fetch())[0].bond_code in ('a-token-1', 'b-token-1')
+    assert sum(s['requests'] for s in pool.stats()) == 1
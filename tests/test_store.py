@@ -0,0 +1,51 @@
+import numpy as np
+
+from pyvietstock.schema import HistoricalData
+from pyvietstock.store import OHLCV_DTYPE, OHLCVStore, to_bars
+
+DAY = 86400
+
+
+def _bar(day, close, volume=100.0):
+    return HistoricalData(day * DAY, close, close + 1, close - 1, close, volume)
+
+
+def test_append_skips_older_bars_and_replaces_the_last_one(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    assert store.append('fpt', [_bar(2, 11.0), _bar(1, 10.0), _bar(3, 12.0)]) == 3
+    assert store.symbols() == ['FPT'] and store.count('FPT') == 3
+
+    # day 2 is older than the last stored bar, day 3 is refreshed in place, day 4 is new
+    assert store.append('FPT', [_bar(2, 99.0), _bar(3, 13.0, 150.0), _bar(4, 14.0), _bar(4, 15.0)]) == 1
+    bars = store.open('FPT')
+    assert bars['time'].tolist() == [DAY, 2 * DAY, 3 * DAY, 4 * DAY]
+    assert bars['close'].tolist() == [10.0, 11.0, 13.0, 15.0]
+    assert bars['volume'][2] == 150.0
+    assert store.last_time('FPT') == 4 * DAY
+
+
+def test_slice_is_inclusive_and_empty_symbols_are_empty(tmp_path):
+    store = OHLCVStore(str(tmp_path))
+    assert store.open('VNM').dtype == OHLCV_DTYPE and len(store.open('VNM')) == 0
+    assert store.last_time('VNM') is None and store.symbols() == []
+
+    store.append('FPT', to_bars(_bar(day, float(day)) for day in range(1, 6)))
+    assert store.slice('FPT', from_time=2 * DAY, to_time=4 * DAY)['close'].tolist() == [2.0, 3.0, 4.0]
+    assert store.slice('FPT', from_time=4 * DAY + 1)['close'].tolist() == [5.0]
+    assert len(store.slice('FPT', to_time=DAY - 1)) == 0
+
+
+def test_refresh_fetches_from_the_last_stored_bar(tmp_path):
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        def historical_data(self, symbol, resolution, from_time, to_time):
+            self.calls.append(from_time)
+            return [_bar(day, float(day)) for day in range(from_time // DAY or 1, 4)]
+
+    store, vf = OHLCVStore(str(tmp_path)), Client()
+    assert store.refresh(vf, 'FPT', from_time=0) == 3
+    assert store.refresh(vf, 'FPT') == 0
+    assert vf.calls == [0, 3 * DAY]
+    assert np.array_equal(store.open('FPT')['close'], [1.0, 2.0, 3.0])
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.streaming import iter_json_items
+from pyvietstock.transport import FakeTransport
+
+FINANCE_URL = 'http://finance.test'
+NEWS_URL = f'{FINANCE_URL}/data/getnewsbycode'
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_items_are_decoded_across_any_chunk_boundary():
+    items = [{'Title': 'Cổ phiếu FPT', 'Price': 1500.25}, 12345, 'x, y]', [1, [2]], None]
+    data = json.dumps(items, ensure_ascii=False).encode('utf-8')
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_items(_chunks(data, size))) == items
+
+
+def test_nested_arrays_yield_inner_items_and_truncated_data_fails():
+    groups = [[{'a': 1}, {'a': 2}], [], [{'a': 3}]]
+    assert list(iter_json_items(_chunks(json.dumps(groups).encode(), 3), depth=2)) == [{'a': 1}, {'a': 2}, {'a': 3}]
+    items = iter_json_items([b'[1, {"a": ', b'2}, {"b"'])
+    assert next(items) == 1 and next(items) == {'a': 2}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_streamed_news_match_the_decoded_response():
+    groups = [[{'StockCode': 'FPT', 'ArticleID': i, 'Title': f'News {i}'} for i in range(3)], [{'ArticleID': 3}]]
+    vf = VietStockFinance(FakeTransport().add(NEWS_URL, groups), finance_base_url=FINANCE_URL)
+    streamed = vf.news_by_code('FPT', stream=True)
+    assert not isinstance(streamed, list)
+    assert list(streamed) == vf.news_by_code('FPT')
+    assert [article.article_id for article in vf.news_by_code('FPT', stream=True)] == [0, 1, 2, 3]
@@ -0,0 +1,64 @@
+import logging
+
+from pyvietstock.schema import SymbolInfo
+from pyvietstock.symbols import SymbolMaster
+
+
+class Event:
+    def __init__(self, symbol, exchange, cat_id=1, company_name='Company'):
+        self.symbol, self.exchange, self.cat_id, self.company_name = symbol, exchange, cat_id, company_name
+
+
+class Client:
+    """
+    Stand-in for VietStockFinance: FPT has recent industry events, VNM and XYZ only events of their own.
+    """
+
+    def __init__(self):
+        self.own_events = {'VNM': [Event('VNM', 'hose')], 'XYZ': []}
+        self.own_event_lookups = []
+
+    def company_relation_filter(self, symbol, page=1, page_size=100):
+        return []
+
+    def events_same_industry(self, symbol):
+        return [Event('FPT', 'HOSE')] if symbol == 'FPT' else []
+
+    def events_by_type(self, symbol, page_size=5):
+        self.own_event_lookups.append(symbol)
+        return self.own_events[symbol]
+
+    def trading_info(self, symbol):
+        return None
+
+
+def test_exchange_falls_back_to_own_events(tmp_path, caplog):
+    master = SymbolMaster(str(tmp_path / 'symbols.json'))
+    with caplog.at_level(logging.WARNING):
+        master.build(Client(), ['FPT', 'VNM', 'XYZ'], max_workers=1)
+    assert [info.symbol for info in master.by_exchange('HOSE')] == ['FPT', 'VNM']
+    assert master.get('XYZ').exchange is None
+    assert 'XYZ' in caplog.text and 'VNM' not in caplog.text
+
+
+def test_known_exchange_is_not_refetched(tmp_path):
+    master = SymbolMaster(str(tmp_path / 'symbols.json'))
+    master.add(SymbolInfo('VNM', 'HOSE', 1, 'Vinamilk', None, 0))
+    client = Client()
+    master.build(client, max_workers=1)
+    assert master.get('VNM').exchange == 'HOSE'
+    assert client.own_event_lookups == []
+
+
+def test_failed_refreshes_are_not_counted(tmp_path, caplog):
+    class Failing(Client):
+        def trading_info(self, symbol):
+            if symbol == 'VNM':
+                raise ConnectionError('reset')
+            return None
+
+    master = SymbolMaster(str(tmp_path / 'symbols.json'))
+    with caplog.at_level(logging.WARNING):
+        assert master.build(Failing(), ['FPT', 'VNM'], max_workers=1) == 1
+    assert master.get('VNM').updated_at == 0 and master.stale() == ['VNM']
+    assert '1 symbols failed to refresh' in caplog.text and 'VNM' in caplog.text
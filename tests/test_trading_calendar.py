@@ -0,0 +1,57 @@
+from pyvietstock.params import SessionPhase
+from pyvietstock.trading_calendar import TradingCalendar
+from pyvietstock.transport import CachingTransport, FakeTransport, request_key
+from pyvietstock.utils import convert_to_epoch
+
+CALENDAR = TradingCalendar()
+NEWS_URL = 'http://finance.test/data/getnewsbycode'
+DEALS_URL = 'http://finance.test/data/getstockdealdetail'
+
+
+def ict(text):
+    return convert_to_epoch(f'{text}+07:00')
+
+
+def test_session_phases_of_a_trading_day():
+    assert CALENDAR.session_phase(ict('2025-10-21T08:59:59')) == SessionPhase.PRE_OPEN
+    assert CALENDAR.session_phase(ict('2025-10-21T09:00:00')) == SessionPhase.ATO
+    assert CALENDAR.session_phase(ict('2025-10-21T12:00:00')) == SessionPhase.LUNCH_BREAK
+    assert CALENDAR.session_phase(ict('2025-10-21T14:50:00')) == SessionPhase.PUT_THROUGH
+    assert not CALENDAR.is_market_open(ict('2025-10-21T15:00:00'))
+    assert not CALENDAR.is_market_open(ict('2025-10-25T10:00:00'))  # Saturday
+    assert not CALENDAR.is_market_open(ict('2025-09-02T10:00:00'))  # National Day
+
+
+def test_next_open_and_last_completed_day_skip_weekends_and_holidays():
+    assert CALENDAR.next_session_open(ict('2025-10-21T12:00:00')) == ict('2025-10-21T13:00:00')
+    assert CALENDAR.next_session_open(ict('2025-08-29T15:00:00')) == ict('2025-09-03T09:00:00')
+    assert CALENDAR.last_completed_trading_day(ict('2025-09-03T14:59:59')) == '2025-08-29'
+    assert CALENDAR.last_completed_trading_day(ict('2025-09-03T15:00:00')) == '2025-09-03'
+    assert CALENDAR.trading_days('2025-08-29', '2025-09-04') == ['2025-08-29', '2025-09-03', '2025-09-04']
+
+    calendar = TradingCalendar(holidays=())
+    calendar.add_holidays(['2025-10-22'])
+    assert calendar.is_trading_day(ict('2025-09-02T10:00:00')) and not calendar.is_trading_day(ict('2025-10-22T10:00:00'))
+
+
+def test_market_data_is_cached_until_the_next_open_while_closed():
+    cache = CachingTransport(FakeTransport(), ttl=30, ttls={'/data/getnewsbycode': 600})
+    closed, open_ = ict('2025-10-21T15:30:00'), ict('2025-10-21T10:00:00')
+    assert cache.expires_at(DEALS_URL, closed) == ict('2025-10-22T09:00:30')
+    assert cache.expires_at(DEALS_URL, open_) == open_ + 30
+    assert cache.expires_at(NEWS_URL, closed) == closed + 600
+
+    key = request_key('POST', DEALS_URL, data={'code': 'FPT'})
+    cache.put(key, DEALS_URL, b'[]', now=closed)
+    assert cache.lookup(key, now=ict('2025-10-22T09:00:29')) is not None
+    assert cache.lookup(key, now=ict('2025-10-22T09:00:30')) is None
+
+
+def test_only_successful_responses_are_cached():
+    fake = FakeTransport().add(NEWS_URL, [[]]).add(DEALS_URL, b'', status_code=500)
+    cache = CachingTransport(fake)
+    for _ in range(2):
+        assert cache.post(NEWS_URL, data={'code': 'FPT', '__RequestVerificationToken': 'x'}).json() == [[]]
+        assert cache.post(DEALS_URL, data={'code': 'FPT'}).status_code == 500
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'entries': 1}
+    assert len(fake.calls) == 3
@@ -0,0 +1,46 @@
+import pytest
+
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.transport import (
+    ArchiveMissError, FakeTransport, RecordingTransport, ReplayTransport, ResponseArchive, request_key,
+)
+
+FINANCE_URL = 'http://finance.test'
+BONDS_URL = f'{FINANCE_URL}/Data/GetBondRelated'
+
+
+def bonds(method, url, params, data):
+    return [{'StockCode': data['code'], 'BondCode': f"{data['code']}{data['page']}"}]
+
+
+def test_request_key_ignores_the_token_and_value_types():
+    assert request_key('post', BONDS_URL, data={'code': 'FPT', 'page': 1, '__RequestVerificationToken': 'a'}) == \
+        request_key('POST', BONDS_URL, data={'page': '1', 'code': 'FPT', '__RequestVerificationToken': 'b'})
+    assert request_key('POST', BONDS_URL, data={'code': 'FPT'}) != request_key('POST', BONDS_URL, data={'code': 'VNM'})
+
+
+def test_replay_serves_recorded_responses_without_network(tmp_path):
+    archive = ResponseArchive(str(tmp_path / 'archive'))
+    fake = FakeTransport().add(BONDS_URL, bonds)
+    recorded = VietStockFinance(RecordingTransport(archive, fake), finance_base_url=FINANCE_URL) \
+        .set_session({}, 'token-1').bond_related('FPT', page=2)
+
+    replayed = VietStockFinance(ReplayTransport(str(tmp_path / 'archive')), finance_base_url=FINANCE_URL) \
+        .set_session({}, 'token-2').bond_related('FPT', page=2)
+    assert replayed == recorded and replayed[0].bond_code == 'FPT2'
+    assert len(fake.calls) == 1
+
+    stream = ReplayTransport(archive).post(BONDS_URL, data={'code': 'FPT', 'page': 2, 'pageSize': 20,
+                                                            'orderBy': 'ReleaseDate', 'orderDir': 'DESC'}, stream=True)
+    assert b''.join(stream.iter_content(4)) == fake.post(BONDS_URL, data={'code': 'FPT', 'page': 2}).content
+
+    with pytest.raises(ArchiveMissError):
+        VietStockFinance(ReplayTransport(archive), finance_base_url=FINANCE_URL).bond_related('VNM')
+
+
+def test_failed_responses_are_not_recorded(tmp_path):
+    archive = ResponseArchive(str(tmp_path / 'archive'))
+    transport = RecordingTransport(archive, FakeTransport().add(BONDS_URL, b'', status_code=500))
+    assert transport.post(BONDS_URL, data={'code': 'FPT'}).status_code == 500
+    with pytest.raises(ArchiveMissError):
+        ReplayTransport(archive).post(BONDS_URL, data={'code': 'FPT'})
@@ -0,0 +1,51 @@
+from pyvietstock.finance import VietStockFinance
+from pyvietstock.records import build_record
+from pyvietstock.schema import CompanyEvent
+from pyvietstock.transport import FakeTransport
+from pyvietstock.warehouse import Warehouse
+
+FINANCE_URL = 'http://finance.test'
+
+
+def event(event_id, event_type_id):
+    return {'Code': 'FPT', 'EventID': event_id, 'EventTypeID': event_type_id, 'GDKHQDate': '/Date(1700000000000)/'}
+
+
+def events_client(pages):
+    """
+    :param pages: event type -> list of pages, newest first.
+    """
+    def respond(method, url, params, data):
+        type_pages = pages.get(data['eventTypeID'], [])
+        return [type_pages[data['page'] - 1] if data['page'] <= len(type_pages) else []]
+
+    transport = FakeTransport().add(f'{FINANCE_URL}/data/eventstypedata', respond)
+    return VietStockFinance(transport, finance_base_url=FINANCE_URL), transport
+
+
+def test_sync_keeps_paging_types_that_are_not_caught_up():
+    warehouse = Warehouse(':memory:')
+    warehouse.upsert('company_events', 'FPT', [build_record(CompanyEvent, event(e, t)) for e, t in [(10, 1), (20, 2)]])
+    # type 1 reaches a stored row on page 1, type 2 only on page 2, type 5 has nothing
+    vf, _ = events_client({1: [[event(11, 1), event(10, 1)]],
+                           2: [[event(23, 2), event(22, 2)], [event(21, 2), event(20, 2)]]})
+    assert warehouse.sync(vf, 'company_events', ['FPT'], page_size=2, max_workers=1) == {'FPT': 4}
+    stored = {row['event_id'] for row in warehouse.select('company_events', ['FPT'])}
+    assert stored == {10, 11, 20, 21, 22, 23}
+
+
+def test_sync_stops_once_every_type_is_caught_up():
+    warehouse = Warehouse(':memory:')
+    warehouse.upsert('company_events', 'FPT', [build_record(CompanyEvent, event(e, t)) for e, t in [(10, 1), (20, 2)]])
+    vf, transport = events_client({1: [[event(11, 1), event(10, 1)], [event(9, 1)]],
+                                   2: [[event(20, 2)], [event(19, 2)]]})
+    assert warehouse.sync(vf, 'company_events', ['FPT'], page_size=2, max_workers=1) == {'FPT': 1}
+    assert {data['page'] for _, _, _, data in transport.calls} == {1}
+    assert warehouse.last_synced('company_events', 'FPT') is not None
+
+
+def test_full_sync_reads_every_page():
+    warehouse = Warehouse(':memory:')
+    vf, _ = events_client({1: [[event(11, 1), event(10, 1)], [event(9, 1)]]})
+    assert warehouse.sync(vf, 'company_events', ['FPT'], page_size=2, full=True, max_workers=1) == {'FPT': 3}
+    assert warehouse.select('company_events', ['FPT'], limit=1)[0]['date'].startswith('2023-11-14')
@@ -0,0 +1,10 @@
+from pyvietstock.instrumentation import InstrumentedTransport
+from pyvietstock.transport import CachingTransport, CoalescingTransport, FakeTransport
+from pyvietstock.warmup import find_cache
+
+
+def test_find_cache_unwraps_transport_chains():
+    cache = CachingTransport(FakeTransport())
+    assert find_cache(cache) is cache
+    assert find_cache(InstrumentedTransport(CoalescingTransport(cache))) is cache
+    assert find_cache(InstrumentedTransport(FakeTransport())) is None